@@ -0,0 +1,444 @@
+import datetime
+import functools
+import json
+import os
+import sqlite3
+import sys
+import threading
+
+from recargos_logic import (
+    CAMPOS_CONFIGURACION, TAMANO_MAXIMO_DIARIO, CalculadoraRecargos, DiarioCambios, Empleado, JornadasCompactas,
+    _reproducir_diario, load_app_data,
+)
+
+# Extensiones de archivo que se abren con el almacenamiento SQLite
+EXTENSIONES_SQLITE = (".db", ".sqlite", ".sqlite3")
+# Extensión de los archivos con índice de jornadas por empleado (ver AlmacenIndexado)
+EXTENSION_INDEXADO = ".recargos"
+MARCA_INDEXADO = b"RECARGOS-INDEXADO 1\n" # Primera línea del archivo: identifica el formato y su versión
+
+ESQUEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS empleados (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL UNIQUE,
+    salario_mensual REAL NOT NULL,
+    standard_daily_hours INTEGER NOT NULL,
+    tipo_contrato TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jornadas (
+    id INTEGER PRIMARY KEY, -- El id conserva el orden de registro de las jornadas de un mismo día
+    empleado_id INTEGER NOT NULL REFERENCES empleados(id) ON DELETE CASCADE,
+    fecha TEXT NOT NULL, -- YYYY-MM-DD, se ordena igual que las fechas
+    hora_entrada TEXT NOT NULL,
+    hora_salida TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jornadas_empleado_fecha ON jornadas (empleado_id, fecha);
+CREATE INDEX IF NOT EXISTS idx_jornadas_fecha ON jornadas (fecha);
+CREATE TABLE IF NOT EXISTS festivos (
+    fecha TEXT PRIMARY KEY,
+    agregado INTEGER NOT NULL -- 1: festivo agregado manualmente, 0: festivo por regla eliminado manualmente
+);
+CREATE TABLE IF NOT EXISTS configuracion (
+    clave TEXT PRIMARY KEY,
+    valor REAL NOT NULL
+);
+"""
+
+
+def abrir_almacen(filename="app_data.json", segundo_plano=False):
+    """
+    Retorna el almacenamiento adecuado para 'filename': AlmacenSQLite para archivos .db/.sqlite/.sqlite3,
+    AlmacenIndexado para archivos .recargos y DiarioCambios (app_data.json con diario de cambios) para los demás.
+    Todos ofrecen cargar(), los mismos métodos para registrar cambios (empleado_guardado, jornada_registrada,
+    jornadas_importadas, ...),
+    guardar_todo(), compactar() y cerrar(). Con 'segundo_plano' los archivos JSON e indexados se escriben en un
+    hilo aparte (ver DiarioCambios); en SQLite cada cambio ya es una transacción corta y se ignora.
+    """
+    if filename.lower().endswith(EXTENSIONES_SQLITE):
+        return AlmacenSQLite(filename)
+    if filename.lower().endswith(EXTENSION_INDEXADO):
+        return AlmacenIndexado(filename, segundo_plano=segundo_plano)
+    return DiarioCambios(filename, segundo_plano=segundo_plano)
+
+
+def _jornada_desde_fila(fecha, hora_entrada, hora_salida):
+    return {
+        "fecha": datetime.date.fromisoformat(fecha),
+        "hora_entrada": datetime.time.fromisoformat(hora_entrada),
+        "hora_salida": datetime.time.fromisoformat(hora_salida)
+    }
+
+
+def _jornada_a_fila(jornada):
+    return jornada["fecha"].isoformat(), jornada["hora_entrada"].isoformat(), jornada["hora_salida"].isoformat()
+
+
+class AlmacenSQLite:
+    """
+    Almacenamiento en una base de datos SQLite con tablas indexadas de empleados, jornadas (por empleado y
+    fecha), festivos manuales y porcentajes. Cada cambio se guarda en su propia transacción, así que nunca
+    se reescriben los datos completos.
+    """
+
+    def __init__(self, filename="app_data.db"):
+        self.filename = filename
+        self.conexion = sqlite3.connect(filename)
+        self.conexion.execute("PRAGMA foreign_keys = ON")
+        self.conexion.execute("PRAGMA journal_mode = WAL") # Escrituras por cambio sin reescribir la base de datos
+        self.conexion.execute("PRAGMA synchronous = NORMAL")
+        with self.conexion:
+            self.conexion.executescript(ESQUEMA_SQLITE)
+        self.empleados = None
+        self.calculadora = None
+
+    def _id_empleado(self, nombre):
+        fila = self.conexion.execute("SELECT id FROM empleados WHERE nombre = ?", (nombre,)).fetchone()
+        if fila is None:
+            raise KeyError(nombre)
+        return fila[0]
+
+    def _cargar_calculadora(self):
+        calculadora = CalculadoraRecargos()
+        config = dict(self.conexion.execute("SELECT clave, valor FROM configuracion"))
+        config["festivos_agregados"] = []
+        config["festivos_eliminados"] = []
+        for fecha, agregado in self.conexion.execute("SELECT fecha, agregado FROM festivos ORDER BY fecha"):
+            config["festivos_agregados" if agregado else "festivos_eliminados"].append(fecha)
+        calculadora.cargar_configuracion(config)
+        return calculadora
+
+    def _cargar_empleados(self, condicion="", parametros=()):
+        """Crea los empleados con las jornadas que cumplen 'condicion' (SQL sobre la tabla jornadas)."""
+        empleados = {}
+        por_id = {}
+        for id_empleado, nombre, salario_mensual, standard_daily_hours, tipo_contrato in self.conexion.execute(
+                "SELECT id, nombre, salario_mensual, standard_daily_hours, tipo_contrato FROM empleados ORDER BY id"):
+            empleado = Empleado(nombre, salario_mensual, standard_daily_hours, tipo_contrato)
+            empleados[nombre] = empleado
+            por_id[id_empleado] = []
+
+        consulta = "SELECT empleado_id, fecha, hora_entrada, hora_salida FROM jornadas"
+        if condicion:
+            consulta += " WHERE " + condicion
+        for id_empleado, fecha, hora_entrada, hora_salida in self.conexion.execute(consulta + " ORDER BY empleado_id, fecha, id", parametros):
+            por_id[id_empleado].append(_jornada_desde_fila(fecha, hora_entrada, hora_salida))
+
+        for empleado, jornadas in zip(empleados.values(), por_id.values()):
+            empleado.jornadas_registradas = jornadas # Ya vienen ordenadas por fecha
+        return empleados
+
+    def cargar(self):
+        """Carga todos los empleados y la configuración de la calculadora."""
+        self.empleados = self._cargar_empleados()
+        self.calculadora = self._cargar_calculadora()
+        print(f"Datos de la aplicación cargados desde {self.filename}")
+        return self.empleados, self.calculadora
+
+    def empleados_en_periodo(self, periodo_inicio=None, periodo_fin=None):
+        """
+        Retorna los empleados con solo las jornadas del período, filtradas por SQLite con el índice de fechas.
+        Sirve para generar_reporte_consolidado sin cargar el historial completo.
+        """
+        condiciones, parametros = [], []
+        if periodo_inicio:
+            condiciones.append("fecha >= ?")
+            parametros.append(periodo_inicio.isoformat())
+        if periodo_fin:
+            condiciones.append("fecha <= ?")
+            parametros.append(periodo_fin.isoformat())
+        return self._cargar_empleados(" AND ".join(condiciones), parametros)
+
+    def cargar_periodo(self, periodo_inicio=None, periodo_fin=None):
+        """Carga la configuración y los empleados con solo las jornadas del período (ver empleados_en_periodo)."""
+        return self.empleados_en_periodo(periodo_inicio, periodo_fin), self._cargar_calculadora()
+
+    def jornadas_en_periodo(self, nombre, periodo_inicio, periodo_fin):
+        """Retorna las jornadas de un empleado dentro del período, en orden de fecha."""
+        filas = self.conexion.execute(
+            "SELECT fecha, hora_entrada, hora_salida FROM jornadas WHERE empleado_id = ? AND fecha BETWEEN ? AND ? ORDER BY fecha, id",
+            (self._id_empleado(nombre), periodo_inicio.isoformat(), periodo_fin.isoformat()))
+        return [_jornada_desde_fila(*fila) for fila in filas]
+
+    def guardar_todo(self, empleados, calculadora):
+        """Reemplaza todo el contenido de la base de datos en una sola transacción (usado por la migración)."""
+        with self.conexion:
+            self.conexion.execute("DELETE FROM jornadas")
+            self.conexion.execute("DELETE FROM empleados")
+            for empleado in empleados.values():
+                cursor = self.conexion.execute(
+                    "INSERT INTO empleados (nombre, salario_mensual, standard_daily_hours, tipo_contrato) VALUES (?, ?, ?, ?)",
+                    (empleado.nombre, empleado.salario_mensual, empleado.standard_daily_hours, empleado.tipo_contrato))
+                id_empleado = cursor.lastrowid
+                self.conexion.executemany(
+                    "INSERT INTO jornadas (empleado_id, fecha, hora_entrada, hora_salida) VALUES (?, ?, ?, ?)",
+                    ((id_empleado,) + _jornada_a_fila(j) for j in empleado.jornadas_registradas))
+            self._guardar_configuracion(calculadora)
+        self.empleados = empleados
+        self.calculadora = calculadora
+
+    def _guardar_configuracion(self, calculadora):
+        config = calculadora.exportar_configuracion()
+        self.conexion.executemany("INSERT OR REPLACE INTO configuracion (clave, valor) VALUES (?, ?)",
+                                  ((campo, config[campo]) for campo in CAMPOS_CONFIGURACION))
+        self.conexion.execute("DELETE FROM festivos")
+        self.conexion.executemany("INSERT INTO festivos (fecha, agregado) VALUES (?, 1)", ((d,) for d in config["festivos_agregados"]))
+        self.conexion.executemany("INSERT INTO festivos (fecha, agregado) VALUES (?, 0)", ((d,) for d in config["festivos_eliminados"]))
+
+    # Métodos para registrar cambios: los mismos de DiarioCambios
+
+    def empleado_guardado(self, empleado):
+        with self.conexion:
+            self.conexion.execute(
+                "INSERT INTO empleados (nombre, salario_mensual, standard_daily_hours, tipo_contrato) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (nombre) DO UPDATE SET salario_mensual = excluded.salario_mensual, "
+                "standard_daily_hours = excluded.standard_daily_hours, tipo_contrato = excluded.tipo_contrato",
+                (empleado.nombre, empleado.salario_mensual, empleado.standard_daily_hours, empleado.tipo_contrato))
+
+    def empleado_renombrado(self, nombre_anterior, nuevo_nombre):
+        with self.conexion:
+            self.conexion.execute("UPDATE empleados SET nombre = ? WHERE nombre = ?", (nuevo_nombre, nombre_anterior))
+
+    def empleado_eliminado(self, nombre):
+        with self.conexion: # Las jornadas se eliminan en cascada
+            self.conexion.execute("DELETE FROM empleados WHERE nombre = ?", (nombre,))
+
+    def jornada_registrada(self, empleado, jornada):
+        with self.conexion:
+            self.conexion.execute("INSERT INTO jornadas (empleado_id, fecha, hora_entrada, hora_salida) VALUES (?, ?, ?, ?)",
+                                  (self._id_empleado(empleado.nombre),) + _jornada_a_fila(jornada))
+
+    def jornadas_importadas(self, jornadas_por_empleado):
+        """
+        Inserta las jornadas agregadas por una importación ({nombre: jornadas}): una executemany por empleado, todas
+        en una sola transacción. Solo se escriben esas filas; el resto de la base de datos no se toca.
+        """
+        with self.conexion:
+            for nombre, jornadas in jornadas_por_empleado.items():
+                id_empleado = self._id_empleado(nombre)
+                self.conexion.executemany("INSERT INTO jornadas (empleado_id, fecha, hora_entrada, hora_salida) VALUES (?, ?, ?, ?)",
+                                          ((id_empleado,) + _jornada_a_fila(j) for j in jornadas))
+
+    def _id_jornada(self, id_empleado, jornada):
+        # La primera jornada igual, como Empleado.buscar_jornada
+        fila = self.conexion.execute(
+            "SELECT id FROM jornadas WHERE empleado_id = ? AND fecha = ? AND hora_entrada = ? AND hora_salida = ? ORDER BY id LIMIT 1",
+            (id_empleado,) + _jornada_a_fila(jornada)).fetchone()
+        return fila[0] if fila else None
+
+    def jornada_reemplazada(self, empleado, anterior, jornada):
+        with self.conexion:
+            id_empleado = self._id_empleado(empleado.nombre)
+            id_jornada = self._id_jornada(id_empleado, anterior)
+            if id_jornada is None:
+                return
+            if anterior["fecha"] == jornada["fecha"]:
+                self.conexion.execute("UPDATE jornadas SET hora_entrada = ?, hora_salida = ? WHERE id = ?",
+                                      _jornada_a_fila(jornada)[1:] + (id_jornada,))
+            else:
+                # Con otra fecha la jornada queda después de las de ese día, igual que en Empleado.reemplazar_jornada
+                self.conexion.execute("DELETE FROM jornadas WHERE id = ?", (id_jornada,))
+                self.conexion.execute("INSERT INTO jornadas (empleado_id, fecha, hora_entrada, hora_salida) VALUES (?, ?, ?, ?)",
+                                      (id_empleado,) + _jornada_a_fila(jornada))
+
+    def jornada_eliminada(self, empleado, jornada):
+        with self.conexion:
+            id_jornada = self._id_jornada(self._id_empleado(empleado.nombre), jornada)
+            if id_jornada is not None:
+                self.conexion.execute("DELETE FROM jornadas WHERE id = ?", (id_jornada,))
+
+    def configuracion_actualizada(self):
+        with self.conexion:
+            self._guardar_configuracion(self.calculadora)
+
+    def compactar(self):
+        # Los cambios ya están guardados; solo se pasa el registro WAL de SQLite a la base de datos
+        self.conexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def cerrar(self):
+        self.conexion.close()
+
+
+class AlmacenIndexado(DiarioCambios):
+    """
+    Archivo con índice por empleado: al cargar solo se leen la configuración y la lista de empleados, y las
+    jornadas de cada empleado se leen la primera vez que se usan (ver Empleado.diferir_jornadas). El tiempo de
+    inicio depende del número de empleados, no del tamaño del historial.
+
+    Formato: la línea MARCA_INDEXADO, una línea JSON con la configuración de la calculadora, la generación del
+    diario y los empleados (con la posición y el número de sus jornadas) y luego, por empleado, las columnas de
+    JornadasCompactas (días ordinales, segundos de entrada y segundos de salida) como enteros de 32 bits en orden
+    little-endian. Los cambios se registran en un diario igual que con DiarioCambios; al compactar se reescribe el
+    archivo completo (en un archivo temporal que luego reemplaza al anterior), copiando tal cual los bytes de los
+    empleados cuyas jornadas no se llegaron a leer. Con segundo_plano=True se escribe en otro hilo, como en
+    DiarioCambios.
+    """
+
+    def __init__(self, filename="app_data.recargos", max_cambios=TAMANO_MAXIMO_DIARIO, segundo_plano=False):
+        super().__init__(filename, max_cambios, segundo_plano=segundo_plano)
+        self._inicio_datos = 0
+        self._ubicaciones = {} # Nombre -> (posición desde el inicio de los datos, número de jornadas)
+        # Las lecturas de jornadas diferidas y el reemplazo del archivo al compactar (que puede ocurrir en el hilo
+        # de escritura) no se mezclan
+        self._bloqueo_archivo = threading.Lock()
+
+    def cargar(self, solo_lectura=False):
+        """
+        Lee la configuración y los empleados (sin sus jornadas) y reproduce el diario de cambios. Con 'solo_lectura'
+        no se modifica ningún archivo y los errores de lectura se lanzan (ver load_app_data).
+        """
+        empleados, calculadora, generacion = self._leer_indice(solo_lectura)
+        aplicados = _reproducir_diario(self.ruta_diario, generacion, empleados, calculadora, solo_lectura)
+        self.vincular(empleados, calculadora, generacion, aplicados)
+        return empleados, calculadora
+
+    def cargar_periodo(self, periodo_inicio=None, periodo_fin=None):
+        """
+        Carga los datos para un reporte, sin modificar ningún archivo; cada empleado lee sus jornadas recién cuando
+        se calculan las del período.
+        """
+        return self.cargar(solo_lectura=True)
+
+    def _leer_indice(self, solo_lectura=False):
+        empleados = {}
+        calculadora = CalculadoraRecargos()
+        self._ubicaciones = {}
+        if not os.path.exists(self.filename):
+            print(f"Archivo {self.filename} no encontrado. Se iniciará con datos vacíos.")
+            return empleados, calculadora, 0
+        try:
+            with open(self.filename, "rb") as f:
+                if f.readline() != MARCA_INDEXADO:
+                    raise ValueError("el archivo no tiene el formato indexado de jornadas")
+                indice = json.loads(f.readline())
+                self._inicio_datos = f.tell()
+        except (IOError, ValueError) as e:
+            if solo_lectura:
+                raise
+            print(f"Error al cargar los datos del archivo {self.filename}: {e}. Se iniciará con datos vacíos.")
+            return empleados, calculadora, 0
+
+        calculadora.cargar_configuracion(indice.get("calculadora_config", {}))
+        for datos in indice["empleados"]:
+            empleado = Empleado(datos["nombre"], datos["salario_mensual"], datos["standard_daily_hours"], datos["tipo_contrato"])
+            self._ubicaciones[empleado.nombre] = (datos["posicion"], datos["jornadas"])
+            empleado.diferir_jornadas(functools.partial(self._leer_jornadas, empleado.nombre))
+            empleados[empleado.nombre] = empleado
+        print(f"Datos de la aplicación cargados desde {self.filename}")
+        return empleados, calculadora, indice.get("generacion_diario", 0)
+
+    def _leer_bloque(self, nombre):
+        """Bytes de las jornadas del empleado en el archivo actual. Los empleados diferidos conservan su nombre."""
+        with self._bloqueo_archivo:
+            posicion, cantidad = self._ubicaciones[nombre]
+            with open(self.filename, "rb") as f:
+                f.seek(self._inicio_datos + posicion)
+                bloque = f.read(12 * cantidad)
+        if len(bloque) != 12 * cantidad:
+            raise IOError(f"El archivo {self.filename} está incompleto")
+        return bloque
+
+    def _leer_jornadas(self, nombre):
+        bloque = self._leer_bloque(nombre)
+        cantidad = len(bloque) // 12
+        jornadas = JornadasCompactas()
+        for i, columna in enumerate((jornadas.ordinales, jornadas.entradas, jornadas.salidas)):
+            columna.frombytes(bloque[4 * cantidad * i:4 * cantidad * (i + 1)])
+            if sys.byteorder != "little":
+                columna.byteswap()
+        return jornadas
+
+    @staticmethod
+    def _bloque_jornadas(jornadas):
+        partes = []
+        for columna in (jornadas.ordinales, jornadas.entradas, jornadas.salidas):
+            if sys.byteorder != "little":
+                columna = columna[:]
+                columna.byteswap()
+            partes.append(columna.tobytes())
+        return b"".join(partes)
+
+    def _guardar_archivo_principal(self, empleados, calculadora, generacion):
+        bloques = []
+        indice = {"calculadora_config": calculadora.exportar_configuracion(), "generacion_diario": generacion,
+                  "empleados": []}
+        posicion = 0
+        for empleado in empleados.values():
+            if empleado.jornadas_cargadas:
+                bloque = self._bloque_jornadas(empleado.jornadas_registradas)
+            else: # Nunca se leyeron: se copian los bytes del archivo actual
+                bloque = self._leer_bloque(empleado.nombre)
+            indice["empleados"].append({
+                "nombre": empleado.nombre,
+                "salario_mensual": empleado.salario_mensual,
+                "standard_daily_hours": empleado.standard_daily_hours,
+                "tipo_contrato": empleado.tipo_contrato,
+                "posicion": posicion,
+                "jornadas": len(bloque) // 12,
+            })
+            bloques.append(bloque)
+            posicion += len(bloque)
+
+        temporal = self.filename + ".tmp"
+        try:
+            with open(temporal, "wb") as f:
+                f.write(MARCA_INDEXADO)
+                f.write(json.dumps(indice, ensure_ascii=False).encode("utf-8") + b"\n")
+                inicio_datos = f.tell()
+                for bloque in bloques:
+                    f.write(bloque)
+                f.flush()
+                os.fsync(f.fileno())
+            # Los empleados que siguen sin leer sus jornadas las leerán desde su posición en el archivo nuevo
+            with self._bloqueo_archivo:
+                os.replace(temporal, self.filename)
+                self._inicio_datos = inicio_datos
+                self._ubicaciones = {datos["nombre"]: (datos["posicion"], datos["jornadas"]) for datos in indice["empleados"]}
+        except IOError as e:
+            # Igual que save_app_data: el archivo anterior queda intacto y el diario no se borra
+            print(f"Error al guardar los datos: {e}")
+            try:
+                os.remove(temporal)
+            except OSError:
+                pass
+            raise
+        print(f"Datos de la aplicación guardados en {self.filename}")
+
+
+def migrar_datos(origen="app_data.json", destino="app_data.db", compacto=False):
+    """
+    Copia los datos de un archivo JSON (app_data.json, recargos_data.json o cualquiera con el mismo formato,
+    incluyendo su diario de cambios) al almacenamiento de 'destino' según su extensión (ver abrir_almacen): una
+    base de datos SQLite, un archivo indexado .recargos u otro archivo JSON (en el formato compacto de
+    save_app_data si 'compacto'). Retorna (empleados, jornadas) migrados.
+    """
+    if not os.path.exists(origen):
+        raise FileNotFoundError(f"No se encontró el archivo {origen}")
+    empleados, calculadora = load_app_data(origen)
+    almacen = abrir_almacen(destino)
+    if isinstance(almacen, DiarioCambios):
+        almacen.compacto = compacto # Solo se usa si el destino es JSON
+    try:
+        almacen.guardar_todo(empleados, calculadora)
+        if isinstance(almacen, AlmacenSQLite):
+            almacen.compactar() # Pasar el registro WAL a la base de datos
+    finally:
+        almacen.cerrar()
+    total_jornadas = sum(len(e.jornadas_registradas) for e in empleados.values())
+    print(f"Migrados {len(empleados)} empleados y {total_jornadas} jornadas de {origen} a {destino}")
+    return len(empleados), total_jornadas
+
+
+def migrar_json_a_sqlite(origen="app_data.json", destino="app_data.db"):
+    """Copia los datos de un archivo JSON a una base de datos SQLite (ver migrar_datos)."""
+    return migrar_datos(origen, destino)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Copia los datos de un archivo JSON a otro almacenamiento.")
+    parser.add_argument("origen", nargs="?", default="app_data.json", help="archivo JSON de origen (por defecto app_data.json)")
+    parser.add_argument("destino", nargs="?", default="app_data.db", help="destino .db, .recargos o .json (por defecto app_data.db)")
+    parser.add_argument("--compacto", action="store_true", help="con destino .json, usar el formato compacto")
+    args = parser.parse_args()
+    migrar_datos(args.origen, args.destino, args.compacto)
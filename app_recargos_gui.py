@@ -1,39 +1,101 @@
+import time
+INICIO_PROCESO = time.perf_counter() # Referencia para medir el tiempo hasta que se muestra la ventana (--medir-inicio)
+
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
 import datetime
-from tkcalendar import Calendar # Importar el widget de calendario (Asegúrate de instalarlo: pip install tkcalendar)
+import multiprocessing
+import os
+import queue
+import sys
+import threading
 
                 # Importar las clases y las funciones de guardado/carga de tu archivo de lógica
-from recargos_logic import Empleado, CalculadoraRecargos, save_app_data, load_app_data
+from recargos_logic import Empleado, CalculadoraRecargos
+from almacenamiento import abrir_almacen
+from importacion import aplicar_importacion, preparar_importacion
+from exportacion import exportar_acumulados, filas_acumulados
+
+MAX_SECCIONES_EN_COLA = 64 # Secciones de reporte calculadas que pueden esperar a ser mostradas
+SECCIONES_POR_LOTE = 20 # Secciones que se insertan en el área de texto en cada ciclo de la interfaz
+JORNADAS_POR_PAGINA = 100 # Filas que se crean a la vez en la lista de jornadas de Gestión de Empleados
+# Archivos de datos en orden de preferencia: se usa el primero que exista (ver almacenamiento.migrar_datos)
+ARCHIVOS_DATOS = ("app_data.db", "app_data.recargos", "app_data.json")
+
+# Pestañas en orden: texto -> (atributo del frame, método que construye sus widgets, datos que muestra).
+# Cada pestaña se construye la primera vez que se visita y solo se refresca si cambiaron los datos que muestra.
+PESTANAS = {
+                    "Registro de Jornadas": ("frame_jornadas", "_setup_jornadas_tab", ("empleados",)),
+                    "Gestión de Empleados": ("frame_gestion_empleados", "_setup_gestion_empleados_tab", ("empleados", "jornadas")),
+                    "Reportes": ("frame_reportes", "_setup_reportes_tab", ("empleados",)),
+                    "Gestión de Festivos": ("frame_festivos", "_setup_festivos_tab", ("festivos",)),
+                    "Configuración": ("frame_config", "_setup_config_tab", ("empleados", "configuracion")),
+                    "Acumulados de Horas": ("frame_acumulados", "_setup_acumulados_tab", ("empleados",)),
+                    "Recargos Detallados": ("frame_recargos_detallados", "_setup_recargos_detallados_tab", ("empleados",)),
+}
+
+class _ReporteCancelado(Exception):
+                    """Se lanza dentro del hilo de un reporte cuando el usuario lo cancela o pide uno nuevo."""
+
 
 class RecargosApp:
-                    def __init__(self, root):
+                    def __init__(self, root, datos_ejemplo=False):
                         self.root = root
                         self.root.title("Calculadora de Recargos Dominicales y Festivos")
 
-                        # Cargar datos al inicio de la aplicación
-                        self.empleados, self.calculadora = load_app_data()
+                        # Cargar datos al inicio de la aplicación. Si existe app_data.db (ver almacenamiento.migrar_datos)
+                        # se usa SQLite; si existe app_data.recargos, el archivo indexado (las jornadas de cada empleado
+                        # se leen al usarlas); si no, app_data.json con su diario de cambios. En todos los casos cada
+                        # modificación se guarda por separado, sin reescribir todos los datos.
+                        archivo_datos = next((archivo for archivo in ARCHIVOS_DATOS if os.path.exists(archivo)), ARCHIVOS_DATOS[-1])
+                        self.almacen = abrir_almacen(archivo_datos, segundo_plano=True) # Guarda sin bloquear la interfaz
+                        self.empleados, self.calculadora = self.almacen.cargar()
 
                         self.time_options = self._generate_time_options()
 
                         # Variable para almacenar el nombre del empleado seleccionado para edición/visualización de jornadas
                         self._selected_employee_name_for_edit = None
-                        # Variable para almacenar el índice de la jornada seleccionada para edición
-                        self._selected_jornada_index_for_edit = None
+                        # Identificador (iid) de la fila de la jornada seleccionada para edición
+                        self._selected_jornada_iid_for_edit = None
+                        # La lista de jornadas muestra una página a la vez. Cada fila tiene un iid propio (no el índice en
+                        # la lista), que no cambia cuando se eliminan o editan otras jornadas.
+                        self._empleado_jornadas_mostradas = None
+                        self._pagina_jornadas = 0
+                        self._jornadas_por_iid = {}
+                        self._contador_iid_jornadas = 0
 
                         # Variable para el checkbox de día compensatorio
                         self.es_dia_compensatorio = tk.BooleanVar(value=False)
                         self.es_dia_compensatorio.trace_add("write", self._on_dia_compensatorio_toggle)
 
+                        # Los reportes se calculan en hilos aparte; sus secciones vuelven por esta cola, que se revisa
+                        # con root.after para que la ventana nunca se congele. La cola es limitada: si la interfaz va
+                        # más lenta que el cálculo, el hilo espera en vez de acumular todo el reporte en memoria.
+                        self._cola_reportes = queue.Queue(maxsize=MAX_SECCIONES_EN_COLA)
+                        self._reportes_activos = {} # Área de reporte -> evento de cancelación del reporte en curso
+                        self._indicadores_progreso = {} # Área de reporte -> (barra de progreso, etiqueta, botón cancelar)
+                        self._revisando_cola = False
+
+                        # Cada cambio de datos sube la versión de su tipo; cada pestaña recuerda las versiones que mostró
+                        self._versiones_datos = {"empleados": 0, "jornadas": 0, "festivos": 0, "configuracion": 0}
+                        self._estado_pestanas = {}
+                        self._pestanas_construidas = set()
+
+                        # Diálogo de calendario compartido por todos los campos de fecha; se crea (e importa tkcalendar)
+                        # la primera vez que se abre y después solo se oculta y se vuelve a mostrar
+                        self._dialogo_calendario = None
+                        self._calendario = None
+                        self._entry_destino_calendario = None
+
+                        # Los datos de ejemplo solo se cargan si se piden (python app_recargos_gui.py --datos-ejemplo)
+                        if datos_ejemplo:
+                            self._precargar_datos_ejemplo()
 
                         self._crear_widgets_iniciales()
 
                         # Configurar el protocolo de cierre de ventana para guardar datos
                         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
 
-                        # Puedes descomentar la siguiente línea si quieres precargar datos de ejemplo para pruebas
-                        self._precargar_datos_ejemplo()
-
                     def _generate_time_options(self):
                         """Genera una lista de todas las horas del día en formato HH:MM AM/PM."""
                         options = []
@@ -47,45 +109,16 @@ class RecargosApp:
                         self.notebook = ttk.Notebook(self.root)
                         self.notebook.pack(pady=10, expand=True, fill="both")
 
-                        # Pestaña 1: Registro de Jornadas
-                        self.frame_jornadas = ttk.Frame(self.notebook)
-                        self.notebook.add(self.frame_jornadas, text="Registro de Jornadas")
-                        self._setup_jornadas_tab()
-
-                        # Pestaña 2: Gestión de Empleados (Nueva)
-                        self.frame_gestion_empleados = ttk.Frame(self.notebook)
-                        self.notebook.add(self.frame_gestion_empleados, text="Gestión de Empleados")
-                        self._setup_gestion_empleados_tab()
-
-                        # Pestaña 3: Reportes
-                        self.frame_reportes = ttk.Frame(self.notebook)
-                        self.notebook.add(self.frame_reportes, text="Reportes")
-                        self._setup_reportes_tab()
-
-                        # Pestaña 4: Gestión de Festivos
-                        self.frame_festivos = ttk.Frame(self.notebook)
-                        self.notebook.add(self.frame_festivos, text="Gestión de Festivos")
-                        self._setup_festivos_tab()
-
-                        # Pestaña 5: Configuración
-                        self.frame_config = ttk.Frame(self.notebook)
-                        self.notebook.add(self.frame_config, text="Configuración")
-                        self._setup_config_tab() # Llamada inicial para configurar la pestaña de configuración
+                        # Se crean los frames de todas las pestañas, pero sus widgets se construyen al visitarlas por
+                        # primera vez (ver _on_tab_change). Solo la primera pestaña se construye al iniciar.
+                        for texto, (atributo_frame, _, _) in PESTANAS.items():
+                            frame = ttk.Frame(self.notebook)
+                            setattr(self, atributo_frame, frame)
+                            self.notebook.add(frame, text=texto)
 
-                        # Pestaña 6: Acumulados de Horas (Nueva)
-                        self.frame_acumulados = ttk.Frame(self.notebook)
-                        self.notebook.add(self.frame_acumulados, text="Acumulados de Horas")
-                        self._setup_acumulados_tab()
+                        self._construir_pestana("Registro de Jornadas")
+                        self._refrescar_pestana("Registro de Jornadas")
 
-                        # NUEVA PESTAÑA: Recargos Detallados
-                        self.frame_recargos_detallados = ttk.Frame(self.notebook)
-                        self.notebook.add(self.frame_recargos_detallados, text="Recargos Detallados")
-                        self._setup_recargos_detallados_tab()
-
-
-                        # Asegurarse de que todos los combobox y listas existan antes de intentar actualizarlos
-                        self._actualizar_todas_las_listas_empleados() # Llamada inicial para asegurar que todo esté cargado
-                        
                         self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_change)
 
 
@@ -140,6 +173,10 @@ class RecargosApp:
                         self.btn_registrar_jornada = tk.Button(self.frame_jornadas, text="Registrar Jornada", command=self._registrar_jornada)
                         self.btn_registrar_jornada.grid(row=10, column=0, columnspan=2, pady=10)
 
+                        # Importación masiva de jornadas desde un CSV (p. ej. exportado del reloj biométrico)
+                        self.btn_importar_jornadas = tk.Button(self.frame_jornadas, text="Importar CSV...", command=self._importar_jornadas_csv_gui)
+                        self.btn_importar_jornadas.grid(row=10, column=2, padx=5, pady=10)
+
                     def _setup_gestion_empleados_tab(self):
                         tk.Label(self.frame_gestion_empleados, text="--- Gestión de Registros de Empleados ---", font=("Arial", 10, "bold")).pack(pady=10)
 
@@ -193,6 +230,16 @@ class RecargosApp:
                         self.jornadas_treeview.pack(pady=5, padx=5, fill="both", expand=True)
                         self.jornadas_treeview.bind("<<TreeviewSelect>>", self._seleccionar_jornada_para_edicion)
 
+                        # Navegación entre páginas de jornadas
+                        paginacion_frame = ttk.Frame(jornadas_empleado_frame)
+                        paginacion_frame.pack(pady=2, padx=5, fill="x")
+                        self.btn_pagina_anterior = tk.Button(paginacion_frame, text="< Anterior", state="disabled", command=lambda: self._mostrar_pagina_jornadas(self._pagina_jornadas - 1))
+                        self.btn_pagina_anterior.pack(side="left", padx=5)
+                        self.label_pagina_jornadas = tk.Label(paginacion_frame, text="")
+                        self.label_pagina_jornadas.pack(side="left", expand=True)
+                        self.btn_pagina_siguiente = tk.Button(paginacion_frame, text="Siguiente >", state="disabled", command=lambda: self._mostrar_pagina_jornadas(self._pagina_jornadas + 1))
+                        self.btn_pagina_siguiente.pack(side="right", padx=5)
+
                         # Controles de edición de jornada
                         edit_jornada_frame = ttk.LabelFrame(jornadas_empleado_frame, text="Editar/Eliminar Jornada")
                         edit_jornada_frame.pack(pady=10, padx=5, fill="x", expand=False)
@@ -225,8 +272,6 @@ class RecargosApp:
 
                         edit_jornada_frame.columnconfigure(1, weight=1)
 
-                        self._actualizar_lista_gestion_empleados() # Cargar la lista de empleados al inicio de la pestaña
-
                     def _actualizar_lista_gestion_empleados(self):
                         """Actualiza la Listbox de la pestaña de gestión de empleados."""
                         self.empleados_listbox.delete(0, tk.END)
@@ -305,6 +350,7 @@ class RecargosApp:
                             empleado = self.empleados[original_name]
                             empleado.salario_mensual = new_salario
                             empleado.standard_daily_hours = new_standard_hours
+                            self.almacen.empleado_guardado(empleado)
                             messagebox.showinfo("Éxito", f"Empleado '{new_name}' actualizado con éxito.")
                         else:
                             # Crear un nuevo empleado con el nuevo nombre y transferir las jornadas
@@ -312,13 +358,15 @@ class RecargosApp:
                             new_empleado = Empleado(new_name, new_salario, new_standard_hours, old_empleado.tipo_contrato)
                             new_empleado.jornadas_registradas = old_empleado.jornadas_registradas # Transferir jornadas
                             self.empleados[new_name] = new_empleado # Añadir el nuevo
+                            self.almacen.empleado_renombrado(original_name, new_name)
+                            self.almacen.empleado_guardado(new_empleado)
                             messagebox.showinfo("Éxito", f"Empleado '{original_name}' renombrado a '{new_name}' y actualizado con éxito.")
                         
                         self._limpiar_campos_edicion_empleado()
                         self._selected_employee_name_for_edit = None
-                        self._actualizar_todas_las_listas_empleados() # Actualizar todos los combobox y listbox
+                        self._actualizar_lista_gestion_empleados()
                         self._actualizar_lista_jornadas_empleado_seleccionado(None) # Limpiar jornadas después de editar/renombrar empleado
-                        save_app_data(self.empleados, self.calculadora) # Guardar datos después de la modificación
+                        self._marcar_cambio("empleados") # Las demás pestañas se refrescan al visitarlas
 
                     def _eliminar_empleado_gui(self):
                         """Elimina un empleado seleccionado."""
@@ -333,44 +381,71 @@ class RecargosApp:
                         if messagebox.askyesno("Confirmar Eliminación", f"¿Está seguro de que desea eliminar al empleado '{original_name}' y todas sus jornadas?"):
                             if original_name in self.empleados:
                                 del self.empleados[original_name]
+                                self.almacen.empleado_eliminado(original_name) # Guardar el cambio
                                 messagebox.showinfo("Éxito", f"Empleado '{original_name}' eliminado con éxito.")
                                 self._limpiar_campos_edicion_empleado()
                                 self._selected_employee_name_for_edit = None
-                                self._actualizar_todas_las_listas_empleados() # Asegurarse de que se actualicen todas las listas
+                                self._actualizar_lista_gestion_empleados()
                                 self._actualizar_lista_jornadas_empleado_seleccionado(None) # Limpiar jornadas
-                                save_app_data(self.empleados, self.calculadora) # Guardar datos después de la modificación
+                                self._marcar_cambio("empleados") # Las demás pestañas se refrescan al visitarlas
                             else:
                                 messagebox.showerror("Error", "Empleado no encontrado.")
 
                     def _actualizar_lista_jornadas_empleado_seleccionado(self, empleado):
-                        """Actualiza el Treeview con las jornadas del empleado seleccionado."""
+                        """Muestra las jornadas del empleado seleccionado, empezando por la página de las más recientes."""
+                        self._empleado_jornadas_mostradas = empleado
+                        ultima_pagina = max(len(empleado.jornadas_registradas) - 1, 0) // JORNADAS_POR_PAGINA if empleado else 0
+                        self._mostrar_pagina_jornadas(ultima_pagina)
+
+                    def _mostrar_pagina_jornadas(self, pagina):
+                        """Crea solo las filas de una página de jornadas."""
                         self.jornadas_treeview.delete(*self.jornadas_treeview.get_children()) # Limpiar Treeview
-                        self._selected_jornada_index_for_edit = None # Resetear selección de jornada
+                        self._jornadas_por_iid.clear()
+                        self._selected_jornada_iid_for_edit = None # Resetear selección de jornada
                         self._limpiar_campos_edicion_jornada() # Limpiar campos de edición de jornada
 
-                        if empleado:
-                            # Usamos el índice de la jornada como iid para facilitar la edición/eliminación
-                            for i, jornada in enumerate(empleado.jornadas_registradas):
-                                self.jornadas_treeview.insert("", "end", iid=str(i), values=(
-                                    jornada["fecha"].strftime('%Y-%m-%d'),
-                                    jornada["hora_entrada"].strftime('%I:%M %p'),
-                                    jornada["hora_salida"].strftime('%I:%M %p')
-                                ))
+                        empleado = self._empleado_jornadas_mostradas
+                        jornadas = empleado.jornadas_registradas if empleado else []
+                        self._pagina_jornadas = max(0, min(pagina, (len(jornadas) - 1) // JORNADAS_POR_PAGINA)) if jornadas else 0
+                        inicio = self._pagina_jornadas * JORNADAS_POR_PAGINA
+                        for jornada in jornadas[inicio:inicio + JORNADAS_POR_PAGINA]:
+                            self._contador_iid_jornadas += 1
+                            iid = f"jornada{self._contador_iid_jornadas}"
+                            self._jornadas_por_iid[iid] = jornada
+                            self.jornadas_treeview.insert("", "end", iid=iid, values=self._valores_fila_jornada(jornada))
+                        self._actualizar_controles_paginacion()
+
+                    def _valores_fila_jornada(self, jornada):
+                        return (
+                            jornada["fecha"].strftime('%Y-%m-%d'),
+                            jornada["hora_entrada"].strftime('%I:%M %p'),
+                            jornada["hora_salida"].strftime('%I:%M %p')
+                        )
+
+                    def _actualizar_controles_paginacion(self):
+                        empleado = self._empleado_jornadas_mostradas
+                        total = len(empleado.jornadas_registradas) if empleado else 0
+                        filas = len(self.jornadas_treeview.get_children())
+                        inicio = self._pagina_jornadas * JORNADAS_POR_PAGINA
+                        if filas:
+                            self.label_pagina_jornadas.config(text=f"Jornadas {inicio + 1}-{inicio + filas} de {total}")
+                        else:
+                            self.label_pagina_jornadas.config(text=f"{total} jornadas" if empleado else "")
+                        self.btn_pagina_anterior.config(state="normal" if self._pagina_jornadas > 0 else "disabled")
+                        self.btn_pagina_siguiente.config(state="normal" if inicio + filas < total else "disabled")
 
                     def _seleccionar_jornada_para_edicion(self, event=None):
                         """Carga los datos de la jornada seleccionada en los campos de edición."""
                         selected_item_id = self.jornadas_treeview.focus()
                         if not selected_item_id:
                             self._limpiar_campos_edicion_jornada()
-                            self._selected_jornada_index_for_edit = None
+                            self._selected_jornada_iid_for_edit = None
                             return
 
-                        # El iid es el índice de la jornada en la lista del empleado
-                        self._selected_jornada_index_for_edit = int(selected_item_id)
+                        self._selected_jornada_iid_for_edit = selected_item_id
 
-                        empleado = self.empleados.get(self._selected_employee_name_for_edit)
-                        if empleado and 0 <= self._selected_jornada_index_for_edit < len(empleado.jornadas_registradas):
-                            jornada = empleado.jornadas_registradas[self._selected_jornada_index_for_edit]
+                        jornada = self._jornadas_por_iid.get(selected_item_id)
+                        if jornada:
                             
                             # Habilitar el entry para insertar la fecha
                             self.edit_jornada_fecha.config(state="normal")
@@ -382,7 +457,7 @@ class RecargosApp:
                             self.edit_jornada_hora_salida.set(jornada["hora_salida"].strftime('%I:%M %p'))
                         else:
                             self._limpiar_campos_edicion_jornada()
-                            self._selected_jornada_index_for_edit = None
+                            self._selected_jornada_iid_for_edit = None
 
                     def _limpiar_campos_edicion_jornada(self):
                         """Limpia los campos de entrada de la sección de edición de jornada."""
@@ -395,7 +470,7 @@ class RecargosApp:
 
                     def _guardar_cambios_jornada(self):
                         """Guarda los cambios de una jornada editada."""
-                        if self._selected_employee_name_for_edit is None or self._selected_jornada_index_for_edit is None:
+                        if self._selected_employee_name_for_edit is None or self._selected_jornada_iid_for_edit is None:
                             messagebox.showwarning("Advertencia", "Seleccione un empleado y una jornada para guardar cambios.")
                             return
 
@@ -421,22 +496,41 @@ class RecargosApp:
                             messagebox.showerror("Error", f"Error en el formato de fecha/hora: {e}\nAsegúrese que la fecha es YYYY-MM-DD y las horas son HH:MM AM/PM.")
                             return
 
+                        iid = self._selected_jornada_iid_for_edit
+                        jornada_anterior = self._jornadas_por_iid.get(iid)
+                        indice = empleado.buscar_jornada(jornada_anterior) if jornada_anterior else None
+                        if indice is None:
+                            messagebox.showerror("Error", "Jornada no encontrada.")
+                            return
+
                         # Actualizar la jornada en la lista del empleado
-                        empleado.jornadas_registradas[self._selected_jornada_index_for_edit] = {
+                        nueva_jornada = {
                             "fecha": new_fecha,
                             "hora_entrada": new_hora_entrada,
                             "hora_salida": new_hora_salida
                         }
+                        nuevo_indice = empleado.reemplazar_jornada(indice, nueva_jornada)
+                        self.almacen.jornada_reemplazada(empleado, jornada_anterior, nueva_jornada) # Guardar el cambio
                         messagebox.showinfo("Éxito", f"Jornada actualizada con éxito para {empleado.nombre}.")
-                        
-                        self._actualizar_lista_jornadas_empleado_seleccionado(empleado) # Refrescar el Treeview
+
+                        # Actualizar solo la fila editada (se mueve si cambió de fecha, o se quita si ya no cae en esta página)
+                        inicio = self._pagina_jornadas * JORNADAS_POR_PAGINA
+                        if inicio <= nuevo_indice < inicio + len(self.jornadas_treeview.get_children()):
+                            self._jornadas_por_iid[iid] = nueva_jornada
+                            self.jornadas_treeview.item(iid, values=self._valores_fila_jornada(nueva_jornada))
+                            self.jornadas_treeview.move(iid, "", nuevo_indice - inicio)
+                        else:
+                            del self._jornadas_por_iid[iid]
+                            self.jornadas_treeview.delete(iid)
+                            self._actualizar_controles_paginacion()
+                        self.jornadas_treeview.selection_remove(self.jornadas_treeview.selection())
                         self._limpiar_campos_edicion_jornada() # Limpiar campos de edición de jornada
-                        self._selected_jornada_index_for_edit = None # Resetear selección
-                        save_app_data(self.empleados, self.calculadora) # Guardar datos después de la modificación
+                        self._selected_jornada_iid_for_edit = None # Resetear selección
+                        self._marcar_cambio("jornadas")
 
                     def _eliminar_jornada_gui(self):
                         """Elimina una jornada seleccionada de un empleado."""
-                        if self._selected_employee_name_for_edit is None or self._selected_jornada_index_for_edit is None:
+                        if self._selected_employee_name_for_edit is None or self._selected_jornada_iid_for_edit is None:
                             messagebox.showwarning("Advertencia", "Seleccione un empleado y una jornada para eliminar.")
                             return
 
@@ -446,13 +540,20 @@ class RecargosApp:
                             return
 
                         if messagebox.askyesno("Confirmar Eliminación", "¿Está seguro de que desea eliminar esta jornada?"):
-                            if 0 <= self._selected_jornada_index_for_edit < len(empleado.jornadas_registradas):
-                                del empleado.jornadas_registradas[self._selected_jornada_index_for_edit]
+                            iid = self._selected_jornada_iid_for_edit
+                            jornada = self._jornadas_por_iid.get(iid)
+                            indice = empleado.buscar_jornada(jornada) if jornada else None
+                            if indice is not None:
+                                empleado.eliminar_jornada(indice)
+                                self.almacen.jornada_eliminada(empleado, jornada) # Guardar el cambio
                                 messagebox.showinfo("Éxito", "Jornada eliminada con éxito.")
-                                self._actualizar_lista_jornadas_empleado_seleccionado(empleado) # Refrescar el Treeview
+                                # Solo se quita la fila eliminada; las demás conservan su iid
+                                del self._jornadas_por_iid[iid]
+                                self.jornadas_treeview.delete(iid)
+                                self._actualizar_controles_paginacion()
                                 self._limpiar_campos_edicion_jornada() # Limpiar campos de edición de jornada
-                                self._selected_jornada_index_for_edit = None # Resetear selección
-                                save_app_data(self.empleados, self.calculadora) # Guardar datos después de la modificación
+                                self._selected_jornada_iid_for_edit = None # Resetear selección
+                                self._marcar_cambio("jornadas")
                             else:
                                 messagebox.showerror("Error", "Jornada no encontrado.")
 
@@ -475,6 +576,10 @@ class RecargosApp:
                         self.entry_periodo_fin.pack(pady=2)
                         self.btn_generar_reporte_consolidado = tk.Button(self.frame_reportes, text="Generar Reporte Consolidado", command=self._generar_reporte_consolidado_gui)
                         self.btn_generar_reporte_consolidado.pack(pady=10)
+                        self.btn_exportar_acumulados = tk.Button(self.frame_reportes, text="Exportar Acumulados (CSV/XLSX/Parquet)...", command=self._exportar_acumulados_gui)
+                        self.btn_exportar_acumulados.pack(pady=2)
+
+                        self._crear_indicador_progreso(self.frame_reportes, "reportes")
 
                         self.report_area = scrolledtext.ScrolledText(self.frame_reportes, width=80, height=20, wrap=tk.WORD)
                         self.report_area.pack(pady=10, padx=10, expand=True, fill="both")
@@ -500,7 +605,6 @@ class RecargosApp:
                         tk.Label(self.frame_festivos, text="Días Festivos Actuales:").pack(pady=5)
                         self.festivos_listbox = tk.Listbox(self.frame_festivos, width=30, height=10)
                         self.festivos_listbox.pack(pady=5)
-                        self._actualizar_lista_festivos()
 
                     def _setup_config_tab(self):
                         tk.Label(self.frame_config, text="--- Configuración de Porcentajes ---", font=("Arial", 10, "bold")).pack(pady=10)
@@ -589,6 +693,8 @@ class RecargosApp:
                         self.btn_mostrar_acumulados = tk.Button(self.frame_acumulados, text="Mostrar Acumulados", command=self._mostrar_acumulados_empleado)
                         self.btn_mostrar_acumulados.pack(pady=5)
 
+                        self._crear_indicador_progreso(self.frame_acumulados, "acumulados")
+
                         self.acumulados_report_area = scrolledtext.ScrolledText(self.frame_acumulados, width=80, height=20, wrap=tk.WORD)
                         self.acumulados_report_area.pack(pady=10, padx=10, expand=True, fill="both")
 
@@ -620,6 +726,8 @@ class RecargosApp:
                         self.btn_generar_recargos_detallados = tk.Button(self.frame_recargos_detallados, text="Generar Reporte Detallado", command=self._generar_recargos_detallados_gui)
                         self.btn_generar_recargos_detallados.pack(pady=5)
 
+                        self._crear_indicador_progreso(self.frame_recargos_detallados, "detallados")
+
                         self.detallados_report_area = scrolledtext.ScrolledText(self.frame_recargos_detallados, width=80, height=20, wrap=tk.WORD)
                         self.detallados_report_area.pack(pady=10, padx=10, expand=True, fill="both")
 
@@ -662,27 +770,33 @@ class RecargosApp:
                         
                         jornadas_to_process = []
                         if periodo_inicio and periodo_fin:
-                            # Filtrar jornadas por el período seleccionado
-                            for jornada in original_empleado.jornadas_registradas:
-                                if periodo_inicio <= jornada["fecha"] <= periodo_fin:
-                                    jornadas_to_process.append(jornada)
+                            # Filtrar jornadas por el período seleccionado (búsqueda binaria sobre las jornadas ordenadas)
+                            jornadas_to_process = original_empleado.jornadas_en_periodo(periodo_inicio, periodo_fin)
                             report_period_info = f"Período: {periodo_inicio.strftime('%Y-%m-%d')} a {periodo_fin.strftime('%Y-%m-%d')}"
                         elif periodo_inicio or periodo_fin: # Si solo se ingresa una fecha, es un error de uso
                             messagebox.showwarning("Advertencia", "Por favor, ingrese AMBAS fechas de inicio y fin para filtrar por período, o deje AMBAS vacías para el acumulado total.")
                             return
                         else:
-                            # Si no se selecciona período, procesar todas las jornadas registradas
-                            jornadas_to_process = original_empleado.jornadas_registradas
-                            report_period_info = "Todas las jornadas registradas"
+                            # Si no se selecciona período, se usan los totales de todas las jornadas que se mantienen en el
+                            # empleado (solo se procesan los cambios desde la última consulta), aquí mismo para que no se
+                            # mezclen con cambios hechos mientras el reporte se genera
+                            self._iniciar_reporte("acumulados", self._texto_acumulados, original_empleado, None, "Todas las jornadas registradas",
+                                                  self.calculadora.get_accumulated_hours_and_surcharges(original_empleado))
+                            return
 
 
-                        # Crear un objeto Empleado temporal con las jornadas filtradas para usar la lógica existente
-                        # Esto evita modificar la lista original de jornadas del empleado y permite reutilizar CalculadoraRecargos
-                        temp_empleado = Empleado(original_empleado.nombre, original_empleado.salario_mensual, original_empleado.standard_daily_hours, original_empleado.tipo_contrato)
-                        temp_empleado.jornadas_registradas = jornadas_to_process
+                        # El cálculo y el texto se generan en segundo plano (se copia la lista para no verse afectado por cambios)
+                        self._iniciar_reporte("acumulados", self._texto_acumulados, original_empleado, jornadas_to_process[:], report_period_info)
 
-                        # Obtener los acumulados usando la lógica existente
-                        acum_horas, _, _ = self.calculadora.get_accumulated_hours_and_surcharges(temp_empleado)
+                    def _texto_acumulados(self, calculadora, original_empleado, jornadas_to_process, report_period_info, acumulados=None):
+                        """
+                        Genera el texto de la pestaña Acumulados de Horas. Se ejecuta en el hilo del reporte. Si se reciben
+                        los acumulados ya calculados no se usan las jornadas.
+                        """
+                        # Obtener los acumulados solo de las jornadas filtradas, sin modificar la lista original del empleado
+                        if acumulados is None:
+                            acumulados = calculadora.get_accumulated_hours_and_surcharges(original_empleado, jornadas_to_process)
+                        acum_horas, _, _ = acumulados
 
                         reporte_str = f"--- Acumulados de Horas para {original_empleado.nombre} ({report_period_info}) ---\n"
                         reporte_str += f"Horas Diarias Estándar: {original_empleado.standard_daily_hours} horas\n\n"
@@ -779,9 +893,7 @@ class RecargosApp:
                         reporte_str += f"\nTotal de Horas Acumuladas con Recargo (Todas las Categorías): {total_general_horas_con_recargo:.2f}h\n"
                         reporte_str += f"Total de Todas las Horas Acumuladas (Recargo + Ordinarias): {total_todas_las_horas_acumuladas:.2f}h\n"
                         reporte_str += "-----------------------------------------------------\n"
-
-                        self.acumulados_report_area.delete(1.0, tk.END)
-                        self.acumulados_report_area.insert(tk.END, reporte_str)
+                        return reporte_str
 
                     def _generar_recargos_detallados_gui(self):
                         nombre_empleado = self.detallados_empleado_combobox.get()
@@ -821,21 +933,27 @@ class RecargosApp:
                         
                         jornadas_to_process = []
                         if periodo_inicio and periodo_fin:
-                            for jornada in original_empleado.jornadas_registradas:
-                                if periodo_inicio <= jornada["fecha"] <= periodo_fin:
-                                    jornadas_to_process.append(jornada)
+                            jornadas_to_process = original_empleado.jornadas_en_periodo(periodo_inicio, periodo_fin)
                             report_period_info = f"Período: {periodo_inicio.strftime('%Y-%m-%d')} a {periodo_fin.strftime('%Y-%m-%d')}"
                         elif periodo_inicio or periodo_fin:
                             messagebox.showwarning("Advertencia", "Por favor, ingrese AMBAS fechas de inicio y fin para filtrar por período, o deje AMBAS vacías para el acumulado total.")
                             return
                         else:
-                            jornadas_to_process = original_empleado.jornadas_registradas
-                            report_period_info = "Todas las jornadas registradas"
+                            # Totales de todas las jornadas mantenidos en el empleado (ver _mostrar_acumulados_empleado)
+                            self._iniciar_reporte("detallados", self._texto_recargos_detallados, original_empleado, None, "Todas las jornadas registradas",
+                                                  self.calculadora.get_accumulated_hours_and_surcharges(original_empleado))
+                            return
 
-                        temp_empleado = Empleado(original_empleado.nombre, original_empleado.salario_mensual, original_empleado.standard_daily_hours, original_empleado.tipo_contrato)
-                        temp_empleado.jornadas_registradas = jornadas_to_process
+                        self._iniciar_reporte("detallados", self._texto_recargos_detallados, original_empleado, jornadas_to_process[:], report_period_info)
 
-                        acum_horas, acum_surcharge_values, total_gross_value = self.calculadora.get_accumulated_hours_and_surcharges(temp_empleado)
+                    def _texto_recargos_detallados(self, calculadora, original_empleado, jornadas_to_process, report_period_info, acumulados=None):
+                        """
+                        Genera el texto de la pestaña Recargos Detallados. Se ejecuta en el hilo del reporte. Si se reciben
+                        los acumulados ya calculados no se usan las jornadas.
+                        """
+                        if acumulados is None:
+                            acumulados = calculadora.get_accumulated_hours_and_surcharges(original_empleado, jornadas_to_process)
+                        acum_horas, acum_surcharge_values, total_gross_value = acumulados
 
                         reporte_str = f"--- Recargos Detallados para {original_empleado.nombre} ({report_period_info}) ---\n"
                         reporte_str += f"Salario Mensual: ${original_empleado.salario_mensual:,.2f}\n"
@@ -876,7 +994,7 @@ class RecargosApp:
                                     valor_base = hours * original_empleado.obtener_valor_hora_ordinaria()
                                     reporte_str += f"- {display_names[key]}: {hours:.2f}h (Valor Base: ${valor_base:,.2f})\n"
                                 else:
-                                    porcentaje = self.calculadora._get_percentage_for_hour_type(key)
+                                    porcentaje = calculadora._get_percentage_for_hour_type(key)
                                     surcharge_value = acum_surcharge_values.get(key, 0.0)
                                     # Eliminado el "Total" por tipo de hora
                                     reporte_str += f"- {display_names[key]} ({porcentaje}%): {hours:.2f}h (Recargo: ${surcharge_value:,.2f})\n"
@@ -892,7 +1010,7 @@ class RecargosApp:
                         for key in domingo_keys:
                             hours = acum_horas.get(key, 0.0)
                             if hours > 0:
-                                porcentaje = self.calculadora._get_percentage_for_hour_type(key)
+                                porcentaje = calculadora._get_percentage_for_hour_type(key)
                                 surcharge_value = acum_surcharge_values.get(key, 0.0)
                                 # Eliminado el "Total" por tipo de hora
                                 reporte_str += f"- {display_names[key]} ({porcentaje}%): {hours:.2f}h (Recargo: ${surcharge_value:,.2f})\n"
@@ -908,7 +1026,7 @@ class RecargosApp:
                         for key in festivo_keys:
                             hours = acum_horas.get(key, 0.0)
                             if hours > 0:
-                                porcentaje = self.calculadora._get_percentage_for_hour_type(key)
+                                porcentaje = calculadora._get_percentage_for_hour_type(key)
                                 surcharge_value = acum_surcharge_values.get(key, 0.0)
                                 # Eliminado el "Total" por tipo de hora
                                 reporte_str += f"- {display_names[key]} ({porcentaje}%): {hours:.2f}h (Recargo: ${surcharge_value:,.2f})\n"
@@ -920,7 +1038,7 @@ class RecargosApp:
                         total_ord_diurnas_df_hours = acum_horas.get("horas_ordinarias_diurnas_domingo", 0.0) + acum_horas.get("horas_ordinarias_diurnas_festivo", 0.0)
                         total_ord_diurnas_df_surcharge = acum_surcharge_values.get("horas_ordinarias_diurnas_domingo", 0.0) + acum_surcharge_values.get("horas_ordinarias_diurnas_festivo", 0.0)
                         # Asumimos que el porcentaje para ambas es el mismo (180%)
-                        porcentaje_ord_diurnas_df = self.calculadora._get_percentage_for_hour_type("horas_ordinarias_diurnas_domingo")
+                        porcentaje_ord_diurnas_df = calculadora._get_percentage_for_hour_type("horas_ordinarias_diurnas_domingo")
                         if total_ord_diurnas_df_hours > 0:
                             # CAMBIADO: "Horas Ordinarias Diurnas D/F" a "Recargo Dominical Festivo Diurno No Compensado"
                             reporte_str += f"- Recargo Dominical Festivo Diurno No Compensado ({porcentaje_ord_diurnas_df}%): {total_ord_diurnas_df_hours:.2f}h (Recargo: ${total_ord_diurnas_df_surcharge:,.2f})\n"
@@ -928,7 +1046,7 @@ class RecargosApp:
                         # Horas Ordinarias Nocturnas D/F Combinadas
                         total_ord_nocturnas_df_hours = acum_horas.get("horas_ordinarias_nocturnas_domingo", 0.0) + acum_horas.get("horas_ordinarias_nocturnas_festivo", 0.0)
                         total_ord_nocturnas_df_surcharge = acum_surcharge_values.get("horas_ordinarias_nocturnas_domingo", 0.0) + acum_surcharge_values.get("horas_ordinarias_nocturnas_festivo", 0.0)
-                        porcentaje_ord_nocturnas_df = self.calculadora._get_percentage_for_hour_type("horas_ordinarias_nocturnas_domingo")
+                        porcentaje_ord_nocturnas_df = calculadora._get_percentage_for_hour_type("horas_ordinarias_nocturnas_domingo")
                         if total_ord_nocturnas_df_hours > 0:
                             # CAMBIADO: "Horas Ordinarias Nocturnas D/F" a "Recargo Dominical o Festivo Nocturno No Compensado"
                             reporte_str += f"- Recargo Dominical o Festivo Nocturno No Compensado ({porcentaje_ord_nocturnas_df}%): {total_ord_nocturnas_df_hours:.2f}h (Recargo: ${total_ord_nocturnas_df_surcharge:,.2f})\n"
@@ -936,35 +1054,33 @@ class RecargosApp:
                         # Horas Extras Diurnas D/F Combinadas (no se solicitó cambio de nombre)
                         total_ext_diurnas_df_hours = acum_horas.get("horas_extras_diurnas_domingo", 0.0) + acum_horas.get("horas_extras_diurnas_festivo", 0.0)
                         total_ext_diurnas_df_surcharge = acum_surcharge_values.get("horas_extras_diurnas_domingo", 0.0) + acum_surcharge_values.get("horas_extras_diurnas_festivo", 0.0)
-                        porcentaje_ext_diurnas_df = self.calculadora._get_percentage_for_hour_type("horas_extras_diurnas_domingo")
+                        porcentaje_ext_diurnas_df = calculadora._get_percentage_for_hour_type("horas_extras_diurnas_domingo")
                         if total_ext_diurnas_df_hours > 0:
                             reporte_str += f"- Horas Extras Diurnas D/F ({porcentaje_ext_diurnas_df}%): {total_ext_diurnas_df_hours:.2f}h (Recargo: ${total_ext_diurnas_df_surcharge:,.2f})\n"
 
                         # Horas Extras Nocturnas D/F Combinadas (no se solicitó cambio de nombre)
                         total_ext_nocturnas_df_hours = acum_horas.get("horas_extras_nocturnas_domingo", 0.0) + acum_horas.get("horas_extras_nocturnas_festivo", 0.0)
                         total_ext_nocturnas_df_surcharge = acum_surcharge_values.get("horas_extras_nocturnas_domingo", 0.0) + acum_surcharge_values.get("horas_extras_nocturnas_festivo", 0.0)
-                        porcentaje_ext_nocturnas_df = self.calculadora._get_percentage_for_hour_type("horas_extras_nocturnas_domingo")
+                        porcentaje_ext_nocturnas_df = calculadora._get_percentage_for_hour_type("horas_extras_nocturnas_domingo")
                         if total_ext_nocturnas_df_hours > 0:
                             reporte_str += f"- Horas Extras Nocturnas D/F ({porcentaje_ext_nocturnas_df}%): {total_ext_nocturnas_df_hours:.2f}h (Recargo: ${total_ext_nocturnas_df_surcharge:,.2f})\n"
 
 
                         reporte_str += f"\nTotal Valor Bruto Acumulado: ${total_gross_value:,.2f}\n"
                         reporte_str += "-----------------------------------------------------\n"
-
-                        self.detallados_report_area.delete(1.0, tk.END)
-                        self.detallados_report_area.insert(tk.END, reporte_str)
+                        return reporte_str
 
 
                     def _open_calendar_dialog(self, target_entry):
-                        """Abre un diálogo de calendario para seleccionar una fecha."""
-                        top = tk.Toplevel(self.root)
-                        top.title("Seleccionar Fecha")
-                        
-                        # Centrar la ventana del calendario
-                        self.root.update_idletasks()
-                        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (top.winfo_width() // 2)
-                        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (top.winfo_height() // 2)
-                        top.geometry(f"+{x}+{y}")
+                        """Muestra el diálogo de calendario para seleccionar una fecha en target_entry."""
+                        if self._dialogo_calendario is None:
+                            try:
+                                self._crear_dialogo_calendario()
+                            except ImportError:
+                                messagebox.showerror("Error", "Para seleccionar fechas instale tkcalendar: pip install tkcalendar")
+                                return
+                        top = self._dialogo_calendario
+                        self._entry_destino_calendario = target_entry
 
                         # Obtener la fecha actual o la fecha del entry si ya hay una
                         try:
@@ -975,21 +1091,44 @@ class RecargosApp:
                                 current_date = datetime.date.today()
                         except ValueError:
                             current_date = datetime.date.today()
+                        self._calendario.selection_set(current_date)
+                        self._calendario.see(current_date)
+
+                        # Centrar la ventana del calendario
+                        self.root.update_idletasks()
+                        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (top.winfo_reqwidth() // 2)
+                        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (top.winfo_reqheight() // 2)
+                        top.geometry(f"+{x}+{y}")
+                        top.deiconify()
+                        top.lift()
+                        top.focus_set()
+
+                    def _crear_dialogo_calendario(self):
+                        """Crea el diálogo de calendario (oculto) la primera vez que se necesita."""
+                        from tkcalendar import Calendar # Se importa aquí para no retrasar el inicio (pip install tkcalendar)
+
+                        top = tk.Toplevel(self.root)
+                        top.title("Seleccionar Fecha")
+                        top.withdraw()
+                        top.protocol("WM_DELETE_WINDOW", top.withdraw) # Cerrar solo oculta el diálogo para reutilizarlo
+
+                        calendario = Calendar(top, selectmode='day', date_pattern='yyyy-mm-dd')
+                        calendario.pack(pady=20)
+                        ttk.Button(top, text="Seleccionar Fecha", command=self._fijar_fecha_calendario).pack(pady=10)
 
-                        cal = Calendar(top, selectmode='day',
-                                    year=current_date.year, month=current_date.month, day=current_date.day,
-                                    date_pattern='yyyy-mm-dd')
-                        cal.pack(pady=20)
+                        self._dialogo_calendario = top
+                        self._calendario = calendario
 
-                        def set_date():
-                            selected_date = cal.selection_get()
+                    def _fijar_fecha_calendario(self):
+                        """Copia la fecha elegida en el campo que abrió el calendario y oculta el diálogo."""
+                        selected_date = self._calendario.selection_get()
+                        target_entry = self._entry_destino_calendario
+                        if selected_date and target_entry is not None:
                             target_entry.config(state="normal") # Habilitar para escribir
                             target_entry.delete(0, tk.END)
                             target_entry.insert(0, selected_date.strftime('%Y-%m-%d'))
                             target_entry.config(state="readonly") # Volver a solo lectura
-                            top.destroy()
-
-                        ttk.Button(top, text="Seleccionar Fecha", command=set_date).pack(pady=10)
+                        self._dialogo_calendario.withdraw()
 
 
                     def _crear_empleado(self):
@@ -1018,14 +1157,15 @@ class RecargosApp:
 
                         nuevo_empleado = Empleado(nombre, salario, standard_daily_hours)
                         self.empleados[nombre] = nuevo_empleado
+                        self.almacen.empleado_guardado(nuevo_empleado) # Guardar el cambio
                         messagebox.showinfo("Éxito", f"Empleado '{nombre}' creado con éxito (Horas diarias estándar: {standard_daily_hours}h).") # Eliminado salario del mensaje
                         
                         self.entry_nombre_empleado.delete(0, tk.END)
                         self.entry_salario_empleado.delete(0, tk.END)
                         self.entry_standard_daily_hours.delete(0, tk.END)
                         self.entry_standard_daily_hours.insert(0, "8") # Restablecer valor por defecto
-                        self._actualizar_todas_las_listas_empleados() # Actualizar todos los combobox y listbox
-                        save_app_data(self.empleados, self.calculadora) # Guardar datos después de la modificación
+                        self._actualizar_lista_empleados() # Actualizar los combobox de empleados
+                        self._marcar_cambio("empleados")
 
 
                     def _actualizar_lista_empleados(self):
@@ -1065,15 +1205,6 @@ class RecargosApp:
                             if hasattr(self, 'detallados_empleado_combobox'):
                                 self.detallados_empleado_combobox.set("")
 
-                    def _actualizar_todas_las_listas_empleados(self):
-                        """
-                        Actualiza todos los combobox y listbox de empleados en la aplicación.
-                        Este método centraliza las llamadas a _actualizar_lista_empleados y _actualizar_lista_gestion_empleados.
-                        """
-                        self._actualizar_lista_empleados()
-                        self._actualizar_lista_gestion_empleados()
-
-
                     def _on_empleado_selected(self, event=None):
                         pass
 
@@ -1123,6 +1254,9 @@ class RecargosApp:
 
                         empleado = self.empleados[nombre_empleado]
                         mensaje = empleado.registrar_jornada(fecha, hora_entrada, hora_salida)
+                        # Solo se guarda la jornada nueva; no se reescribe todo el archivo de datos
+                        self.almacen.jornada_registrada(empleado, {"fecha": fecha, "hora_entrada": hora_entrada, "hora_salida": hora_salida})
+                        self._marcar_cambio("jornadas")
                         messagebox.showinfo("Registro Exitoso", mensaje)
                         
                         # Limpiar el campo de fecha usando el nuevo método de limpieza para Entry de solo lectura
@@ -1133,9 +1267,56 @@ class RecargosApp:
                         # Desactivar el checkbox de día compensatorio después de registrar
                         self.es_dia_compensatorio.set(False)
 
-                        save_app_data(self.empleados, self.calculadora) # Guardar datos después de la modificación
 
 
+                    def _importar_jornadas_csv_gui(self):
+                        """
+                        Importa las jornadas de un CSV (columnas empleado, fecha, hora_entrada, hora_salida). El archivo se
+                        lee y valida en un hilo aparte sobre una copia de los empleados; al terminar, las jornadas aceptadas
+                        se agregan y se guardan desde la interfaz (ver _terminar_importacion).
+                        """
+                        ruta = filedialog.askopenfilename(title="Importar jornadas", filetypes=[("Archivos CSV", "*.csv"), ("Todos los archivos", "*.*")])
+                        if not ruta:
+                            return
+                        # Como en los reportes, el hilo trabaja sobre una foto de los datos
+                        copias = {}
+                        for nombre, empleado in self.empleados.items():
+                            copia = Empleado(empleado.nombre, empleado.salario_mensual, empleado.standard_daily_hours, empleado.tipo_contrato)
+                            copia.jornadas_registradas = empleado.jornadas_registradas
+                            copias[nombre] = copia
+                        versiones = (self._versiones_datos["empleados"], self._versiones_datos["jornadas"])
+                        self.btn_importar_jornadas.config(state="disabled")
+                        self.root.config(cursor="watch")
+                        self._ejecutar_en_hilo("importacion", preparar_importacion, (ruta, copias),
+                                               lambda preparacion, error: self._terminar_importacion(preparacion, error, versiones))
+
+                    def _terminar_importacion(self, preparacion, error, versiones):
+                        """Agrega y guarda las jornadas que preparó el hilo de importación y muestra el resumen."""
+                        self.btn_importar_jornadas.config(state="normal")
+                        self.root.config(cursor="")
+                        if error is not None:
+                            messagebox.showerror("Error", f"No se pudo importar el archivo: {error}")
+                            return
+
+                        resultado, preparadas = preparacion
+                        # Si se editaron empleados o jornadas mientras se leía el archivo, se vuelve a revisar cada jornada
+                        cambiaron = versiones != (self._versiones_datos["empleados"], self._versiones_datos["jornadas"])
+                        try:
+                            agregadas = aplicar_importacion(preparadas, self.empleados, self.almacen, revisar=cambiaron)
+                        except OSError as e:
+                            self._marcar_cambio("jornadas")
+                            messagebox.showerror("Error", f"Las jornadas se importaron, pero no se pudieron guardar: {e}")
+                            return
+                        if agregadas:
+                            self._marcar_cambio("jornadas")
+                        mensaje = f"Filas leídas: {resultado.filas}\nJornadas importadas: {agregadas}\nFilas rechazadas: {resultado.rechazadas}"
+                        if agregadas < resultado.aceptadas:
+                            mensaje += f"\nJornadas omitidas por cambios durante la importación: {resultado.aceptadas - agregadas}"
+                        if resultado.detalle_rechazos:
+                            mensaje += "\n\nPrimeras filas rechazadas:\n" + "\n".join(
+                                f"Línea {linea}: {motivo}" for linea, motivo, _ in resultado.detalle_rechazos[:10])
+                        messagebox.showinfo("Importación de Jornadas", mensaje)
+
                     def _generar_reporte_empleado_gui(self):
                         nombre_empleado = self.reporte_empleado_combobox.get()
                         if not nombre_empleado:
@@ -1144,13 +1325,15 @@ class RecargosApp:
 
                         empleado = self.empleados.get(nombre_empleado)
                         if empleado:
-                            reporte = self.calculadora.generar_reporte_empleado(empleado)
-                            self.report_area.delete(1.0, tk.END)
-                            self.report_area.insert(tk.END, reporte)
+                            # Se copia el empleado con sus jornadas para que el hilo no vea cambios posteriores
+                            copia = Empleado(empleado.nombre, empleado.salario_mensual, empleado.standard_daily_hours, empleado.tipo_contrato)
+                            copia.jornadas_registradas = empleado.jornadas_registradas
+                            self._iniciar_reporte("reportes", CalculadoraRecargos.secciones_reporte_empleado, copia)
                         else:
                             messagebox.showerror("Error", "Empleado no encontrado.")
 
-                    def _generar_reporte_consolidado_gui(self):
+                    def _leer_periodo_reportes(self):
+                        """Retorna (periodo_inicio, periodo_fin) de la pestaña Reportes (None si están vacíos), o None si son inválidos."""
                         fecha_inicio_str = self.entry_periodo_inicio.get().strip()
                         fecha_fin_str = self.entry_periodo_fin.get().strip()
                         
@@ -1174,6 +1357,13 @@ class RecargosApp:
                         if periodo_inicio and periodo_fin and periodo_inicio > periodo_fin:
                             messagebox.showerror("Error", "La fecha de inicio no puede ser posterior a la fecha de fin.")
                             return
+                        return periodo_inicio, periodo_fin
+
+                    def _generar_reporte_consolidado_gui(self):
+                        periodo = self._leer_periodo_reportes()
+                        if periodo is None:
+                            return
+                        periodo_inicio, periodo_fin = periodo
 
                         lista_empleados = list(self.empleados.values())
                         if not lista_empleados:
@@ -1181,13 +1371,249 @@ class RecargosApp:
                             self.report_area.insert(tk.END, "No hay empleados registrados para generar un reporte consolidado.")
                             return
 
-                        reporte = self.calculadora.generar_reporte_consolidado(lista_empleados, periodo_inicio, periodo_fin)
-                        self.report_area.delete(1.0, tk.END)
-                        self.report_area.insert(tk.END, reporte)
+                        # Cada empleado se reemplaza por sus jornadas del período (ya copiadas) para que el hilo trabaje
+                        # sobre una foto de los datos
+                        lista_periodo = []
+                        for empleado in lista_empleados:
+                            copia = Empleado(empleado.nombre, empleado.salario_mensual, empleado.standard_daily_hours, empleado.tipo_contrato)
+                            copia.jornadas_registradas = empleado.jornadas_en_periodo(periodo_inicio, periodo_fin)
+                            lista_periodo.append(copia)
+                        self._iniciar_reporte("reportes", self._texto_reporte_consolidado, lista_periodo, periodo_inicio, periodo_fin, con_progreso=True)
+
+                    def _exportar_acumulados_gui(self):
+                        """
+                        Exporta una fila por empleado con horas, recargos y valor bruto del período a CSV, XLSX o Parquet. El
+                        cálculo y la escritura se hacen en un hilo aparte, sobre una foto de las jornadas del período y una
+                        copia de la calculadora (como el reporte consolidado); al terminar se muestra el resultado.
+                        """
+                        periodo = self._leer_periodo_reportes()
+                        if periodo is None:
+                            return
+                        ruta = filedialog.asksaveasfilename(title="Exportar acumulados", defaultextension=".csv",
+                                                            filetypes=[("CSV", "*.csv"), ("Excel", "*.xlsx"), ("Parquet", "*.parquet")])
+                        if not ruta:
+                            return
+                        copias = {}
+                        for nombre, empleado in self.empleados.items():
+                            copia = Empleado(empleado.nombre, empleado.salario_mensual, empleado.standard_daily_hours, empleado.tipo_contrato)
+                            copia.jornadas_registradas = empleado.jornadas_en_periodo(*periodo)
+                            copias[nombre] = copia
+                        # filas_acumulados es un generador: las filas se calculan en el hilo, a medida que se escriben
+                        filas = filas_acumulados(copias, self.calculadora.copiar(), *periodo)
+                        self.btn_exportar_acumulados.config(state="disabled")
+                        self.root.config(cursor="watch")
+                        self._ejecutar_en_hilo("exportacion", exportar_acumulados, (ruta, filas),
+                                               lambda total, error: self._terminar_exportacion(ruta, total, error))
+
+                    def _terminar_exportacion(self, ruta, total, error):
+                        self.btn_exportar_acumulados.config(state="normal")
+                        self.root.config(cursor="")
+                        if error is not None:
+                            messagebox.showerror("Error", f"No se pudo exportar: {error}")
+                            return
+                        messagebox.showinfo("Exportación", f"Se exportaron {total} empleados a {ruta}.")
+
+                    def _texto_reporte_consolidado(self, calculadora, lista_empleados, periodo_inicio, periodo_fin, progreso):
+                        # Generador: cada empleado se calcula en el hilo justo antes de enviar su sección
+                        return calculadora.secciones_reporte_consolidado(lista_empleados, periodo_inicio, periodo_fin, progreso=progreso)
+
+                    def _crear_indicador_progreso(self, parent, area):
+                        """Crea la barra de progreso y el botón Cancelar de un área de reporte."""
+                        frame = tk.Frame(parent)
+                        frame.pack(pady=2, padx=10, fill="x")
+                        barra = ttk.Progressbar(frame, mode="determinate", length=300)
+                        barra.pack(side="left", padx=5)
+                        etiqueta = tk.Label(frame, text="")
+                        etiqueta.pack(side="left", padx=5)
+                        boton = tk.Button(frame, text="Cancelar", state="disabled", command=lambda: self._cancelar_reporte(area))
+                        boton.pack(side="right", padx=5)
+                        self._indicadores_progreso[area] = (barra, etiqueta, boton)
+
+                    def _area_de_reporte(self, area):
+                        return {"reportes": self.report_area, "acumulados": self.acumulados_report_area, "detallados": self.detallados_report_area}[area]
+
+                    def _iniciar_reporte(self, area, funcion, *args, con_progreso=False):
+                        """
+                        Ejecuta funcion(calculadora, *args) en un hilo aparte y muestra su resultado en el área indicada, donde
+                        calculadora es una copia de self.calculadora hecha aquí (ver CalculadoraRecargos.copiar): así el hilo no
+                        comparte con la interfaz el calendario de festivos, que se completa a medida que se consultan años, ni
+                        la caché de jornadas. La función puede retornar el texto completo o un generador de secciones, que se
+                        van mostrando a medida que llegan.
+                        Si ya había un reporte en curso para esa área se cancela: su resultado se descarta y el hilo se
+                        detiene en la siguiente sección. Con con_progreso=True la función recibe además un argumento
+                        'progreso(hechos, total)'.
+                        """
+                        self._cancelar_reporte(area, mostrar=False)
+                        cancelado = threading.Event()
+                        self._reportes_activos[area] = cancelado
+                        calculadora = self.calculadora.copiar()
+
+                        barra, etiqueta, boton = self._indicadores_progreso[area]
+                        if con_progreso:
+                            barra.config(mode="determinate", value=0)
+                        else:
+                            barra.config(mode="indeterminate")
+                            barra.start(15)
+                        etiqueta.config(text="Calculando...")
+                        boton.config(state="normal")
+                        self._area_de_reporte(area).delete(1.0, tk.END) # Las secciones se agregan a medida que llegan
+
+                        def enviar(mensaje):
+                            # Espera si la cola está llena, pero sin quedar bloqueado si el reporte se cancela
+                            while True:
+                                if cancelado.is_set():
+                                    raise _ReporteCancelado()
+                                try:
+                                    self._cola_reportes.put(mensaje, timeout=0.1)
+                                    return
+                                except queue.Full:
+                                    pass
+
+                        def progreso(hechos, total):
+                            enviar(("progreso", area, cancelado, (hechos, total)))
+
+                        def trabajar():
+                            try:
+                                if con_progreso:
+                                    resultado = funcion(calculadora, *args, progreso)
+                                else:
+                                    resultado = funcion(calculadora, *args)
+                                if isinstance(resultado, str):
+                                    resultado = (resultado,)
+                                for seccion in resultado:
+                                    enviar(("seccion", area, cancelado, seccion))
+                                enviar(("fin", area, cancelado, None))
+                            except _ReporteCancelado:
+                                pass
+                            except Exception as e: # Cualquier error se muestra en la ventana, no se pierde en el hilo
+                                self._cola_reportes.put(("error", area, cancelado, e))
+
+                        threading.Thread(target=trabajar, daemon=True).start()
+                        if not self._revisando_cola:
+                            self._revisando_cola = True
+                            self.root.after(50, self._revisar_cola_reportes)
+
+                    def _ejecutar_en_hilo(self, area, funcion, args, al_terminar):
+                        """
+                        Ejecuta funcion(*args) en un hilo aparte y después llama al_terminar(resultado, error) desde la
+                        interfaz (error es None si no hubo excepción). El resultado vuelve por la cola de los reportes, que se
+                        revisa con root.after, así que la ventana sigue respondiendo mientras tanto. 'area' identifica la
+                        tarea en curso (por ejemplo "importacion") como las áreas de reporte.
+                        """
+                        cancelado = threading.Event()
+                        self._reportes_activos[area] = cancelado
+
+                        def trabajar():
+                            try:
+                                resultado = funcion(*args)
+                            except Exception as e: # Se informa en la ventana, no se pierde en el hilo
+                                self._cola_reportes.put(("tarea", area, cancelado, (al_terminar, None, e)))
+                            else:
+                                self._cola_reportes.put(("tarea", area, cancelado, (al_terminar, resultado, None)))
+
+                        threading.Thread(target=trabajar, daemon=True).start()
+                        if not self._revisando_cola:
+                            self._revisando_cola = True
+                            self.root.after(50, self._revisar_cola_reportes)
+
+                    def _cancelar_reporte(self, area, mostrar=True):
+                        cancelado = self._reportes_activos.pop(area, None)
+                        if cancelado is not None:
+                            cancelado.set()
+                            if mostrar:
+                                self._finalizar_indicador(area, "Reporte cancelado.")
+
+                    def _finalizar_indicador(self, area, texto):
+                        barra, etiqueta, boton = self._indicadores_progreso[area]
+                        barra.stop()
+                        barra.config(mode="determinate", value=0)
+                        etiqueta.config(text=texto)
+                        boton.config(state="disabled")
+
+                    def _revisar_cola_reportes(self):
+                        """
+                        Procesa hasta SECCIONES_POR_LOTE mensajes de los hilos de reporte, insertando juntas las secciones
+                        consecutivas de una misma área, y los resultados de _ejecutar_en_hilo. Si quedan mensajes, continúa
+                        en el siguiente ciclo libre de la interfaz. Los mensajes de reportes cancelados o reemplazados se
+                        ignoran.
+                        """
+                        pendientes = {} # Área -> secciones por insertar en este lote
+                        for _ in range(SECCIONES_POR_LOTE):
+                            try:
+                                tipo, area, cancelado, dato = self._cola_reportes.get_nowait()
+                            except queue.Empty:
+                                break
+                            if self._reportes_activos.get(area) is not cancelado:
+                                continue # Reporte viejo
+                            if tipo == "tarea": # Resultado de _ejecutar_en_hilo
+                                del self._reportes_activos[area]
+                                al_terminar, resultado, error = dato
+                                al_terminar(resultado, error)
+                            elif tipo == "seccion":
+                                pendientes.setdefault(area, []).append(dato)
+                            elif tipo == "progreso":
+                                hechos, total = dato
+                                barra, etiqueta, _ = self._indicadores_progreso[area]
+                                barra.config(maximum=total, value=hechos)
+                                etiqueta.config(text=f"Calculando... {hechos}/{total}")
+                            else:
+                                self._insertar_secciones(area, pendientes.pop(area, ()))
+                                del self._reportes_activos[area]
+                                if tipo == "fin":
+                                    self._finalizar_indicador(area, "")
+                                else:
+                                    self._finalizar_indicador(area, "Error al generar el reporte.")
+                                    messagebox.showerror("Error", f"No se pudo generar el reporte: {dato}")
+                        for area, secciones in pendientes.items():
+                            self._insertar_secciones(area, secciones)
+
+                        if not self._cola_reportes.empty():
+                            self.root.after_idle(self._revisar_cola_reportes) # Seguir apenas la interfaz esté libre
+                        elif self._reportes_activos:
+                            self.root.after(50, self._revisar_cola_reportes)
+                        else:
+                            self._revisando_cola = False
+
+                    def _insertar_secciones(self, area, secciones):
+                        if secciones:
+                            self._area_de_reporte(area).insert(tk.END, "".join(secciones))
 
 
                     def _on_tab_change(self, event):
                         selected_tab = self.notebook.tab(self.notebook.select(), "text")
+                        self._construir_pestana(selected_tab)
+                        self._refrescar_pestana(selected_tab)
+
+                    def _construir_pestana(self, selected_tab):
+                        """Construye los widgets de una pestaña la primera vez que se necesita."""
+                        if selected_tab not in self._pestanas_construidas:
+                            self._pestanas_construidas.add(selected_tab)
+                            getattr(self, PESTANAS[selected_tab][1])()
+
+                    def _estado_datos_pestana(self, selected_tab):
+                        """Versiones de los datos que muestra la pestaña; si no cambian, no hace falta refrescarla."""
+                        estado = tuple(self._versiones_datos[tipo] for tipo in PESTANAS[selected_tab][2])
+                        if selected_tab == "Configuración":
+                            estado += (self.empleados_combobox.get(),) # El valor de la hora depende del empleado elegido en Registro
+                        return estado
+
+                    def _marcar_cambio(self, *tipos):
+                        """
+                        Registra que cambiaron datos de los tipos dados. La pestaña visible ya actualizó sus propios widgets;
+                        las demás se refrescan cuando se visiten.
+                        """
+                        for tipo in tipos:
+                            self._versiones_datos[tipo] += 1
+                        selected_tab = self.notebook.tab(self.notebook.select(), "text")
+                        self._estado_pestanas[selected_tab] = self._estado_datos_pestana(selected_tab)
+
+                    def _refrescar_pestana(self, selected_tab):
+                        """Refresca las listas de la pestaña solo si cambiaron sus datos desde la última vez que se mostró."""
+                        estado = self._estado_datos_pestana(selected_tab)
+                        if self._estado_pestanas.get(selected_tab) == estado:
+                            return
+                        self._estado_pestanas[selected_tab] = estado
+
                         if selected_tab == "Registro de Jornadas" or selected_tab == "Reportes" or selected_tab == "Acumulados de Horas" or selected_tab == "Recargos Detallados":
                             self._actualizar_lista_empleados()
                         elif selected_tab == "Gestión de Empleados":
@@ -1262,7 +1688,8 @@ class RecargosApp:
                             self.entry_festivo_fecha.config(state="readonly") # Volver a solo lectura
 
                             self._actualizar_lista_festivos()
-                            save_app_data(self.empleados, self.calculadora) # Guardar datos después de la modificación
+                            self.almacen.configuracion_actualizada() # Guardar el cambio
+                            self._marcar_cambio("festivos")
                         except ValueError:
                             messagebox.showerror("Error", "Formato de fecha inválido. Use YYYY-MM-DD.")
 
@@ -1281,13 +1708,15 @@ class RecargosApp:
                             self.entry_festivo_fecha.config(state="readonly") # Volver a solo lectura
 
                             self._actualizar_lista_festivos()
-                            save_app_data(self.empleados, self.calculadora) # Guardar datos después de la modificación
+                            self.almacen.configuracion_actualizada() # Guardar el cambio
+                            self._marcar_cambio("festivos")
                         except ValueError:
                             messagebox.showerror("Error", "Formato de fecha inválido. Use YYYY-MM-DD.")
 
                     def _actualizar_lista_festivos(self):
                         self.festivos_listbox.delete(0, tk.END)
-                        for fecha in sorted(self.calculadora.dias_festivos):
+                        self.calculadora.dias_festivos.incluir_anio(datetime.date.today().year) # Mostrar siempre los festivos del año en curso
+                        for fecha in self.calculadora.dias_festivos: # El calendario ya entrega las fechas ordenadas
                             self.festivos_listbox.insert(tk.END, fecha.strftime('%Y-%m-%d'))
 
 
@@ -1353,22 +1782,30 @@ class RecargosApp:
                             messagebox.showinfo("Configuración", mensaje)
                             
                             self._refresh_config_tab_data() # Refrescar la pestaña de configuración para mostrar los nuevos valores
-                            save_app_data(self.empleados, self.calculadora) # Guardar datos después de la modificación
+                            self.almacen.configuracion_actualizada() # Guardar el cambio
+                            self._marcar_cambio("configuracion")
                         except ValueError as e:
                             messagebox.showerror("Error", f"Valores de porcentaje inválidos: {e}")
 
                     def _on_closing(self):
                         """Maneja el evento de cierre de la ventana para guardar datos."""
                         if messagebox.askokcancel("Salir", "¿Desea guardar los cambios y salir de la aplicación?"):
-                            save_app_data(self.empleados, self.calculadora)
-                            self.root.destroy()
-                        else:
-                            self.root.destroy() # Si no quiere guardar, igual cierra la app
+                            self.almacen.compactar() # Guardar todos los datos pendientes
+                        # Los cambios del diario se escriben en segundo plano: se espera a que todos queden en disco
+                        # antes de cerrar, también si no se quiere compactar
+                        try:
+                            self.almacen.cerrar()
+                        except OSError as e:
+                            if not messagebox.askyesno("Error al guardar",
+                                                       f"No se pudieron guardar todos los cambios: {e}\n\n"
+                                                       "¿Desea salir de todos modos? Los cambios no guardados se perderán."):
+                                return # La aplicación sigue abierta; el próximo cambio vuelve a intentar guardar
+                        self.root.destroy()
 
                     def _precargar_datos_ejemplo(self):
                         """
-                        Este método está comentado por defecto. Descoméntalo y úsalo si necesitas
-                        precargar datos de ejemplo al iniciar la aplicación para pruebas.
+                        Precarga datos de ejemplo para pruebas. Solo se usa si la aplicación se inicia con --datos-ejemplo,
+                        ya que sobrescribe los empleados de ejemplo y reescribe todos los datos guardados.
                         """
                         # Ajustado el salario para que el valor de la hora ordinaria sea 6470
                         empleado1 = Empleado("Ana Pérez", 1_423_400, 8, "indefinido") # 1,423,400 / 220 = 6,470
@@ -1405,12 +1842,16 @@ class RecargosApp:
                         # CORRECCIÓN: Similar a la anterior, para 24 horas se usa la misma hora de inicio y fin.
                         empleado2.registrar_jornada(datetime.date(2025, 12, 25), datetime.time(21, 0), datetime.time(21, 0)) # 24 horas en Festivo, nocturnas
 
-                        # Se corrigió el nombre del método para actualizar las listas de empleados
-                        self._actualizar_todas_las_listas_empleados()
-                        self._actualizar_lista_festivos()
-                        save_app_data(self.empleados, self.calculadora) # Guardar los datos de ejemplo
+                        self.almacen.guardar_todo(self.empleados, self.calculadora) # Guardar los datos de ejemplo
 
 if __name__ == "__main__":
+                    multiprocessing.freeze_support() # Necesario para el reporte consolidado en paralelo en el ejecutable de PyInstaller
                     root = tk.Tk()
-                    app = RecargosApp(root)
-                    root.mainloop()
+                    app = RecargosApp(root, datos_ejemplo="--datos-ejemplo" in sys.argv)
+                    if "--medir-inicio" in sys.argv:
+                        # Mide el tiempo desde que se empieza a cargar este módulo hasta que la ventana es visible, y sale
+                        root.wait_visibility()
+                        print(f"Ventana visible en {time.perf_counter() - INICIO_PROCESO:.3f} s")
+                        root.destroy()
+                    else:
+                        root.mainloop()
@@ -0,0 +1,77 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Perfil de compilación para un inicio rápido: carpeta (onedir) en lugar de un solo archivo, sin UPX y con bytecode
+# optimizado. El ejecutable de un solo archivo (app_recargos_gui.spec) se descomprime en una carpeta temporal en cada
+# inicio; este no. Compilar con:  pyinstaller app_recargos_gui_rapido.spec
+# Resultado: dist/app_recargos_gui_rapido/app_recargos_gui_rapido(.exe). Para comparar ambos perfiles: medir_inicio.py
+
+
+# Módulos de la biblioteca estándar y de Tk que la aplicación no usa
+excludes = [
+    'tkinter.tix',
+    'tkinter.dnd',
+    'turtle',
+    'turtledemo',
+    'idlelib',
+    'lib2to3',
+    'pydoc',
+    'pydoc_data',
+    'doctest',
+    'pdb',
+    'unittest',
+    'test',
+    'distutils',
+    'setuptools',
+    'pip',
+    'ftplib',
+    'imaplib',
+    'smtplib',
+    'poplib',
+    'nntplib',
+    'telnetlib',
+    'xmlrpc',
+    'http.server',
+    'curses',
+    'readline',
+]
+
+a = Analysis(
+    ['app_recargos_gui.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=excludes,
+    noarchive=False,
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='app_recargos_gui_rapido',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='app_recargos_gui_rapido',
+)
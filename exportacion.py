@@ -0,0 +1,149 @@
+"""
+Exportación tabular de los acumulados por empleado (una fila por empleado y período) a CSV, XLSX o Parquet,
+para cargarlos en el sistema de nómina sin transcribir los reportes de texto.
+
+Las filas se generan y escriben una por una (en Parquet, por grupos pequeños), así que la memoria usada no
+depende del número de empleados. XLSX requiere openpyxl y Parquet requiere pyarrow (pip install openpyxl pyarrow).
+"""
+import csv
+import decimal
+import os
+
+from recargos_logic import CATEGORIAS_HORAS
+
+# Columnas de la tabla: identificación, horas por categoría, valor del recargo por categoría (las horas ordinarias
+# diurnas no tienen recargo) y totales
+COLUMNAS_RECARGOS = tuple("recargo_" + categoria[len("horas_"):] for categoria in CATEGORIAS_HORAS[1:])
+COLUMNAS_EXPORTACION = (
+    ("empleado", "periodo_inicio", "periodo_fin", "jornadas")
+    + CATEGORIAS_HORAS
+    + COLUMNAS_RECARGOS
+    + ("total_recargos", "valor_bruto")
+)
+
+FILAS_POR_GRUPO_PARQUET = 1000 # Filas que se acumulan antes de escribir cada grupo en Parquet
+
+
+def filas_acumulados(empleados, calculadora, periodo_inicio=None, periodo_fin=None, nombres=None, procesos=None,
+                     exacto=False):
+    """
+    Entrega un diccionario por empleado (en orden alfabético, o en el orden de 'nombres') con las jornadas del
+    período, las horas y recargos por categoría y el valor bruto total. Los empleados sin jornadas en el período
+    también se incluyen, con valores en cero. Con 'exacto' los valores son Decimal (ver
+    CalculadoraRecargos.acumulados_exactos). Si algún nombre no existe lanza ValueError al llamarla, antes de
+    calcular cualquier fila; los cálculos se hacen a medida que se recorren las filas.
+    """
+    if nombres:
+        faltantes = [nombre for nombre in nombres if nombre not in empleados]
+        if faltantes:
+            raise ValueError(f"Empleado(s) no encontrado(s): {', '.join(faltantes)}")
+        lista_empleados = [empleados[nombre] for nombre in nombres]
+    else:
+        lista_empleados = [empleados[nombre] for nombre in sorted(empleados)]
+    return _generar_filas(lista_empleados, calculadora, periodo_inicio, periodo_fin, procesos, exacto)
+
+
+def _generar_filas(lista_empleados, calculadora, periodo_inicio, periodo_fin, procesos, exacto):
+    cero = decimal.Decimal(0) if exacto else 0.0
+    for empleado, jornadas, acumulados in calculadora.acumulados_por_empleado(lista_empleados, periodo_inicio, periodo_fin, procesos,
+                                                                              exacto=exacto):
+        if acumulados is None:
+            horas, recargos, valor_bruto = dict.fromkeys(CATEGORIAS_HORAS, cero), dict.fromkeys(CATEGORIAS_HORAS[1:], cero), cero
+        else:
+            horas, recargos, valor_bruto = acumulados
+        yield {
+            "empleado": empleado.nombre,
+            "periodo_inicio": periodo_inicio.isoformat() if periodo_inicio else None,
+            "periodo_fin": periodo_fin.isoformat() if periodo_fin else None,
+            "jornadas": len(jornadas),
+            "horas": horas,
+            "recargos": recargos,
+            "valor_bruto": valor_bruto,
+        }
+
+
+def fila_tabular(fila):
+    """Convierte una fila de filas_acumulados() en una tupla en el orden de COLUMNAS_EXPORTACION."""
+    recargos = [fila["recargos"][categoria] for categoria in CATEGORIAS_HORAS[1:]]
+    return ((fila["empleado"], fila["periodo_inicio"], fila["periodo_fin"], fila["jornadas"])
+            + tuple(fila["horas"][categoria] for categoria in CATEGORIAS_HORAS)
+            + tuple(recargos)
+            + (sum(recargos), fila["valor_bruto"]))
+
+
+def _escribir_csv(ruta, tuplas, exacto=False):
+    total = 0
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(COLUMNAS_EXPORTACION)
+        for tupla in tuplas:
+            escritor.writerow(tupla)
+            total += 1
+    return total
+
+
+def _escribir_xlsx(ruta, tuplas, exacto=False):
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ImportError("La exportación a XLSX requiere openpyxl. Instálelo con: pip install openpyxl")
+    libro = Workbook(write_only=True) # Modo de solo escritura: cada fila se escribe sin guardar la hoja en memoria
+    hoja = libro.create_sheet("Acumulados")
+    hoja.append(COLUMNAS_EXPORTACION)
+    total = 0
+    for tupla in tuplas:
+        hoja.append(tupla)
+        total += 1
+    libro.save(ruta)
+    return total
+
+
+def _escribir_parquet(ruta, tuplas, exacto=False):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("La exportación a Parquet requiere pyarrow. Instálelo con: pip install pyarrow")
+    # En modo exacto las horas (4 decimales) y el dinero (centavos) se guardan como decimales de Parquet
+    tipo_horas = pa.decimal128(12, 4) if exacto else pa.float64()
+    tipo_dinero = pa.decimal128(18, 2) if exacto else pa.float64()
+    esquema = pa.schema(
+        [("empleado", pa.string()), ("periodo_inicio", pa.string()), ("periodo_fin", pa.string()), ("jornadas", pa.int64())]
+        + [(columna, tipo_horas) for columna in CATEGORIAS_HORAS]
+        + [(columna, tipo_dinero) for columna in COLUMNAS_EXPORTACION[4 + len(CATEGORIAS_HORAS):]]
+    )
+
+    def escribir_grupo(grupo):
+        columnas = zip(*grupo) # Filas -> columnas
+        escritor.write_batch(pa.RecordBatch.from_arrays(
+            [pa.array(columna, campo.type) for columna, campo in zip(columnas, esquema)], schema=esquema))
+
+    total = 0
+    with pq.ParquetWriter(ruta, esquema) as escritor:
+        grupo = []
+        for tupla in tuplas:
+            grupo.append(tupla)
+            if len(grupo) >= FILAS_POR_GRUPO_PARQUET:
+                escribir_grupo(grupo)
+                total += len(grupo)
+                grupo = []
+        if grupo:
+            escribir_grupo(grupo)
+            total += len(grupo)
+    return total
+
+
+ESCRITORES_TABULARES = {"csv": _escribir_csv, "xlsx": _escribir_xlsx, "parquet": _escribir_parquet}
+
+
+def exportar_acumulados(ruta, filas, formato=None, exacto=False):
+    """
+    Escribe las filas de filas_acumulados() en 'ruta' y retorna cuántas se escribieron. Si no se indica el
+    formato ("csv", "xlsx" o "parquet") se toma de la extensión del archivo. 'exacto' debe coincidir con el
+    usado en filas_acumulados().
+    """
+    if formato is None:
+        formato = os.path.splitext(ruta)[1].lstrip(".").lower()
+    if formato not in ESCRITORES_TABULARES:
+        raise ValueError(f"Formato de exportación no soportado: '{formato}' (use {', '.join(ESCRITORES_TABULARES)})")
+    return ESCRITORES_TABULARES[formato](ruta, (fila_tabular(fila) for fila in filas), exacto)
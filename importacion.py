@@ -0,0 +1,276 @@
+"""
+Importación masiva de jornadas desde archivos CSV (por ejemplo, exportaciones del reloj biométrico).
+
+El archivo se lee fila por fila; cada fila se valida (empleado existente, fecha y horas con formato válido, jornada
+no repetida) y las jornadas aceptadas se reúnen por lotes en columnas compactas. Solo se agregan a los empleados si
+todo el archivo se leyó sin errores; si la lectura falla a mitad, los empleados quedan como estaban. Las filas
+rechazadas se informan con su número de línea y el motivo. Al final se guardan solo las jornadas agregadas, de una
+vez (ver aplicar_importacion).
+
+El archivo puede estar en UTF-8 (con o sin BOM) o, como lo exporta Excel en Windows, en cp1252.
+
+Uso:
+    python importacion.py reloj.csv [--datos app_data.json] [--rechazos rechazos.csv] [--columnas empleado,fecha,entrada,salida]
+                                    [--codificacion cp1252]
+"""
+import argparse
+import codecs
+import collections
+import csv
+import datetime
+import sys
+
+from recargos_logic import JornadasCompactas
+
+COLUMNAS_CSV = ("empleado", "fecha", "hora_entrada", "hora_salida") # Encabezados por defecto (sin distinguir mayúsculas)
+FORMATOS_FECHA = ('%Y-%m-%d', '%d/%m/%Y')
+FORMATOS_HORA = ('%H:%M', '%H:%M:%S', '%I:%M %p', '%I:%M:%S %p')
+CODIFICACIONES_CSV = ("utf-8-sig", "cp1252") # Se usa la primera con la que se puede leer todo el archivo
+TAMANO_LOTE_IMPORTACION = 5000 # Filas aceptadas que se acumulan como diccionarios antes de pasarlas a columnas compactas
+MAXIMO_RECHAZOS_GUARDADOS = 10000 # Filas rechazadas que se conservan con detalle (el conteo siempre es completo)
+
+ResultadoImportacion = collections.namedtuple("ResultadoImportacion", "filas aceptadas rechazadas detalle_rechazos")
+ResultadoImportacion.__doc__ = """
+Resultado de importar_jornadas_csv: filas leídas, jornadas aceptadas, filas rechazadas y una lista de
+(número de línea, motivo, fila) con las primeras MAXIMO_RECHAZOS_GUARDADOS filas rechazadas.
+"""
+
+
+def _leer_fecha(texto):
+    try:
+        return datetime.date.fromisoformat(texto) # Camino rápido para YYYY-MM-DD
+    except ValueError:
+        pass
+    for formato in FORMATOS_FECHA[1:]:
+        try:
+            return datetime.datetime.strptime(texto, formato).date()
+        except ValueError:
+            pass
+    raise ValueError(f"fecha inválida '{texto}'")
+
+
+def _leer_hora(texto):
+    try:
+        hora = datetime.time.fromisoformat(texto) # Camino rápido para HH:MM y HH:MM:SS
+        if hora.tzinfo is None:
+            return hora
+    except ValueError:
+        pass
+    for formato in FORMATOS_HORA[2:]:
+        try:
+            return datetime.datetime.strptime(texto, formato).time()
+        except ValueError:
+            pass
+    raise ValueError(f"hora inválida '{texto}'")
+
+
+def _detectar_codificacion(ruta, codificaciones=CODIFICACIONES_CSV):
+    """
+    Retorna la primera codificación de 'codificaciones' con la que se puede leer todo el archivo (se lee por bloques,
+    sin cargarlo en memoria). Si ninguna sirve retorna la última, que informará el error al leer.
+    """
+    for codificacion in codificaciones[:-1]:
+        decodificador = codecs.getincrementaldecoder(codificacion)()
+        try:
+            with open(ruta, "rb") as archivo:
+                for bloque in iter(lambda: archivo.read(1 << 20), b""):
+                    decodificador.decode(bloque)
+            decodificador.decode(b"", final=True)
+        except UnicodeDecodeError:
+            continue
+        return codificacion
+    return codificaciones[-1]
+
+
+def _abrir_csv(archivo):
+    """Retorna un csv.reader del archivo, detectando el separador (',', ';' o tabulador)."""
+    muestra = archivo.read(4096)
+    archivo.seek(0)
+    try:
+        dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+    except csv.Error:
+        dialecto = csv.excel
+    return csv.reader(archivo, dialecto)
+
+
+def _posiciones_columnas(encabezado, columnas):
+    encabezado = [nombre.strip().lower() for nombre in encabezado]
+    try:
+        return [encabezado.index(columna.lower()) for columna in columnas]
+    except ValueError:
+        raise ValueError(f"El archivo debe tener las columnas {', '.join(columnas)}; tiene: {', '.join(encabezado)}")
+
+
+def leer_jornadas_csv(ruta, columnas=COLUMNAS_CSV, codificacion=None):
+    """
+    Lee el CSV fila por fila y entrega (número de línea, fila, nombre, jornada, error). Para las filas válidas
+    error es None; para las inválidas jornada es None y error explica el motivo. Sin 'codificacion' se detecta
+    entre CODIFICACIONES_CSV. Si el archivo no se puede leer (codificación incorrecta, CSV mal formado) se lanza
+    ValueError; las filas ya entregadas pueden haberse procesado, así que quien lo use debe descartarlas.
+    """
+    if codificacion is None:
+        codificacion = _detectar_codificacion(ruta)
+    with open(ruta, newline="", encoding=codificacion) as archivo:
+        lector = _abrir_csv(archivo)
+        try:
+            encabezado = next(lector, None)
+            if encabezado is None:
+                return
+            pos_nombre, pos_fecha, pos_entrada, pos_salida = _posiciones_columnas(encabezado, columnas)
+            ultima = max(pos_nombre, pos_fecha, pos_entrada, pos_salida)
+            for fila in lector:
+                if not fila or not any(fila):
+                    continue # Línea vacía
+                linea = lector.line_num
+                if len(fila) <= ultima:
+                    yield linea, fila, None, None, "faltan columnas"
+                    continue
+                try:
+                    jornada = {
+                        "fecha": _leer_fecha(fila[pos_fecha].strip()),
+                        "hora_entrada": _leer_hora(fila[pos_entrada].strip()),
+                        "hora_salida": _leer_hora(fila[pos_salida].strip())
+                    }
+                except ValueError as e:
+                    yield linea, fila, None, None, str(e)
+                    continue
+                yield linea, fila, fila[pos_nombre].strip(), jornada, None
+        except csv.Error as e: # Se informa como los demás errores de formato del archivo
+            raise ValueError(f"Línea {lector.line_num}: {e}")
+
+
+def preparar_importacion(ruta, empleados, columnas=COLUMNAS_CSV, tamano_lote=TAMANO_LOTE_IMPORTACION, codificacion=None):
+    """
+    Lee y valida todo el CSV sin modificar los empleados (solo los consulta), así que puede ejecutarse en un hilo
+    aparte sobre una copia de ellos. Retorna (ResultadoImportacion, preparadas), donde 'preparadas' tiene por
+    nombre de empleado las jornadas aceptadas (JornadasCompactas), listas para aplicar_importacion. Se rechazan las
+    filas con formato inválido, de empleados que no existen o repetidas (igual a una jornada ya registrada o a otra
+    fila del archivo). Si la lectura falla lanza OSError o ValueError.
+    """
+    filas = aceptadas = rechazadas = 0
+    detalle_rechazos = []
+    pendientes = collections.defaultdict(list) # Nombre -> jornadas aceptadas del lote actual
+    preparadas = collections.defaultdict(JornadasCompactas) # Nombre -> jornadas aceptadas de los lotes anteriores
+    en_lote = 0
+    vistas = set() # Jornadas ya aceptadas en esta importación, para detectar filas repetidas
+
+    def rechazar(linea, motivo, fila):
+        nonlocal rechazadas
+        rechazadas += 1
+        if len(detalle_rechazos) < MAXIMO_RECHAZOS_GUARDADOS:
+            detalle_rechazos.append((linea, motivo, fila))
+
+    def preparar_pendientes():
+        for nombre, jornadas in pendientes.items():
+            preparadas[nombre].extend(jornadas)
+        pendientes.clear()
+
+    for linea, fila, nombre, jornada, error in leer_jornadas_csv(ruta, columnas, codificacion):
+        filas += 1
+        if error:
+            rechazar(linea, error, fila)
+            continue
+        empleado = empleados.get(nombre)
+        if empleado is None:
+            rechazar(linea, f"empleado no encontrado '{nombre}'", fila)
+            continue
+        clave = (nombre, jornada["fecha"], jornada["hora_entrada"], jornada["hora_salida"])
+        if clave in vistas or empleado.buscar_jornada(jornada) is not None:
+            rechazar(linea, "jornada repetida", fila)
+            continue
+        vistas.add(clave)
+        pendientes[nombre].append(jornada)
+        aceptadas += 1
+        en_lote += 1
+        if en_lote >= tamano_lote:
+            preparar_pendientes()
+            en_lote = 0
+    preparar_pendientes()
+    return ResultadoImportacion(filas, aceptadas, rechazadas, detalle_rechazos), dict(preparadas)
+
+
+def aplicar_importacion(preparadas, empleados, almacen=None, revisar=False):
+    """
+    Agrega a los empleados las jornadas de preparar_importacion y retorna cuántas se agregaron. Con revisar=True
+    (los empleados pudieron cambiar desde que se prepararon, por ejemplo en la interfaz mientras el hilo leía el
+    archivo) se omiten las jornadas que ya están registradas y las de empleados que ya no existen. Si se pasa
+    'almacen' (ver almacenamiento.abrir_almacen), se guardan de una vez solo las jornadas agregadas con
+    almacen.jornadas_importadas: en SQLite se insertan en una transacción y en los archivos JSON e indexados
+    se agregan al diario de cambios.
+    """
+    agregadas = {}
+    for nombre, jornadas in preparadas.items():
+        empleado = empleados.get(nombre)
+        if empleado is None:
+            continue
+        if revisar:
+            jornadas = [jornada for jornada in jornadas if empleado.buscar_jornada(jornada) is None]
+        if jornadas:
+            empleado.agregar_jornadas(jornadas)
+            agregadas[nombre] = jornadas
+
+    if almacen is not None and agregadas:
+        almacen.jornadas_importadas(agregadas)
+    return sum(len(jornadas) for jornadas in agregadas.values())
+
+
+def importar_jornadas_csv(ruta, empleados, almacen=None, columnas=COLUMNAS_CSV, tamano_lote=TAMANO_LOTE_IMPORTACION,
+                          codificacion=None):
+    """
+    Importa las jornadas del CSV a los empleados existentes y retorna un ResultadoImportacion (ver
+    preparar_importacion). Las jornadas se agregan a los empleados solo después de leer todo el archivo: si la
+    lectura lanza OSError o ValueError, ningún empleado cambia. Si se pasa 'almacen', al terminar se guardan las
+    jornadas agregadas (ver aplicar_importacion).
+    """
+    resultado, preparadas = preparar_importacion(ruta, empleados, columnas, tamano_lote, codificacion)
+    aplicar_importacion(preparadas, empleados, almacen)
+    return resultado
+
+
+def escribir_rechazos(ruta, resultado):
+    """Guarda las filas rechazadas en un CSV con su número de línea y el motivo."""
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(["linea", "motivo", "columnas de la fila..."])
+        for linea, motivo, fila in resultado.detalle_rechazos:
+            escritor.writerow([linea, motivo] + fila)
+
+
+def main(argv=None):
+    from almacenamiento import abrir_almacen
+
+    parser = argparse.ArgumentParser(description="Importa jornadas desde un archivo CSV.")
+    parser.add_argument("csv", help="archivo CSV con las jornadas")
+    parser.add_argument("--datos", default="app_data.json", help="archivo de datos (.json, .recargos o .db, por defecto app_data.json)")
+    parser.add_argument("--rechazos", help="guardar las filas rechazadas en este CSV")
+    parser.add_argument("--columnas", default=",".join(COLUMNAS_CSV),
+                        help="encabezados de empleado, fecha, hora de entrada y hora de salida, separados por comas")
+    parser.add_argument("--codificacion", help=f"codificación del CSV (por defecto se detecta: {', '.join(CODIFICACIONES_CSV)})")
+    args = parser.parse_args(argv)
+    columnas = [columna.strip() for columna in args.columnas.split(",")]
+    if len(columnas) != 4:
+        parser.error("--columnas debe tener cuatro nombres separados por comas")
+    if args.codificacion:
+        try:
+            codecs.lookup(args.codificacion)
+        except LookupError:
+            parser.error(f"codificación desconocida '{args.codificacion}'")
+
+    almacen = abrir_almacen(args.datos)
+    empleados, _ = almacen.cargar()
+    try:
+        resultado = importar_jornadas_csv(args.csv, empleados, almacen, columnas, codificacion=args.codificacion)
+    except (OSError, ValueError) as e:
+        sys.exit(str(e))
+    finally:
+        almacen.cerrar()
+
+    print(f"Filas leídas: {resultado.filas}. Jornadas importadas: {resultado.aceptadas}. Filas rechazadas: {resultado.rechazadas}.")
+    for linea, motivo, fila in resultado.detalle_rechazos[:20]:
+        print(f"  Línea {linea}: {motivo}")
+    if args.rechazos:
+        escribir_rechazos(args.rechazos, resultado)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compara el almacenamiento en app_data.json (save_app_data / load_app_data) con la base de datos SQLite
+(AlmacenSQLite): guardado y carga completos, consulta de un mes con empleados_en_periodo, inserción de una jornada y
+tamaño en disco.
+
+Las jornadas se generan al azar (fechas de varios años, horas al minuto), con la misma cantidad por empleado. Los
+archivos se escriben en un directorio temporal que se borra al terminar.
+
+Uso:
+    python medir_almacenamiento.py [--jornadas 10000 100000 1000000] [--por-empleado 1000]
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import random
+import tempfile
+import time
+
+from almacenamiento import AlmacenSQLite
+from recargos_logic import CalculadoraRecargos, Empleado, load_app_data, save_app_data
+
+PRIMER_DIA = datetime.date(2020, 1, 1)
+DIAS_HISTORIAL = 5 * 365
+MES_CONSULTADO = (datetime.date(2022, 3, 1), datetime.date(2022, 3, 31))
+
+
+def generar_empleados(total, por_empleado, semilla=1):
+    """Retorna un diccionario nombre -> Empleado con 'total' jornadas al azar repartidas en partes iguales."""
+    aleatorio = random.Random(semilla)
+    empleados = {}
+    for i in range(max(1, total // por_empleado)):
+        empleado = Empleado(f"Empleado {i}", 2000000, 8)
+        empleado.agregar_jornadas({
+            "fecha": PRIMER_DIA + datetime.timedelta(days=aleatorio.randrange(DIAS_HISTORIAL)),
+            "hora_entrada": datetime.time(aleatorio.randrange(24), aleatorio.randrange(60)),
+            "hora_salida": datetime.time(aleatorio.randrange(24), aleatorio.randrange(60)),
+        } for _ in range(min(por_empleado, total)))
+        empleados[empleado.nombre] = empleado
+    return empleados
+
+
+def cronometrar(funcion, *args, **kwargs):
+    """Retorna (resultado, segundos) sin mostrar los mensajes que imprime la función."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        resultado = funcion(*args, **kwargs)
+        return resultado, time.perf_counter() - inicio
+
+
+def medir_json(empleados, calculadora, directorio):
+    """Retorna (segundos de guardado, segundos de carga, bytes en disco) de app_data.json."""
+    ruta = os.path.join(directorio, "app_data.json")
+    _, guardado = cronometrar(save_app_data, empleados, calculadora, ruta)
+    _, carga = cronometrar(load_app_data, ruta, solo_lectura=True)
+    return guardado, carga, os.path.getsize(ruta)
+
+
+def medir_sqlite(empleados, calculadora, directorio, inserciones=200):
+    """
+    Retorna (segundos de guardado, segundos de carga, segundos de la consulta del mes, segundos por inserción,
+    bytes en disco) de app_data.db.
+    """
+    ruta = os.path.join(directorio, "app_data.db")
+    almacen = AlmacenSQLite(ruta)
+    try:
+        _, guardado = cronometrar(almacen.guardar_todo, empleados, calculadora)
+        _, carga = cronometrar(almacen.cargar)
+        _, consulta = cronometrar(almacen.empleados_en_periodo, *MES_CONSULTADO)
+
+        empleado = next(iter(almacen.empleados.values()))
+        inicio = time.perf_counter()
+        for i in range(inserciones):
+            jornada = {"fecha": PRIMER_DIA + datetime.timedelta(days=i), "hora_entrada": datetime.time(8),
+                       "hora_salida": datetime.time(17)}
+            empleado.insertar_jornada(jornada)
+            almacen.jornada_registrada(empleado, jornada)
+        insercion = (time.perf_counter() - inicio) / inserciones
+        almacen.conexion.execute("PRAGMA wal_checkpoint(TRUNCATE)") # Tamaño con todo escrito en la base de datos
+    finally:
+        almacen.cerrar()
+    return guardado, carga, consulta, insercion, os.path.getsize(ruta)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara el almacenamiento en JSON con el de SQLite.")
+    parser.add_argument("--jornadas", type=int, nargs="+", default=[10000, 100000, 1000000], help="jornadas en total")
+    parser.add_argument("--por-empleado", type=int, default=1000, help="jornadas por empleado")
+    args = parser.parse_args(argv)
+
+    calculadora = CalculadoraRecargos()
+    print(f"{'jornadas':>9} {'JSON guardar/cargar':>21} {'SQLite guardar/cargar':>23} {'consulta mes':>13} "
+          f"{'inserción':>10} {'JSON MB':>8} {'SQLite MB':>10}")
+    for total in args.jornadas:
+        empleados = generar_empleados(total, args.por_empleado)
+        with tempfile.TemporaryDirectory() as directorio:
+            json_guardado, json_carga, json_bytes = medir_json(empleados, calculadora, directorio)
+            guardado, carga, consulta, insercion, sqlite_bytes = medir_sqlite(empleados, calculadora, directorio)
+        print(f"{total:>9} {json_guardado:>9.2f} s / {json_carga:.2f} s {guardado:>10.2f} s / {carga:.2f} s "
+              f"{consulta * 1000:>10.1f} ms {insercion * 1000:>7.2f} ms {json_bytes / 1e6:>8.1f} {sqlite_bytes / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Compara el tiempo de los acumulados por empleado en modo normal (float) y en modo exacto (segundos y centavos
+enteros, ver CalculadoraRecargos.acumulados_exactos), con el recorrido por empleado que usan la línea de comandos y
+las exportaciones (acumulados_por_empleado).
+
+Se mide con jornadas distintas (horas al minuto al azar) y con jornadas repetitivas (pocos horarios fijos, el caso
+favorable para las cachés). Cada medición empieza con una calculadora nueva y las cachés vacías.
+
+Uso:
+    python medir_exacto.py [--empleados 5000] [--repeticiones 3]
+"""
+import argparse
+import datetime
+import random
+import time
+
+from recargos_logic import CalculadoraRecargos, Empleado, _segundos_por_tramo
+
+PERIODO = (datetime.date(2024, 3, 1), datetime.date(2024, 3, 31))
+HORARIOS_FIJOS = ((6, 14), (14, 22), (22, 6), (8, 17))
+
+
+def crear_empleados(cantidad, distintas, semilla=1):
+    """Empleados con jornadas de lunes a sábado durante el mes de PERIODO."""
+    aleatorio = random.Random(semilla)
+    dias = [PERIODO[0] + datetime.timedelta(days=d) for d in range((PERIODO[1] - PERIODO[0]).days + 1)]
+    empleados = []
+    for i in range(cantidad):
+        empleado = Empleado(f"Empleado {i}", aleatorio.randrange(1300000, 6000000), 8)
+        jornadas = []
+        for fecha in dias:
+            if fecha.weekday() == 6:
+                continue
+            if distintas:
+                entrada = datetime.time(aleatorio.randrange(24), aleatorio.randrange(60))
+                salida = datetime.time(aleatorio.randrange(24), aleatorio.randrange(60))
+            else:
+                entrada, salida = (datetime.time(hora) for hora in HORARIOS_FIJOS[i % len(HORARIOS_FIJOS)])
+            jornadas.append({"fecha": fecha, "hora_entrada": entrada, "hora_salida": salida})
+        empleado.agregar_jornadas(jornadas)
+        empleados.append(empleado)
+    return empleados
+
+
+def medir(empleados, exacto, repeticiones):
+    """Mejor tiempo, en segundos, de calcular los acumulados del período de todos los empleados."""
+    mejor = None
+    for _ in range(repeticiones):
+        calculadora = CalculadoraRecargos()
+        _segundos_por_tramo.cache_clear()
+        inicio = time.perf_counter()
+        for _ in calculadora.acumulados_por_empleado(empleados, *PERIODO, exacto=exacto):
+            pass
+        segundos = time.perf_counter() - inicio
+        mejor = segundos if mejor is None else min(mejor, segundos)
+    return mejor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara los acumulados en modo normal y en modo exacto.")
+    parser.add_argument("--empleados", type=int, default=5000, help="empleados con un mes de jornadas")
+    parser.add_argument("--repeticiones", type=int, default=3, help="mediciones por caso (se toma la mejor)")
+    args = parser.parse_args(argv)
+
+    for nombre, distintas in (("jornadas distintas", True), ("jornadas repetitivas", False)):
+        empleados = crear_empleados(args.empleados, distintas)
+        total = sum(len(e.jornadas_registradas) for e in empleados)
+        normal = medir(empleados, False, args.repeticiones)
+        exacto = medir(empleados, True, args.repeticiones)
+        print(f"{nombre} ({total} jornadas): normal {normal:.2f} s, exacto {exacto:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
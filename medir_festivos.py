@@ -0,0 +1,59 @@
+"""
+Mide la consulta "fecha in dias_festivos": la lista ordenada que se usaba antes frente a CalendarioFestivos
+(un conjunto por año, consulta en tiempo constante).
+
+Para cada cantidad de festivos se generan fechas distintas al azar y se consulta una fecha que no es festiva, el caso
+más común en el cálculo (y el peor para la lista, que se recorre completa).
+
+Uso:
+    python medir_festivos.py [--cantidades 17 170 850 3400] [--repeticiones 200000]
+"""
+import argparse
+import datetime
+import random
+import timeit
+
+from recargos_logic import CalendarioFestivos
+
+
+def generar_festivos(cantidad, semilla=1):
+    """Retorna una lista ordenada de 'cantidad' fechas distintas al azar a partir del 2000."""
+    aleatorio = random.Random(semilla)
+    primer_dia = datetime.date(2000, 1, 1).toordinal()
+    ordinales = aleatorio.sample(range(primer_dia, primer_dia + max(cantidad * 20, 3650)), cantidad)
+    return sorted(datetime.date.fromordinal(ordinal) for ordinal in ordinales)
+
+
+def fecha_no_festiva(festivos, calendario):
+    """Retorna una fecha dentro del rango de los festivos que no está en ninguna de las dos representaciones."""
+    fecha = festivos[len(festivos) // 2]
+    while fecha in festivos or fecha in calendario:
+        fecha += datetime.timedelta(days=1)
+    return fecha
+
+
+def medir(contenedor, fecha, repeticiones):
+    """Nanosegundos por consulta (mejor de cinco series)."""
+    tiempos = timeit.repeat("fecha in contenedor", globals={"fecha": fecha, "contenedor": contenedor},
+                            number=repeticiones, repeat=5)
+    return min(tiempos) / repeticiones * 1e9
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara la consulta de festivos en una lista y en CalendarioFestivos.")
+    parser.add_argument("--cantidades", type=int, nargs="+", default=[17, 170, 850, 3400], help="festivos por medición")
+    parser.add_argument("--repeticiones", type=int, default=200000, help="consultas por serie")
+    args = parser.parse_args(argv)
+
+    print(f"{'festivos':>9} {'lista':>10} {'calendario':>11}")
+    for cantidad in args.cantidades:
+        festivos = generar_festivos(cantidad)
+        calendario = CalendarioFestivos(agregados=festivos)
+        fecha = fecha_no_festiva(festivos, calendario)
+        lista = medir(festivos, fecha, args.repeticiones)
+        conjunto = medir(calendario, fecha, args.repeticiones)
+        print(f"{cantidad:>9} {lista:>7.0f} ns {conjunto:>8.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Mide la importación masiva de jornadas desde CSV (importacion.importar_jornadas_csv).
+
+Se crean los empleados con un mes de jornadas ya registradas y un CSV con otro mes, la mitad de las filas con fecha
+YYYY-MM-DD y horas de 24 horas y la otra mitad con DD/MM/YYYY y horas AM/PM, más algunas filas inválidas. Se mide la
+importación, una segunda importación del mismo archivo (todas las filas se rechazan por repetidas) y el guardado de
+las jornadas importadas en app_data.json (diario de cambios) y en SQLite, comparado con reescribir todos los datos
+(guardar_todo). Los archivos se escriben en un directorio temporal que se borra al terminar.
+
+Uso:
+    python medir_importacion.py [--empleados 5000] [--dias 31]
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import random
+import tempfile
+import time
+
+from almacenamiento import abrir_almacen
+from importacion import aplicar_importacion, importar_jornadas_csv, preparar_importacion
+from recargos_logic import CalculadoraRecargos, Empleado
+
+FILAS_INVALIDAS = ("Empleado 0;2024-02-30;08:00;17:00", "Empleado 1;2024-03-01;25:00;17:00",
+                   "Nadie;2024-03-01;08:00;17:00", "Empleado 2;2024-03-01")
+
+
+def crear_empleados(cantidad, primer_dia, dias, semilla=1):
+    """Empleados que trabajan de lunes a sábado desde 'primer_dia' durante 'dias' días."""
+    aleatorio = random.Random(semilla)
+    empleados = {}
+    for i in range(cantidad):
+        empleado = Empleado(f"Empleado {i}", 2000000, 8)
+        empleado.agregar_jornadas({
+            "fecha": primer_dia + datetime.timedelta(days=d),
+            "hora_entrada": datetime.time(aleatorio.randrange(6, 10), aleatorio.choice((0, 15, 30, 45))),
+            "hora_salida": datetime.time(aleatorio.randrange(15, 20), aleatorio.choice((0, 15, 30, 45))),
+        } for d in range(dias) if (primer_dia + datetime.timedelta(days=d)).weekday() != 6)
+        empleados[empleado.nombre] = empleado
+    return empleados
+
+
+def escribir_csv(ruta, empleados, primer_dia, dias, semilla=2):
+    """Escribe el CSV de jornadas de lunes a sábado y retorna el número de filas."""
+    aleatorio = random.Random(semilla)
+    filas = 0
+    with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+        archivo.write("empleado;fecha;hora_entrada;hora_salida\n")
+        for nombre in empleados:
+            for d in range(dias):
+                fecha = primer_dia + datetime.timedelta(days=d)
+                if fecha.weekday() == 6:
+                    continue
+                entrada = datetime.time(aleatorio.randrange(6, 10), aleatorio.choice((0, 15, 30, 45)))
+                salida = datetime.time(aleatorio.randrange(15, 20), aleatorio.choice((0, 15, 30, 45)))
+                if filas % 2:
+                    archivo.write(f"{nombre};{fecha:%d/%m/%Y};{entrada:%I:%M %p};{salida:%I:%M %p}\n")
+                else:
+                    archivo.write(f"{nombre};{fecha.isoformat()};{entrada:%H:%M};{salida:%H:%M}\n")
+                filas += 1
+        for fila in FILAS_INVALIDAS:
+            archivo.write(fila + "\n")
+    return filas + len(FILAS_INVALIDAS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide la importación de jornadas desde CSV.")
+    parser.add_argument("--empleados", type=int, default=5000, help="empleados existentes")
+    parser.add_argument("--dias", type=int, default=31, help="días de jornadas registradas y de jornadas en el CSV")
+    args = parser.parse_args(argv)
+
+    registradas_desde = datetime.date(2024, 1, 1)
+    importadas_desde = registradas_desde + datetime.timedelta(days=args.dias)
+    empleados = crear_empleados(args.empleados, registradas_desde, args.dias)
+    registradas = sum(len(e.jornadas_registradas) for e in empleados.values())
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_csv = os.path.join(directorio, "reloj.csv")
+        filas = escribir_csv(ruta_csv, empleados, importadas_desde, args.dias)
+        print(f"{filas} filas en el CSV, {args.empleados} empleados con {registradas} jornadas registradas")
+
+        for nombre in ("importación", "reimportación (todas repetidas)"):
+            inicio = time.perf_counter()
+            resultado = importar_jornadas_csv(ruta_csv, empleados)
+            segundos = time.perf_counter() - inicio
+            print(f"{nombre}: {resultado.aceptadas} aceptadas, {resultado.rechazadas} rechazadas en {segundos:.2f} s "
+                  f"({resultado.filas / segundos / 1000:.0f} mil filas/s)")
+
+        for archivo in ("app_data.json", "app_data.db"):
+            # Datos guardados antes de importar; se mide solo el guardado de la importación
+            empleados = crear_empleados(args.empleados, registradas_desde, args.dias)
+            almacen = abrir_almacen(os.path.join(directorio, archivo))
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    almacen.guardar_todo(empleados, CalculadoraRecargos())
+                    _, preparadas = preparar_importacion(ruta_csv, empleados)
+                    inicio = time.perf_counter()
+                    aplicar_importacion(preparadas, empleados, almacen)
+                    importadas = time.perf_counter() - inicio
+                    inicio = time.perf_counter()
+                    almacen.guardar_todo(empleados, CalculadoraRecargos())
+                    todo = time.perf_counter() - inicio
+            finally:
+                almacen.cerrar()
+            print(f"guardado en {archivo}: jornadas importadas {importadas:.2f} s, todos los datos {todo:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Mide el tiempo de inicio de la aplicación empaquetada con cada perfil de PyInstaller.
+
+Cada ejecución lanza el programa con --medir-inicio (la aplicación se cierra sola en cuanto la ventana es visible) y
+toma el tiempo total del proceso. La primera ejecución de cada perfil es el inicio "en frío"; las siguientes son
+"en caliente" (archivos ya en la caché del sistema operativo). En Linux, si se ejecuta con permisos de root, se
+vacía la caché de archivos antes de la ejecución en frío para que la medición sea reproducible.
+
+Uso:
+    pyinstaller app_recargos_gui.spec
+    pyinstaller app_recargos_gui_rapido.spec
+    python medir_inicio.py [--repeticiones 10] [--fuente]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+EXTENSION_EJECUTABLE = ".exe" if os.name == "nt" else ""
+
+# Perfil -> comando que inicia la aplicación
+PERFILES = {
+    "un_archivo (app_recargos_gui.spec)": [os.path.join("dist", "app_recargos_gui" + EXTENSION_EJECUTABLE)],
+    "carpeta (app_recargos_gui_rapido.spec)": [
+        os.path.join("dist", "app_recargos_gui_rapido", "app_recargos_gui_rapido" + EXTENSION_EJECUTABLE)
+    ],
+}
+
+
+def vaciar_cache_archivos():
+    """Intenta vaciar la caché de archivos del sistema operativo. Retorna True si se pudo."""
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as archivo:
+            archivo.write("3\n")
+        return True
+    except (AttributeError, OSError):
+        return False
+
+
+def medir_ejecucion(comando, timeout=60):
+    """Retorna los segundos que tarda la aplicación en mostrar la ventana y cerrarse."""
+    inicio = time.perf_counter()
+    resultado = subprocess.run(comando + ["--medir-inicio"], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                               timeout=timeout)
+    duracion = time.perf_counter() - inicio
+    if resultado.returncode != 0:
+        raise RuntimeError(f"{comando[0]} terminó con código {resultado.returncode}: "
+                           f"{resultado.stderr.decode(errors='replace').strip()[-500:]}")
+    return duracion
+
+
+def medir_perfil(comando, repeticiones):
+    """Retorna (segundos en frío, lista de segundos en caliente, si se vació la caché antes del inicio en frío)."""
+    cache_vaciada = vaciar_cache_archivos()
+    frio = medir_ejecucion(comando)
+    caliente = [medir_ejecucion(comando) for _ in range(repeticiones)]
+    return frio, caliente, cache_vaciada
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara el tiempo de inicio de los perfiles de compilación.")
+    parser.add_argument("--repeticiones", type=int, default=10, help="ejecuciones en caliente por perfil")
+    parser.add_argument("--fuente", action="store_true", help="medir también 'python app_recargos_gui.py'")
+    args = parser.parse_args(argv)
+
+    perfiles = dict(PERFILES)
+    if args.fuente:
+        perfiles["fuente (python app_recargos_gui.py)"] = [sys.executable, "app_recargos_gui.py"]
+
+    for nombre, comando in perfiles.items():
+        if not os.path.exists(comando[-1]):
+            print(f"{nombre}: no se encontró {comando[-1]} (compile primero el perfil)")
+            continue
+        frio, caliente, cache_vaciada = medir_perfil(comando, args.repeticiones)
+        nota_frio = "" if cache_vaciada else " (sin vaciar la caché: primera ejecución)"
+        print(f"{nombre}:")
+        print(f"  en frío:     {frio:.3f} s{nota_frio}")
+        print(f"  en caliente: mediana {statistics.median(caliente):.3f} s, "
+              f"mín {min(caliente):.3f} s, máx {max(caliente):.3f} s ({len(caliente)} ejecuciones)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compara los formatos de app_data.json: el normal (indent=4, fechas y horas en texto) y el compacto
+(save_app_data(..., compacto=True)), este último con el módulo json y, si está instalado, con orjson.
+
+Para cada formato se mide el tamaño del archivo, el guardado y la carga (mejor de varias ejecuciones). Los archivos
+se escriben en un directorio temporal que se borra al terminar.
+
+Uso:
+    python medir_json.py [--jornadas 1000000] [--por-empleado 1000] [--repeticiones 2]
+"""
+import argparse
+import os
+import tempfile
+
+import recargos_logic
+from medir_almacenamiento import cronometrar, generar_empleados
+from recargos_logic import CalculadoraRecargos, load_app_data, save_app_data
+
+
+def medir(empleados, calculadora, ruta, compacto, repeticiones):
+    """Retorna (bytes en disco, mejor tiempo de guardado, mejor tiempo de carga) en segundos."""
+    guardado = carga = None
+    for _ in range(repeticiones):
+        _, segundos = cronometrar(save_app_data, empleados, calculadora, ruta, compacto=compacto)
+        guardado = segundos if guardado is None else min(guardado, segundos)
+        _, segundos = cronometrar(load_app_data, ruta, solo_lectura=True)
+        carga = segundos if carga is None else min(carga, segundos)
+    return os.path.getsize(ruta), guardado, carga
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara los formatos normal y compacto de app_data.json.")
+    parser.add_argument("--jornadas", type=int, default=1000000, help="jornadas en total")
+    parser.add_argument("--por-empleado", type=int, default=1000, help="jornadas por empleado")
+    parser.add_argument("--repeticiones", type=int, default=2, help="ejecuciones por formato (se toma la mejor)")
+    args = parser.parse_args(argv)
+
+    empleados = generar_empleados(args.jornadas, args.por_empleado)
+    calculadora = CalculadoraRecargos()
+    orjson = recargos_logic.orjson
+    # El formato normal se escribe siempre con json; se lee con orjson si está instalado, como en la aplicación
+    formatos = [("normal (indent=4)", False, orjson), ("compacto, json", True, None)]
+    if orjson is not None:
+        formatos.append(("compacto, orjson", True, orjson))
+    else:
+        print("orjson no está instalado: se omite su medición (pip install orjson)")
+
+    print(f"{'formato':<20} {'tamaño':>10} {'guardar':>8} {'cargar':>8}")
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "app_data.json")
+        for nombre, compacto, modulo in formatos:
+            recargos_logic.orjson = modulo
+            try:
+                tamano, guardado, carga = medir(empleados, calculadora, ruta, compacto, args.repeticiones)
+            finally:
+                recargos_logic.orjson = orjson
+            print(f"{nombre:<20} {tamano / 2**20:>6.1f} MiB {guardado:>6.2f} s {carga:>6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compara el cálculo por jornada (CalculadoraRecargos._calcular_jornada, una jornada a la vez) con el cálculo por lotes
+de NumPy (calcular_lote) sobre las mismas jornadas, y comprueba que ambos dan exactamente los mismos valores.
+
+Las jornadas tienen fecha al azar en dos años y horas de entrada y salida al minuto al azar. Cada medición del cálculo
+por jornada empieza con las cachés vacías (limpiar_cache y _segundos_por_tramo), así que mide el cálculo y no la
+caché. La conversión a segundos desde 1970 (jornada_a_epoch) se hace antes y no entra en la medición. Requiere numpy.
+
+Uso:
+    python medir_lote.py [--jornadas 100000] [--repeticiones 3]
+"""
+import argparse
+import datetime
+import random
+import time
+
+from recargos_logic import CalculadoraRecargos, _numpy, _segundos_por_tramo, jornada_a_epoch
+
+VALOR_HORA = 2000000 / 220
+HORAS_ESTANDAR = 8
+
+
+def crear_jornadas(cantidad, semilla=1):
+    aleatorio = random.Random(semilla)
+    return [{"fecha": datetime.date(2023, 1, 1) + datetime.timedelta(days=aleatorio.randrange(730)),
+             "hora_entrada": datetime.time(aleatorio.randrange(24), aleatorio.randrange(60)),
+             "hora_salida": datetime.time(aleatorio.randrange(24), aleatorio.randrange(60))} for _ in range(cantidad)]
+
+
+def por_jornada(calculadora, jornadas):
+    calculadora.limpiar_cache()
+    _segundos_por_tramo.cache_clear()
+    return [calculadora._calcular_jornada(jornada, VALOR_HORA, HORAS_ESTANDAR) for jornada in jornadas]
+
+
+def mejor_tiempo(funcion, repeticiones, *args):
+    """Retorna (resultado de la última ejecución, mejor tiempo en segundos)."""
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        segundos = time.perf_counter() - inicio
+        mejor = segundos if mejor is None else min(mejor, segundos)
+    return resultado, mejor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara el cálculo por jornada con el cálculo por lotes.")
+    parser.add_argument("--jornadas", type=int, default=100000, help="jornadas a calcular")
+    parser.add_argument("--repeticiones", type=int, default=3, help="mediciones por caso (se toma la mejor)")
+    args = parser.parse_args(argv)
+
+    np = _numpy()
+    jornadas = crear_jornadas(args.jornadas)
+    epoch = np.array([jornada_a_epoch(jornada) for jornada in jornadas])
+    inicio_epoch, fin_epoch = np.ascontiguousarray(epoch[:, 0]), np.ascontiguousarray(epoch[:, 1])
+    calculadora = CalculadoraRecargos()
+
+    resultados, segundos_jornada = mejor_tiempo(por_jornada, args.repeticiones, calculadora, jornadas)
+    (horas, recargos), segundos_lote = mejor_tiempo(calculadora.calcular_lote, args.repeticiones, inicio_epoch,
+                                                    fin_epoch, HORAS_ESTANDAR, VALOR_HORA)
+
+    iguales = all(tuple(horas[i].tolist()) == horas_jornada and tuple(recargos[i].tolist()) == recargos_jornada
+                  for i, (horas_jornada, _, recargos_jornada, _) in enumerate(resultados))
+    print(f"{args.jornadas} jornadas")
+    print(f"por jornada (cachés vacías): {segundos_jornada * 1000:.1f} ms")
+    print(f"por lotes (calcular_lote):   {segundos_lote * 1000:.1f} ms ({segundos_jornada / segundos_lote:.0f} veces más rápido)")
+    print("resultados idénticos" if iguales else "¡LOS RESULTADOS DIFIEREN!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Mide la memoria que ocupan las jornadas registradas: la representación compacta de Empleado (JornadasCompactas,
+columnas de enteros) frente a la anterior (una lista de diccionarios con una fecha y dos horas por jornada).
+
+Las jornadas se generan al azar (fechas de varios años, horas al minuto) y se reparten entre los empleados. La
+memoria se mide con tracemalloc después de construir todas las jornadas, sin contar los datos de origen.
+
+Uso:
+    python medir_memoria.py [--jornadas 1000000] [--empleados 1000]
+"""
+import argparse
+import datetime
+import gc
+import random
+import time
+import tracemalloc
+
+from recargos_logic import Empleado
+
+
+def generar_jornadas(total, semilla=1):
+    """Retorna una lista de tuplas (día ordinal, minuto de entrada, minuto de salida) al azar."""
+    aleatorio = random.Random(semilla)
+    primer_dia = datetime.date(2020, 1, 1).toordinal()
+    return [(primer_dia + aleatorio.randrange(5 * 365), aleatorio.randrange(1440), aleatorio.randrange(1440))
+            for _ in range(total)]
+
+
+def _diccionario(ordinal, entrada, salida):
+    return {
+        "fecha": datetime.date.fromordinal(ordinal),
+        "hora_entrada": datetime.time(entrada // 60, entrada % 60),
+        "hora_salida": datetime.time(salida // 60, salida % 60)
+    }
+
+
+def construir_diccionarios(datos, empleados):
+    """Representación anterior: una lista de diccionarios por empleado."""
+    por_empleado = len(datos) // empleados
+    return [[_diccionario(*jornada) for jornada in datos[i * por_empleado:(i + 1) * por_empleado]]
+            for i in range(empleados)]
+
+
+def construir_empleados(datos, empleados):
+    """Representación actual: Empleado con sus jornadas en JornadasCompactas."""
+    por_empleado = len(datos) // empleados
+    resultado = []
+    for i in range(empleados):
+        empleado = Empleado(f"Empleado {i}", 2000000, 8)
+        empleado.agregar_jornadas(_diccionario(*jornada) for jornada in datos[i * por_empleado:(i + 1) * por_empleado])
+        resultado.append(empleado)
+    return resultado
+
+
+def medir(construir, datos, empleados):
+    """Retorna (objeto construido, bytes retenidos, pico de bytes durante la construcción)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        construido = construir(datos, empleados)
+        gc.collect()
+        retenidos, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return construido, retenidos, pico
+
+
+def medir_recorrido(listas):
+    """Segundos para recorrer todas las jornadas leyendo jornada["fecha"]."""
+    inicio = time.perf_counter()
+    for jornadas in listas:
+        for jornada in jornadas:
+            jornada["fecha"]
+    return time.perf_counter() - inicio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara la memoria de las representaciones de jornadas.")
+    parser.add_argument("--jornadas", type=int, default=1000000, help="jornadas en total")
+    parser.add_argument("--empleados", type=int, default=1000, help="empleados entre los que se reparten")
+    args = parser.parse_args(argv)
+
+    datos = generar_jornadas(args.jornadas)
+    total = len(datos) // args.empleados * args.empleados
+    for nombre, construir, listas in (
+        ("diccionarios (anterior)", construir_diccionarios, lambda construido: construido),
+        ("JornadasCompactas", construir_empleados, lambda construido: [e.jornadas_registradas for e in construido]),
+    ):
+        construido, retenidos, pico = medir(construir, datos, args.empleados)
+        recorrido = medir_recorrido(listas(construido))
+        print(f"{nombre}: {retenidos / 2**20:.1f} MiB para {total} jornadas ({retenidos / total:.0f} bytes por jornada), "
+              f"pico {pico / 2**20:.1f} MiB, recorrido {recorrido:.2f} s")
+        del construido
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Cálculo de recargos por línea de comandos, sin interfaz gráfica (no importa tkinter ni tkcalendar).
+
+Carga un archivo de datos (app_data.json o app_data.recargos con su diario, o una base SQLite .db) y escribe, por
+cada empleado, las horas acumuladas por categoría, el valor de los recargos y el valor bruto total de las jornadas
+del período.
+
+Uso:
+    python recargos_cli.py app_data.json --desde 2025-07-01 --hasta 2025-07-31
+    python recargos_cli.py app_data.db --desde 2025-07-01 --hasta 2025-07-31 --empleado "Ana Pérez" --formato json --salida julio.jsonl
+    python recargos_cli.py app_data.json --desde 2025-07-01 --hasta 2025-07-31 --salida julio.xlsx   (también .csv y .parquet)
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import sys
+
+from almacenamiento import EXTENSION_INDEXADO, EXTENSIONES_SQLITE, abrir_almacen
+from exportacion import ESCRITORES_TABULARES, exportar_acumulados, filas_acumulados
+from recargos_logic import load_app_data
+
+
+def _fecha(texto):
+    try:
+        return datetime.datetime.strptime(texto, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida '{texto}', use YYYY-MM-DD")
+
+
+def cargar_datos(archivo, periodo_inicio=None, periodo_fin=None):
+    """
+    Carga (empleados, calculadora) sin modificar el archivo. De una base SQLite solo se leen las jornadas del
+    período; de un archivo indexado (.recargos), las jornadas de cada empleado se leen al calcularlo; de un archivo
+    JSON se lee todo. En los dos últimos se reproduce además su diario de cambios, si lo tiene, sin recortarlo.
+    Lanza OSError o ValueError si el archivo o su diario no se pueden leer, para no calcular con datos incompletos.
+    """
+    if not os.path.exists(archivo):
+        raise FileNotFoundError(f"No existe el archivo de datos {archivo}")
+    if archivo.lower().endswith(EXTENSIONES_SQLITE + (EXTENSION_INDEXADO,)):
+        almacen = abrir_almacen(archivo)
+        try:
+            return almacen.cargar_periodo(periodo_inicio, periodo_fin)
+        finally:
+            almacen.cerrar()
+    return load_app_data(archivo, solo_lectura=True)
+
+
+def _escribir_texto(fila, salida):
+    lineas = [f"--- Empleado: {fila['empleado']} ---", f"  Jornadas en el período: {fila['jornadas']}"]
+    if fila["jornadas"]:
+        lineas.append("  Horas por categoría:")
+        lineas.extend(f"    - {categoria}: {horas:.2f}h" for categoria, horas in fila["horas"].items() if horas > 0)
+        lineas.append("  Valor de los recargos:")
+        lineas.extend(f"    - {categoria}: ${valor:,.2f}" for categoria, valor in fila["recargos"].items() if valor > 0)
+    lineas.append(f"  Total recargos: ${sum(fila['recargos'].values()):,.2f}")
+    lineas.append(f"  Valor bruto total: ${fila['valor_bruto']:,.2f}")
+    salida.write("\n".join(lineas) + "\n\n")
+
+
+def _escribir_json(fila, salida):
+    # Una línea JSON por empleado (JSON Lines); en modo exacto los Decimal se escriben como texto
+    salida.write(json.dumps(fila, ensure_ascii=False, default=str) + "\n")
+
+
+ESCRITORES = {"texto": _escribir_texto, "json": _escribir_json}
+FORMATOS = sorted(ESCRITORES) + sorted(ESCRITORES_TABULARES) # csv, xlsx y parquet: ver exportacion.py
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calcula horas, recargos y valor bruto por empleado para un período.")
+    parser.add_argument("archivo", help="archivo de datos (.json, .recargos o .db)")
+    parser.add_argument("--desde", type=_fecha, help="inicio del período (YYYY-MM-DD, incluido)")
+    parser.add_argument("--hasta", type=_fecha, help="fin del período (YYYY-MM-DD, incluido)")
+    parser.add_argument("--empleado", action="append", dest="empleados", metavar="NOMBRE",
+                        help="calcular solo este empleado (se puede repetir)")
+    parser.add_argument("--formato", choices=FORMATOS,
+                        help="formato de salida (por defecto: el de la extensión de --salida, o texto)")
+    parser.add_argument("--salida", help="archivo de salida (por defecto: salida estándar)")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos para calcular en paralelo")
+    parser.add_argument("--exacto", action="store_true",
+                        help="aritmética exacta: segundos y centavos enteros, redondeo a centavos por categoría")
+    args = parser.parse_args(argv)
+
+    if args.desde and args.hasta and args.desde > args.hasta:
+        parser.error("--desde no puede ser posterior a --hasta")
+    formato = args.formato
+    if formato is None:
+        extension = os.path.splitext(args.salida)[1].lstrip(".").lower() if args.salida else ""
+        formato = extension if extension in ESCRITORES_TABULARES else "texto"
+    if formato in ESCRITORES_TABULARES and not args.salida:
+        parser.error(f"el formato {formato} requiere --salida")
+
+    # Los mensajes de carga van a stderr para no mezclarse con los resultados
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            empleados, calculadora = cargar_datos(args.archivo, args.desde, args.hasta)
+    except FileNotFoundError as e:
+        sys.exit(str(e))
+    except (OSError, ValueError) as e:
+        sys.exit(f"No se pudieron leer los datos de {args.archivo}: {e}")
+
+    try:
+        filas = filas_acumulados(empleados, calculadora, args.desde, args.hasta, args.empleados, args.procesos, args.exacto)
+    except ValueError as e: # Empleado inexistente; se detecta antes de calcular
+        sys.exit(str(e))
+
+    if formato in ESCRITORES_TABULARES:
+        try:
+            exportar_acumulados(args.salida, filas, formato, args.exacto)
+        except ImportError as e: # Falta openpyxl o pyarrow
+            sys.exit(str(e))
+        return
+    escribir = ESCRITORES[formato]
+    salida = open(args.salida, "w", encoding="utf-8", newline="\n") if args.salida else sys.stdout
+    try:
+        for fila in filas:
+            escribir(fila, salida)
+        salida.flush()
+    except BrokenPipeError:
+        # Quien leía la salida estándar terminó antes (por ejemplo '| head'): se termina sin traza de error, y la
+        # salida estándar se redirige a os.devnull para que Python no vuelva a fallar al vaciarla al salir
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(141) # 128 + SIGPIPE, como un programa terminado por la señal
+    finally:
+        if args.salida:
+            salida.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,258 @@
+import array
+import bisect
+import collections
+import collections.abc
+import concurrent.futures
 import datetime
+import decimal
+import functools
+import gc
+import itertools
 import json
 import os
+import threading
+import time
+
+try:
+    import orjson # Opcional: lee y escribe JSON más rápido que el módulo json (pip install orjson)
+except ImportError:
+    orjson = None
+
+# Orden fijo de las categorías de horas: tipo de día (hábil, domingo, festivo) x (ordinaria/extra) x (diurna/nocturna).
+# El índice de una categoría es tipo_dia * 4 + (2 si es extra) + (1 si es nocturna).
+CATEGORIAS_HORAS = (
+    "horas_ordinarias_diurnas",
+    "horas_ordinarias_nocturnas",
+    "horas_extras_diurnas",
+    "horas_extras_nocturnas",
+    "horas_ordinarias_diurnas_domingo",
+    "horas_ordinarias_nocturnas_domingo",
+    "horas_extras_diurnas_domingo",
+    "horas_extras_nocturnas_domingo",
+    "horas_ordinarias_diurnas_festivo",
+    "horas_ordinarias_nocturnas_festivo",
+    "horas_extras_diurnas_festivo",
+    "horas_extras_nocturnas_festivo",
+)
+
+TIPO_DIA_HABIL = 0
+TIPO_DIA_DOMINGO = 1
+TIPO_DIA_FESTIVO = 2
+
+SEGUNDOS_DIA = 86400
+INICIO_DIURNO = 6 * 3600 # 06:00
+INICIO_NOCTURNO = 21 * 3600 # 21:00
+# Límites fijos (en segundos desde la medianoche del día de entrada) donde cambia la categoría de una hora.
+# Una jornada dura como máximo 24 horas, así que basta con cubrir el día de entrada y el siguiente.
+LIMITES_JORNADA = (
+    INICIO_DIURNO, INICIO_NOCTURNO, SEGUNDOS_DIA,
+    SEGUNDOS_DIA + INICIO_DIURNO, SEGUNDOS_DIA + INICIO_NOCTURNO,
+)
+
+# Atributos de CalculadoraRecargos que forman su configuración persistente
+CAMPOS_CONFIGURACION = (
+    "MULTIPLIER_HORA_EXTRA_DIURNA",
+    "MULTIPLIER_HORA_EXTRA_NOCTURNA",
+    "MULTIPLIER_EXTRA_DIURNA_DOMINGOFESTIVO",
+    "MULTIPLIER_EXTRA_NOCTURNA_DOMINGOFESTIVO",
+    "ADDITIONAL_PERCENTAGE_DECIMAL_HORA_ORDINARIA_NOCTURNA",
+    "ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_BASE",
+    "ADDITIONAL_PERCENTAGE_DECIMAL_ORDINARIA_NOCTURNA_DOMINGOFESTIVO",
+    "ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_LARGA_JORNADA",
+    "ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_NOCTURNO_LARGA_JORNADA",
+)
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+TAMANO_BLOQUE_LOTE = 16384 # Jornadas por bloque en calcular_lote
+TAMANO_LOTE_PROCESOS = 200 # Empleados por tarea en el reporte consolidado en paralelo
+TAMANO_MAXIMO_DIARIO = 500 # Cambios en el diario antes de compactarlo en app_data.json
+ESPERA_GUARDADO = 0.5 # Segundos sin cambios nuevos antes de escribirlos (DiarioCambios en segundo plano)
+ESPERA_MAXIMA_GUARDADO = 2.0 # Máximo de segundos que un cambio espera en cola antes de escribirse
+TAMANO_CACHE_JORNADAS = 100000 # Máximo de resultados por jornada guardados en CalculadoraRecargos (LRU)
+TAMANO_CACHE_TRAMOS = 65536 # Combinaciones (entrada, salida, horas estándar) guardadas por _segundos_por_tramo
+MAXIMO_CAMBIOS_PENDIENTES = 10000 # Jornadas agregadas o quitadas que se anotan para los totales por empleado
+HISTORIAL_FESTIVOS = 256 # Cambios de festivos que se recuerdan para actualizar los totales por empleado
+
+# Modo exacto (ver CalculadoraRecargos.acumulados_exactos): las horas se suman en segundos enteros, el salario se
+# lleva a centavos enteros y los porcentajes a centésimas de punto porcentual (1 = 0.01%). El dinero se redondea
+# a centavos (mitad hacia arriba) una sola vez por categoría y período, no en cada jornada.
+HORAS_MES_VALOR_HORA = 220 # Horas mensuales con las que se obtiene el valor de la hora ordinaria
+ESCALA_PORCENTAJES = 10000
+CENTAVO = decimal.Decimal("0.01")
+DIEZMILESIMA = decimal.Decimal("0.0001")
+
+
+def jornada_a_epoch(jornada):
+    """
+    Convierte una jornada ({"fecha", "hora_entrada", "hora_salida"}) en (inicio, fin) expresados en
+    segundos desde 1970-01-01 00:00 en hora local (sin zona horaria), el formato de calcular_lote().
+    """
+    hora_entrada = jornada["hora_entrada"]
+    hora_salida = jornada["hora_salida"]
+    inicio_dia = hora_entrada.hour * 3600 + hora_entrada.minute * 60 + hora_entrada.second
+    fin_dia = hora_salida.hour * 3600 + hora_salida.minute * 60 + hora_salida.second
+    if fin_dia <= inicio_dia:
+        fin_dia += SEGUNDOS_DIA
+    inicio = (jornada["fecha"].toordinal() - EPOCH_ORDINAL) * SEGUNDOS_DIA + inicio_dia
+    return inicio, inicio + (fin_dia - inicio_dia)
+
+
+def _numpy():
+    """
+    Importa numpy la primera vez que se necesita (solo lo usa el cálculo por lotes), así no retrasa el inicio de
+    la aplicación ni de la línea de comandos. Es opcional: pip install numpy.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("El cálculo por lotes requiere numpy. Instálelo con: pip install numpy")
+    return numpy
+
+
+class _CacheConversiones(dict):
+    """Diccionario que calcula y guarda el valor de una clave la primera vez que se pide."""
+    def __init__(self, convertir):
+        super().__init__()
+        self.convertir = convertir
+
+    def __missing__(self, clave):
+        valor = self[clave] = self.convertir(clave)
+        return valor
+
+
+# Fechas y horas ya creadas, por día ordinal y por segundo del día: las jornadas leídas de JornadasCompactas las
+# comparten (son inmutables), así que solo se crean los objetos distintos
+_FECHAS_POR_ORDINAL = _CacheConversiones(datetime.date.fromordinal)
+_HORAS_POR_SEGUNDO = _CacheConversiones(lambda segundos: datetime.time(segundos // 3600, segundos // 60 % 60, segundos % 60))
+
+
+class JornadasCompactas(collections.abc.MutableSequence):
+    """
+    Lista de jornadas guardada por columnas de enteros de 32 bits: día ordinal, segundo de entrada y segundo de
+    salida (12 bytes por jornada, en lugar de un diccionario con una fecha y dos horas). Se usa como una lista de
+    diccionarios {"fecha", "hora_entrada", "hora_salida"}: cada elemento se crea al leerlo, así que modificar el
+    diccionario entregado no cambia la lista (para eso se asigna la jornada completa). Un corte retorna otra
+    JornadasCompactas independiente.
+
+    Si 'cambios' es una lista, cada jornada agregada o quitada se anota en ella como (1 o -1, tupla compacta); así
+    CalculadoraRecargos actualiza los totales del empleado sin recorrer todas las jornadas (ver TotalesJornadas).
+    Con más de MAXIMO_CAMBIOS_PENDIENTES anotaciones se deja de anotar (cambios vuelve a None).
+    """
+    __slots__ = ("ordinales", "entradas", "salidas", "cambios")
+
+    def __init__(self, jornadas=()):
+        self.ordinales = array.array("i")
+        self.entradas = array.array("i")
+        self.salidas = array.array("i")
+        self.cambios = None
+        self.extend(jornadas)
+
+    @classmethod
+    def desde_tuplas(cls, tuplas):
+        """Crea la lista a partir de tuplas (día ordinal, segundo de entrada, segundo de salida)."""
+        jornadas = cls()
+        for ordinal, entrada, salida in tuplas:
+            jornadas.ordinales.append(ordinal)
+            jornadas.entradas.append(entrada)
+            jornadas.salidas.append(salida)
+        return jornadas
+
+    def tuplas(self):
+        """Recorre las jornadas como tuplas (día ordinal, segundo de entrada, segundo de salida), sin crear objetos."""
+        return zip(self.ordinales, self.entradas, self.salidas)
+
+    def __len__(self):
+        return len(self.ordinales)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            corte = JornadasCompactas()
+            corte.ordinales = self.ordinales[indice]
+            corte.entradas = self.entradas[indice]
+            corte.salidas = self.salidas[indice]
+            return corte
+        return _expandir_jornada((self.ordinales[indice], self.entradas[indice], self.salidas[indice]))
+
+    def __iter__(self):
+        fechas, horas = _FECHAS_POR_ORDINAL, _HORAS_POR_SEGUNDO
+        for ordinal, entrada, salida in zip(self.ordinales, self.entradas, self.salidas):
+            yield {"fecha": fechas[ordinal], "hora_entrada": horas[entrada], "hora_salida": horas[salida]}
+
+    def _anotar(self, cambios):
+        self.cambios.extend(cambios)
+        if len(self.cambios) > MAXIMO_CAMBIOS_PENDIENTES:
+            self.cambios = None # Los totales se recalcularán completos
+
+    def __setitem__(self, indice, jornada):
+        if isinstance(indice, slice):
+            raise TypeError("JornadasCompactas no admite asignar cortes")
+        compacta = _compactar_jornada(jornada)
+        if self.cambios is not None:
+            self._anotar(((-1, (self.ordinales[indice], self.entradas[indice], self.salidas[indice])), (1, compacta)))
+        self.ordinales[indice], self.entradas[indice], self.salidas[indice] = compacta
+
+    def __delitem__(self, indice):
+        if self.cambios is not None:
+            if isinstance(indice, slice):
+                self._anotar((-1, tupla) for tupla in self[indice].tuplas())
+            else:
+                self._anotar(((-1, (self.ordinales[indice], self.entradas[indice], self.salidas[indice])),))
+        del self.ordinales[indice]
+        del self.entradas[indice]
+        del self.salidas[indice]
+
+    def insert(self, indice, jornada):
+        compacta = _compactar_jornada(jornada)
+        if self.cambios is not None:
+            self._anotar(((1, compacta),))
+        ordinal, entrada, salida = compacta
+        self.ordinales.insert(indice, ordinal)
+        self.entradas.insert(indice, entrada)
+        self.salidas.insert(indice, salida)
+
+    def extend(self, jornadas):
+        if isinstance(jornadas, JornadasCompactas):
+            if self.cambios is not None:
+                self._anotar((1, tupla) for tupla in jornadas.tuplas())
+            self.ordinales.extend(jornadas.ordinales)
+            self.entradas.extend(jornadas.entradas)
+            self.salidas.extend(jornadas.salidas)
+        else:
+            compactas = [_compactar_jornada(jornada) for jornada in jornadas]
+            if self.cambios is not None:
+                self._anotar((1, compacta) for compacta in compactas)
+            for ordinal, entrada, salida in compactas:
+                self.ordinales.append(ordinal)
+                self.entradas.append(entrada)
+                self.salidas.append(salida)
+
+    def __repr__(self):
+        return f"JornadasCompactas({list(self)!r})"
+
+
+class TotalesJornadas:
+    """
+    Segundos por categoría (en el orden de CATEGORIAS_HORAS) de todas las jornadas de un empleado, tal como quedaron
+    en la última consulta a CalculadoraRecargos, junto con lo necesario para saber si siguen vigentes: las columnas
+    de jornadas y la lista donde anotan sus cambios, el calendario de festivos y su versión, y las horas diarias
+    estándar. Como no incluyen dinero, un cambio de porcentajes o de salario no los afecta.
+    """
+    __slots__ = ("segundos", "columnas", "cambios", "calendario", "version_calendario", "standard_daily_hours")
+
+    def __init__(self, segundos, columnas, calendario, standard_daily_hours):
+        self.segundos = segundos
+        self.columnas = columnas
+        self.cambios = columnas.cambios = [] # Desde aquí las columnas anotan sus cambios
+        self.calendario = calendario
+        self.version_calendario = calendario.version
+        self.standard_daily_hours = standard_daily_hours
+
+    def vigentes(self, columnas, calendario, standard_daily_hours):
+        """True si se pueden actualizar con los cambios anotados en lugar de recalcularlos completos."""
+        return (self.columnas is columnas and columnas.cambios is self.cambios and self.calendario is calendario
+                and self.standard_daily_hours == standard_daily_hours)
+
 
 class Empleado:
     def __init__(self, nombre, salario_mensual, standard_daily_hours, tipo_contrato="indefinido"):
@@ -8,7 +260,62 @@ class Empleado:
         self.salario_mensual = salario_mensual
         self.standard_daily_hours = standard_daily_hours # Horas diarias estándar
         self.tipo_contrato = tipo_contrato # Nuevo atributo para el tipo de contrato
-        self.jornadas_registradas = [] # Almacena diccionarios de jornadas
+        # Jornadas ordenadas por fecha en forma compacta; las búsquedas por fecha usan bisect sobre la columna de
+        # días ordinales. Deben modificarse con los métodos de esta clase para mantener el orden.
+        self._lista_jornadas = JornadasCompactas()
+        self._cargar_jornadas = None # Función que entrega las jornadas aún no leídas (ver diferir_jornadas)
+        # Totales de todas las jornadas que mantiene CalculadoraRecargos (ver TotalesJornadas); None hasta la
+        # primera consulta
+        self.totales = None
+
+    @property
+    def _jornadas(self):
+        if self._cargar_jornadas is not None:
+            self._lista_jornadas = self._cargar_jornadas()
+            self._cargar_jornadas = None
+        return self._lista_jornadas
+
+    @_jornadas.setter
+    def _jornadas(self, jornadas):
+        self._lista_jornadas = jornadas
+        self._cargar_jornadas = None
+
+    def diferir_jornadas(self, cargar):
+        """
+        Las jornadas se obtendrán llamando a cargar() (que debe retornar una JornadasCompactas ordenada por fecha)
+        la primera vez que se usen. Permite crear los empleados sin leer todavía su historial (ver AlmacenIndexado).
+        """
+        self._cargar_jornadas = cargar
+
+    @property
+    def jornadas_cargadas(self):
+        """False si las jornadas fueron diferidas y todavía no se han leído."""
+        return self._cargar_jornadas is None
+
+    def copiar(self):
+        """Retorna una copia independiente del empleado. Si sus jornadas no se han leído, la copia también las difiere."""
+        copia = Empleado(self.nombre, self.salario_mensual, self.standard_daily_hours, self.tipo_contrato)
+        if self.jornadas_cargadas:
+            copia._jornadas = self._lista_jornadas[:]
+        else:
+            copia.diferir_jornadas(self._cargar_jornadas)
+        return copia
+
+    @property
+    def jornadas_registradas(self):
+        return self._jornadas
+
+    @jornadas_registradas.setter
+    def jornadas_registradas(self, jornadas):
+        # sorted es estable: las jornadas de un mismo día conservan su orden original
+        if isinstance(jornadas, JornadasCompactas):
+            if jornadas.ordinales.tolist() == sorted(jornadas.ordinales):
+                self._jornadas = jornadas[:] # Ya están ordenadas: solo se copian las columnas
+                return
+            tuplas = jornadas.tuplas()
+        else:
+            tuplas = (_compactar_jornada(j) for j in jornadas)
+        self._jornadas = JornadasCompactas.desde_tuplas(sorted(tuplas, key=lambda t: t[0]))
 
     def obtener_valor_hora_ordinaria(self):
         # CAMBIO CLAVE: Ahora se calcula el valor de la hora ordinaria dividiendo el salario mensual por 220 horas.
@@ -24,9 +331,279 @@ class Empleado:
             "hora_entrada": hora_entrada,
             "hora_salida": hora_salida
         }
-        self.jornadas_registradas.append(jornada)
+        self.insertar_jornada(jornada)
         return f"Jornada registrada para {self.nombre} el {fecha.strftime('%Y-%m-%d')} de {hora_entrada.strftime('%I:%M %p')} a {hora_salida.strftime('%I:%M %p')}."
 
+    def insertar_jornada(self, jornada):
+        """Inserta la jornada en su posición por fecha (después de las del mismo día) y retorna su índice."""
+        indice = bisect.bisect_right(self._jornadas.ordinales, jornada["fecha"].toordinal())
+        self._jornadas.insert(indice, jornada)
+        return indice
+
+    def agregar_jornadas(self, jornadas):
+        """
+        Agrega varias jornadas de una vez (por ejemplo, desde una importación) manteniendo el orden por fecha.
+        Si todas son posteriores a las ya registradas solo se extienden las columnas; si no, se reordena una sola vez.
+        """
+        if isinstance(jornadas, JornadasCompactas): # Ya están compactas: no se crean diccionarios
+            tuplas = sorted(jornadas.tuplas(), key=lambda t: t[0])
+        else:
+            tuplas = sorted((_compactar_jornada(j) for j in jornadas), key=lambda t: t[0])
+        if not tuplas:
+            return
+        ordinales = self._jornadas.ordinales
+        if not ordinales or tuplas[0][0] >= ordinales[-1]:
+            self._jornadas.extend(JornadasCompactas.desde_tuplas(tuplas))
+        else:
+            self._jornadas = JornadasCompactas.desde_tuplas(sorted(list(self._jornadas.tuplas()) + tuplas, key=lambda t: t[0]))
+
+    def eliminar_jornada(self, indice):
+        """Elimina y retorna la jornada en la posición 'indice' de jornadas_registradas."""
+        return self._jornadas.pop(indice)
+
+    def reemplazar_jornada(self, indice, jornada):
+        """Reemplaza la jornada en 'indice' (por ejemplo al editarla) y retorna su nuevo índice."""
+        if self._jornadas.ordinales[indice] == jornada["fecha"].toordinal(): # Misma fecha: el orden no cambia
+            self._jornadas[indice] = jornada
+            return indice
+        self.eliminar_jornada(indice)
+        return self.insertar_jornada(jornada)
+
+    def buscar_jornada(self, jornada):
+        """
+        Retorna el índice de la primera jornada igual a 'jornada' (misma fecha y horas) o None si no existe.
+        Las jornadas iguales son intercambiables, así que sirve también para ubicar una jornada leída antes de
+        jornadas_registradas (por ejemplo, la de la fila seleccionada en la interfaz).
+        """
+        ordinal, entrada, salida = _compactar_jornada(jornada)
+        columnas = self._jornadas
+        indice = bisect.bisect_left(columnas.ordinales, ordinal)
+        while indice < len(columnas) and columnas.ordinales[indice] == ordinal:
+            if columnas.entradas[indice] == entrada and columnas.salidas[indice] == salida:
+                return indice
+            indice += 1
+        return None
+
+    def jornadas_en_periodo(self, periodo_inicio=None, periodo_fin=None):
+        """
+        Retorna las jornadas con fecha dentro de [periodo_inicio, periodo_fin] (cualquiera de los límites puede
+        omitirse) con dos búsquedas binarias y un corte de las columnas.
+        """
+        if not periodo_inicio and not periodo_fin:
+            return self._jornadas # Sin filtro de período
+        ordinales = self._jornadas.ordinales
+        desde = bisect.bisect_left(ordinales, periodo_inicio.toordinal()) if periodo_inicio else 0
+        hasta = bisect.bisect_right(ordinales, periodo_fin.toordinal()) if periodo_fin else len(ordinales)
+        return self._jornadas[desde:hasta]
+
+
+
+def _domingo_de_pascua(anio):
+    """Calcula el Domingo de Pascua del calendario gregoriano (algoritmo anónimo de Meeus/Jones/Butcher)."""
+    a = anio % 19
+    b, c = divmod(anio, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    mes, dia = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(anio, mes, dia + 1)
+
+
+def _trasladar_a_lunes(fecha):
+    """Ley Emiliani (Ley 51 de 1983): el festivo se traslada al lunes siguiente si no cae en lunes."""
+    return fecha + datetime.timedelta(days=(7 - fecha.weekday()) % 7)
+
+
+@functools.lru_cache(maxsize=None)
+def festivos_colombia(anio):
+    """
+    Retorna el conjunto (frozenset) de días festivos de Colombia para el año dado.
+    El resultado se memoriza por año, así que cada año se calcula una sola vez.
+    """
+    pascua = _domingo_de_pascua(anio)
+    dias = datetime.timedelta
+    festivos = {
+        # Festivos de fecha fija
+        datetime.date(anio, 1, 1),   # Año Nuevo
+        datetime.date(anio, 5, 1),   # Día del Trabajo
+        datetime.date(anio, 7, 20),  # Grito de Independencia
+        datetime.date(anio, 8, 7),   # Batalla de Boyacá
+        datetime.date(anio, 12, 8),  # Día de la Inmaculada Concepción
+        datetime.date(anio, 12, 25), # Navidad
+        # Festivos trasladables al lunes (Ley Emiliani)
+        _trasladar_a_lunes(datetime.date(anio, 1, 6)),   # Día de Reyes Magos
+        _trasladar_a_lunes(datetime.date(anio, 3, 19)),  # Día de San José
+        _trasladar_a_lunes(datetime.date(anio, 6, 29)),  # San Pedro y San Pablo
+        _trasladar_a_lunes(datetime.date(anio, 8, 15)),  # Asunción de la Virgen
+        _trasladar_a_lunes(datetime.date(anio, 10, 12)), # Día de la Raza
+        _trasladar_a_lunes(datetime.date(anio, 11, 1)),  # Día de Todos los Santos
+        _trasladar_a_lunes(datetime.date(anio, 11, 11)), # Independencia de Cartagena
+        # Festivos relativos a la Pascua
+        pascua - dias(days=3), # Jueves Santo
+        pascua - dias(days=2), # Viernes Santo
+        _trasladar_a_lunes(pascua + dias(days=39)), # Ascensión del Señor
+        _trasladar_a_lunes(pascua + dias(days=60)), # Corpus Christi
+        _trasladar_a_lunes(pascua + dias(days=68)), # Sagrado Corazón
+    }
+    return frozenset(festivos)
+
+
+class CalendarioFestivos:
+    """
+    Calendario de días festivos con consulta de pertenencia en tiempo constante (hash).
+    Los festivos de cada año se generan con festivos_colombia() la primera vez que se consulta
+    una fecha de ese año; los festivos agregados o eliminados manualmente se aplican encima.
+    Mantiene además una vista ordenada de los años ya consultados, reconstruida solo cuando
+    cambia, para listar los festivos en la interfaz.
+    """
+    def __init__(self, agregados=(), eliminados=()):
+        self.agregados = set(agregados) # Festivos manuales que no genera la regla
+        self.eliminados = set(eliminados) # Festivos generados que el usuario quitó
+        self._por_anio = {} # Año -> conjunto final de festivos de ese año
+        self._ordenadas = None
+        self.version = 0 # Aumenta con cada cambio para que otros componentes detecten modificaciones
+        # (versión, fechas que pasaron de festivo a no festivo o al revés) de los últimos cambios; None si no se sabe
+        self._historial = collections.deque(maxlen=HISTORIAL_FESTIVOS)
+
+    def _festivos_del_anio(self, anio):
+        festivos = self._por_anio.get(anio)
+        if festivos is None:
+            festivos = set(festivos_colombia(anio))
+            festivos.update(f for f in self.agregados if f.year == anio)
+            festivos.difference_update(self.eliminados)
+            self._por_anio[anio] = festivos
+            self._ordenadas = None
+        return festivos
+
+    def __contains__(self, fecha):
+        return fecha in self._festivos_del_anio(fecha.year)
+
+    def __iter__(self):
+        return iter(self.ordenadas())
+
+    def __len__(self):
+        return len(self.ordenadas())
+
+    def incluir_anio(self, anio):
+        """Asegura que los festivos del año aparezcan en la vista ordenada."""
+        self._festivos_del_anio(anio)
+
+    def ordenadas(self):
+        if self._ordenadas is None:
+            for anio in {f.year for f in self.agregados}:
+                self._festivos_del_anio(anio)
+            self._ordenadas = sorted(f for festivos in self._por_anio.values() for f in festivos)
+        return self._ordenadas
+
+    def festivos_entre(self, desde, hasta):
+        """Festivos entre las dos fechas (inclusive), sin un orden particular."""
+        return [f for anio in range(desde.year, hasta.year + 1) for f in self._festivos_del_anio(anio) if desde <= f <= hasta]
+
+    def _marcar_cambio(self, anios=None, fechas=None):
+        if anios is None:
+            self._por_anio.clear()
+        else:
+            for anio in anios:
+                self._por_anio.pop(anio, None)
+                self.incluir_anio(anio) # Mantener el año visible en la vista ordenada
+        self._ordenadas = None
+        self.version += 1
+        self._historial.append((self.version, None if fechas is None else frozenset(fechas)))
+
+    def fechas_cambiadas(self, version):
+        """
+        Retorna las fechas que pasaron de festivo a no festivo (o al revés) desde la versión indicada, o None si
+        no se recuerdan todos los cambios desde entonces.
+        """
+        cambiadas = set()
+        esperada = version + 1
+        for version_cambio, fechas in self._historial:
+            if version_cambio < esperada:
+                continue
+            if version_cambio > esperada or fechas is None:
+                return None
+            cambiadas ^= fechas # Una fecha que cambió dos veces quedó como estaba
+            esperada += 1
+        return cambiadas if esperada == self.version + 1 else None
+
+    def _reemplazar_manuales(self, agregados, eliminados):
+        """Cambia los festivos manuales y retorna las fechas que dejaron de ser festivo o empezaron a serlo."""
+        candidatas = (self.agregados ^ agregados) | (self.eliminados ^ eliminados)
+        antes = {fecha for fecha in candidatas if fecha in self}
+        self.agregados = agregados
+        self.eliminados = eliminados
+        self._por_anio.clear()
+        return {fecha for fecha in candidatas if (fecha in self) != (fecha in antes)}
+
+    def agregar(self, fecha):
+        if fecha in self:
+            return False
+        self.eliminados.discard(fecha)
+        if fecha not in festivos_colombia(fecha.year):
+            self.agregados.add(fecha)
+        self._marcar_cambio((fecha.year,), (fecha,))
+        return True
+
+    def eliminar(self, fecha):
+        if fecha not in self:
+            return False
+        self.agregados.discard(fecha)
+        if fecha in festivos_colombia(fecha.year):
+            self.eliminados.add(fecha)
+        self._marcar_cambio((fecha.year,), (fecha,))
+        return True
+
+    def establecer_cambios_manuales(self, agregados, eliminados):
+        self._marcar_cambio(fechas=self._reemplazar_manuales(set(agregados), set(eliminados)))
+
+    def reemplazar(self, fechas):
+        """
+        Toma 'fechas' como la lista completa de festivos de los años que contiene (formato anterior,
+        donde se guardaban todos los festivos): en esos años se respeta exactamente esa lista y los
+        demás años se siguen generando por regla.
+        """
+        fechas = set(fechas)
+        anios = {f.year for f in fechas}
+        generados = set().union(*(festivos_colombia(anio) for anio in anios))
+        self._marcar_cambio(fechas=self._reemplazar_manuales(fechas - generados, generados - fechas))
+        for anio in anios:
+            self.incluir_anio(anio)
+
+
+@functools.lru_cache(maxsize=TAMANO_CACHE_TRAMOS)
+def _segundos_por_tramo(inicio, fin, standard_daily_hours):
+    """
+    Divide una jornada (entrada y salida en segundos del día; si la salida no es posterior a la entrada, es al día
+    siguiente) por sus límites reales (06:00, 21:00, medianoche y el punto donde se agotan las horas diarias
+    estándar). Retorna dos tuplas de segundos, una para el día de entrada y otra para el siguiente, con los tramos
+    ordinario diurno, ordinario nocturno, extra diurno y extra nocturno. No depende del calendario: el tipo de cada
+    día decide después en qué categorías quedan (ver CalculadoraRecargos._segundos_por_categoria).
+    """
+    if fin <= inicio:
+        fin += SEGUNDOS_DIA
+    limite_extras = inicio + standard_daily_hours * 3600 # A partir de aquí las horas son extras
+
+    cortes = [inicio]
+    for limite in sorted((*LIMITES_JORNADA, limite_extras)):
+        if inicio < limite < fin and limite != cortes[-1]:
+            cortes.append(limite)
+    cortes.append(fin)
+
+    tramos = ([0, 0, 0, 0], [0, 0, 0, 0])
+    for desde, hasta in zip(cortes, cortes[1:]):
+        segundo_del_dia = desde % SEGUNDOS_DIA
+        indice = 0
+        if desde >= limite_extras:
+            indice += 2
+        if segundo_del_dia < INICIO_DIURNO or segundo_del_dia >= INICIO_NOCTURNO:
+            indice += 1
+        tramos[desde >= SEGUNDOS_DIA][indice] += hasta - desde
+    return tuple(tramos[0]), tuple(tramos[1])
+
 
 class CalculadoraRecargos:
     def __init__(self):
@@ -44,45 +621,50 @@ class CalculadoraRecargos:
         self.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_LARGA_JORNADA = 0.80 # 80% (Para jornadas > 8h en D/F diurno)
         self.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_NOCTURNO_LARGA_JORNADA = 2.15 # 215% (Para jornadas > 8h en D/F nocturno)
 
-        self.dias_festivos = self._cargar_festivos_iniciales()
-
-    def _cargar_festivos_iniciales(self):
-        # Días festivos de Colombia para 2025 (ejemplo)
-        # Fuente: https://www.calendario-colombia.com/dias-festivos-2025.html
-        festivos = [
-            datetime.date(2025, 1, 1),  # Año Nuevo
-            datetime.date(2025, 1, 6),  # Día de Reyes Magos
-            datetime.date(2025, 3, 24), # Día de San José
-            datetime.date(2025, 4, 17), # Jueves Santo
-            datetime.date(2025, 4, 18), # Viernes Santo
-            datetime.date(2025, 5, 1),  # Día del Trabajo
-            datetime.date(2025, 5, 26), # Día de la Ascensión
-            datetime.date(2025, 6, 16), # Corpus Christi
-            datetime.date(2025, 6, 23), # Sagrado Corazón
-            datetime.date(2025, 7, 20), # Grito de Independencia
-            datetime.date(2025, 8, 7),  # Batalla de Boyacá
-            datetime.date(2025, 8, 18), # Asunción de la Virgen
-            datetime.date(2025, 10, 13),# Día de la Raza
-            datetime.date(2025, 11, 3), # Día de Todos los Santos
-            datetime.date(2025, 11, 17),# Independencia de Cartagena
-            datetime.date(2025, 12, 8), # Día de la Inmaculada Concepción
-            datetime.date(2025, 12, 25) # Navidad
-        ]
-        return sorted(list(set(festivos))) # Eliminar duplicados y ordenar
+        # Los festivos se generan por regla para cualquier año (ver festivos_colombia)
+        self._calendario_festivos = CalendarioFestivos()
+
+        # Caché LRU de resultados por jornada. La clave incluye la versión de los porcentajes y la del
+        # calendario de festivos, así un cambio en cualquiera de los dos nunca devuelve un resultado viejo.
+        # No es segura entre hilos: cada hilo trabaja con su propia calculadora (ver copiar).
+        self.version_porcentajes = 0
+        self._cache_jornadas = collections.OrderedDict()
+        self.tamano_cache = TAMANO_CACHE_JORNADAS
+        self.cache_aciertos = 0
+        self.cache_fallos = 0
+
+    @property
+    def dias_festivos(self):
+        return self._calendario_festivos
+
+    @dias_festivos.setter
+    def dias_festivos(self, fechas):
+        # Permite asignar una lista completa de fechas (formato anterior de los datos) sin perder la consulta O(1)
+        self._calendario_festivos.reemplazar(fechas)
 
     def es_festivo_o_domingo(self, fecha):
         return fecha.weekday() == 6 or fecha in self.dias_festivos # 6 es domingo
 
+    def limpiar_cache(self):
+        self._cache_jornadas.clear()
+
+    def estadisticas_cache(self):
+        """Retorna los contadores de la caché de jornadas."""
+        return {"aciertos": self.cache_aciertos, "fallos": self.cache_fallos, "entradas": len(self._cache_jornadas)}
+
+    def _porcentajes_modificados(self):
+        self.version_porcentajes += 1
+        self.limpiar_cache()
+
     def agregar_dia_festivo(self, fecha):
-        if fecha not in self.dias_festivos:
-            self.dias_festivos.append(fecha)
-            self.dias_festivos.sort()
+        if self.dias_festivos.agregar(fecha):
+            self.limpiar_cache()
             return f"Día festivo {fecha.strftime('%Y-%m-%d')} agregado."
         return f"El día {fecha.strftime('%Y-%m-%d')} ya es un día festivo registrado."
 
     def eliminar_dia_festivo(self, fecha):
-        if fecha in self.dias_festivos:
-            self.dias_festivos.remove(fecha)
+        if self.dias_festivos.eliminar(fecha):
+            self.limpiar_cache()
             return f"Día festivo {fecha.strftime('%Y-%m-%d')} eliminado."
         return f"El día {fecha.strftime('%Y-%m-%d')} no se encontró en la lista de festivos."
 
@@ -112,309 +694,445 @@ class CalculadoraRecargos:
             return round(self.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_NOCTURNO_LARGA_JORNADA * 100)
         return 0 # Para horas ordinarias diurnas que no tienen recargo adicional
 
-    def calcular_recargos_jornada(self, empleado, jornada):
-        fecha = jornada["fecha"]
-        hora_entrada = jornada["hora_entrada"]
-        hora_salida = jornada["hora_salida"]
+    def _tipo_dia(self, fecha):
+        if fecha.weekday() == 6: # Domingo (tiene prioridad si además es festivo)
+            return TIPO_DIA_DOMINGO
+        if fecha in self.dias_festivos:
+            return TIPO_DIA_FESTIVO
+        return TIPO_DIA_HABIL
 
-        valor_hora_ordinaria = empleado.obtener_valor_hora_ordinaria()
-        
-        # Calcular duración total de la jornada en horas
-        # Manejar jornadas que cruzan la medianoche
-        if hora_salida <= hora_entrada: # Si la hora de salida es menor o igual a la de entrada, es al día siguiente
-            delta_tiempo = (datetime.datetime.combine(fecha + datetime.timedelta(days=1), hora_salida) - 
-                            datetime.datetime.combine(fecha, hora_entrada))
-        else:
-            delta_tiempo = datetime.datetime.combine(fecha, hora_salida) - datetime.datetime.combine(fecha, hora_entrada)
-        
-        total_horas_jornada = delta_tiempo.total_seconds() / 3600.0
-
-        # Inicializar contadores de horas por tipo
-        horas_categorizadas = {
-            "horas_ordinarias_diurnas": 0.0,
-            "horas_ordinarias_nocturnas": 0.0,
-            "horas_extras_diurnas": 0.0,
-            "horas_extras_nocturnas": 0.0,
-            "horas_ordinarias_diurnas_domingo": 0.0,
-            "horas_ordinarias_nocturnas_domingo": 0.0,
-            "horas_extras_diurnas_domingo": 0.0,
-            "horas_extras_nocturnas_domingo": 0.0,
-            "horas_ordinarias_diurnas_festivo": 0.0,
-            "horas_ordinarias_nocturnas_festivo": 0.0,
-            "horas_extras_diurnas_festivo": 0.0,
-            "horas_extras_nocturnas_festivo": 0.0,
-        }
+    def _tipos_por_dia(self, primer_dia, ultimo_dia):
+        """
+        Tipo de cada día desde primer_dia hasta ultimo_dia (inclusive, en días desde 1970-01-01), igual que
+        _tipo_dia() pero sin recorrer las fechas una por una: los domingos se marcan cada 7 posiciones.
+        """
+        np = _numpy()
+        tipos = np.full(ultimo_dia - primer_dia + 1, TIPO_DIA_HABIL, dtype=np.int8)
+        desde = datetime.date.fromordinal(primer_dia + EPOCH_ORDINAL)
+        hasta = datetime.date.fromordinal(ultimo_dia + EPOCH_ORDINAL)
+        festivos = [f.toordinal() - EPOCH_ORDINAL - primer_dia for f in self.dias_festivos.festivos_entre(desde, hasta)]
+        tipos[np.asarray(festivos, dtype=np.int64)] = TIPO_DIA_FESTIVO
+        tipos[(6 - desde.weekday()) % 7::7] = TIPO_DIA_DOMINGO # El domingo tiene prioridad si además es festivo
+        return tipos
+
+    def _categorizar_jornada(self, fecha, hora_entrada, hora_salida, standard_daily_hours):
+        """Retorna (lista de horas en el orden de CATEGORIAS_HORAS, total de horas de la jornada)."""
+        segundos, total_segundos = self._segundos_por_categoria(fecha, hora_entrada, hora_salida, standard_daily_hours)
+        # Se divide una sola vez por categoría para que calcular_lote() obtenga exactamente los mismos valores
+        return [seg / 3600.0 for seg in segundos], total_segundos / 3600.0
+
+    def _segundos_por_categoria(self, fecha, hora_entrada, hora_salida, standard_daily_hours):
+        """
+        Divide la jornada en tramos por sus límites reales (06:00, 21:00, medianoche y el punto
+        donde se agotan las horas diarias estándar) y suma los segundos de cada tramo a su categoría.
+        Retorna (lista de segundos enteros en el orden de CATEGORIAS_HORAS, total de segundos de la jornada).
+        El costo depende del número de límites, no de la duración de la jornada (ver _segundos_por_tramo).
+        """
+        inicio = hora_entrada.hour * 3600 + hora_entrada.minute * 60 + hora_entrada.second
+        fin = hora_salida.hour * 3600 + hora_salida.minute * 60 + hora_salida.second
+        del_dia, del_siguiente = _segundos_por_tramo(inicio, fin, standard_daily_hours)
+
+        segundos = [0] * len(CATEGORIAS_HORAS)
+        indice = self._tipo_dia(fecha) * 4
+        segundos[indice:indice + 4] = del_dia
+        if any(del_siguiente):
+            indice = self._tipo_dia(fecha + datetime.timedelta(days=1)) * 4
+            for tramo, seg in enumerate(del_siguiente):
+                segundos[indice + tramo] += seg
+        return segundos, sum(del_dia) + sum(del_siguiente)
+
+    def _factores_recargo(self):
+        """
+        Retorna el porcentaje ADICIONAL (en decimal) de cada categoría, en el orden de CATEGORIAS_HORAS.
+        El valor total de una hora es valor_hora_ordinaria * (1 + factor).
+        """
+        extra_diurna = self.MULTIPLIER_HORA_EXTRA_DIURNA - 1.0
+        extra_nocturna = self.MULTIPLIER_HORA_EXTRA_NOCTURNA - 1.0
+        extra_diurna_df = self.MULTIPLIER_EXTRA_DIURNA_DOMINGOFESTIVO - 1.0
+        extra_nocturna_df = self.MULTIPLIER_EXTRA_NOCTURNA_DOMINGOFESTIVO - 1.0
+        ordinaria_diurna_df = self.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_BASE
+        ordinaria_nocturna_df = self.ADDITIONAL_PERCENTAGE_DECIMAL_ORDINARIA_NOCTURNA_DOMINGOFESTIVO
+        return (
+            0.0, self.ADDITIONAL_PERCENTAGE_DECIMAL_HORA_ORDINARIA_NOCTURNA, extra_diurna, extra_nocturna, # Día hábil
+            ordinaria_diurna_df, ordinaria_nocturna_df, extra_diurna_df, extra_nocturna_df, # Domingo
+            ordinaria_diurna_df, ordinaria_nocturna_df, extra_diurna_df, extra_nocturna_df, # Festivo
+        )
+
+    def _calcular_jornada(self, jornada, valor_hora_ordinaria, standard_daily_hours, factores=None):
+        """
+        Núcleo de cálculo por jornada usado por todos los métodos y reportes.
+        Retorna (horas, total_horas, recargos, valor_bruto), donde horas y recargos siguen el orden
+        de CATEGORIAS_HORAS y recargos contiene solo el valor ADICIONAL de cada categoría.
+        """
+        # valor_hora_ordinaria se deriva solo del salario mensual, así que lo representa en la clave
+        clave = (jornada["fecha"], jornada["hora_entrada"], jornada["hora_salida"], valor_hora_ordinaria, standard_daily_hours,
+                 self.version_porcentajes, self._calendario_festivos.version)
+        resultado = self._cache_jornadas.get(clave)
+        if resultado is not None:
+            self.cache_aciertos += 1
+            self._cache_jornadas.move_to_end(clave)
+            return resultado
+        self.cache_fallos += 1
+
+        if factores is None:
+            factores = self._factores_recargo()
+        horas, total_horas = self._categorizar_jornada(jornada["fecha"], jornada["hora_entrada"], jornada["hora_salida"], standard_daily_hours)
+
+        recargos = [0.0] * len(CATEGORIAS_HORAS)
+        valor_bruto = 0.0
+        for i, h in enumerate(horas):
+            if h > 0:
+                valor_base = h * valor_hora_ordinaria
+                recargos[i] = valor_base * factores[i]
+                valor_bruto += valor_base + recargos[i]
+
+        # Se guardan tuplas para que ningún consumidor pueda alterar un resultado compartido
+        resultado = (tuple(horas), total_horas, tuple(recargos), valor_bruto)
+        self._cache_jornadas[clave] = resultado
+        if len(self._cache_jornadas) > self.tamano_cache:
+            self._cache_jornadas.popitem(last=False) # Descarta la jornada usada hace más tiempo
+        return resultado
 
-        # Iterar hora por hora para categorizar
-        current_time = datetime.datetime.combine(fecha, hora_entrada)
-        end_time = datetime.datetime.combine(fecha, hora_salida)
-        if hora_salida <= hora_entrada:
-            end_time = datetime.datetime.combine(fecha + datetime.timedelta(days=1), hora_salida)
+    def calcular_recargos_jornada(self, empleado, jornada):
+        """Retorna (valor bruto de la jornada, horas por categoría, total de horas)."""
+        horas, total_horas_jornada, _, valor_bruto = self._calcular_jornada(
+            jornada, empleado.obtener_valor_hora_ordinaria(), empleado.standard_daily_hours)
+        return valor_bruto, dict(zip(CATEGORIAS_HORAS, horas)), total_horas_jornada
 
-        horas_trabajadas_hoy = 0.0
-        
-        while current_time < end_time:
-            next_hour = current_time + datetime.timedelta(hours=1)
-            # Asegurarse de no exceder el end_time si la última fracción de hora es menor a 1
-            if next_hour > end_time:
-                next_hour = end_time
-            
-            duration = (next_hour - current_time).total_seconds() / 3600.0
-            
-            is_domingo_o_festivo = self.es_festivo_o_domingo(current_time.date())
-            
-            # Determinar si es horario nocturno (9 PM a 6 AM)
-            is_nocturno = (current_time.time() >= datetime.time(21, 0) or 
-                            current_time.time() < datetime.time(6, 0))
-
-            horas_trabajadas_hoy += duration
-
-            if is_domingo_o_festivo:
-                # Determinar si es domingo o festivo específico
-                if current_time.date().weekday() == 6: # Es domingo
-                    if is_nocturno:
-                        if horas_trabajadas_hoy <= empleado.standard_daily_hours:
-                            horas_categorizadas["horas_ordinarias_nocturnas_domingo"] += duration
-                        else:
-                            horas_categorizadas["horas_extras_nocturnas_domingo"] += duration
-                    else: # Diurno en domingo
-                        if horas_trabajadas_hoy <= empleado.standard_daily_hours:
-                            horas_categorizadas["horas_ordinarias_diurnas_domingo"] += duration
-                        else:
-                            horas_categorizadas["horas_extras_diurnas_domingo"] += duration
-                elif current_time.date() in self.dias_festivos: # Es festivo
-                    if is_nocturno:
-                        if horas_trabajadas_hoy <= empleado.standard_daily_hours:
-                            horas_categorizadas["horas_ordinarias_nocturnas_festivo"] += duration
-                        else:
-                            horas_categorizadas["horas_extras_nocturnas_festivo"] += duration
-                    else: # Diurno en festivo
-                        if horas_trabajadas_hoy <= empleado.standard_daily_hours:
-                            horas_categorizadas["horas_ordinarias_diurnas_festivo"] += duration
-                        else:
-                            horas_categorizadas["horas_extras_diurnas_festivo"] += duration
-            else: # Día hábil
-                if is_nocturno:
-                    if horas_trabajadas_hoy <= empleado.standard_daily_hours:
-                        horas_categorizadas["horas_ordinarias_nocturnas"] += duration
-                    else:
-                        horas_categorizadas["horas_extras_nocturnas"] += duration
-                else: # Diurno en día hábil
-                    if horas_trabajadas_hoy <= empleado.standard_daily_hours:
-                        horas_categorizadas["horas_ordinarias_diurnas"] += duration
+    @staticmethod
+    def _categorizar_bloque(inicio, duracion, segundos_estandar, tipos, segundos):
+        """
+        Calcula los segundos por categoría de un bloque de jornadas (usado por calcular_lote).
+        'inicio' está en segundos desde la medianoche del día de entrada, 'segundos_estandar' son las horas diarias
+        estándar en segundos y 'tipos' tiene el tipo del día de entrada (fila 0) y del siguiente (fila 1). Escribe
+        el resultado en 'segundos' (12 x jornadas), del mismo tipo de dato que los arreglos de entrada.
+        """
+        np = _numpy()
+        fin = inicio + duracion
+        fin_ordinarias = np.minimum(fin, inicio + segundos_estandar) # Donde se agotan las horas estándar
+
+        def acumulados(x):
+            # Funciones acumuladas desde la medianoche del día de entrada hasta x: horas diurnas del día de entrada,
+            # horas diurnas del día siguiente, tiempo antes de la medianoche y tiempo después de ella (desplazado)
+            return (np.minimum(np.maximum(x, INICIO_DIURNO), INICIO_NOCTURNO),
+                    np.minimum(np.maximum(x, SEGUNDOS_DIA + INICIO_DIURNO), SEGUNDOS_DIA + INICIO_NOCTURNO),
+                    np.minimum(x, SEGUNDOS_DIA),
+                    np.maximum(x, SEGUNDOS_DIA))
+
+        # Segundos de cada tramo ordinario [inicio, fin_ordinarias) y extra [fin_ordinarias, fin), por día y jornada
+        # (diurna/nocturna). Con segundos enteros todas las operaciones son exactas. La entrada siempre
+        # cae en el día de entrada, así que tres de sus cuatro acumuladas son constantes.
+        puntos = [(np.minimum(np.maximum(inicio, INICIO_DIURNO), INICIO_NOCTURNO), SEGUNDOS_DIA + INICIO_DIURNO, inicio,
+                   SEGUNDOS_DIA),
+                  acumulados(fin_ordinarias), acumulados(fin)]
+        tramos = ([], [])
+        for es_extra in (0, 1):
+            desde, hasta = puntos[es_extra], puntos[es_extra + 1]
+            diurno_0 = hasta[0] - desde[0]
+            diurno_1 = hasta[1] - desde[1]
+            nocturno_0 = hasta[2] - desde[2]
+            nocturno_0 -= diurno_0
+            nocturno_1 = hasta[3] - desde[3]
+            nocturno_1 -= diurno_1
+            tramos[0].extend(((es_extra * 2, diurno_0), (es_extra * 2 + 1, nocturno_0)))
+            tramos[1].extend(((es_extra * 2, diurno_1), (es_extra * 2 + 1, nocturno_1)))
+
+        # Repartir cada tramo en la categoría que corresponde al tipo de día (hábil, domingo o festivo).
+        # Multiplicar por 0/1 es exacto, así que el resultado coincide con _categorizar_jornada. Los tramos del
+        # día de entrada se escriben directamente en su fila (cada fila recibe uno solo) y los del día siguiente se
+        # suman encima, con un único arreglo temporal.
+        temporal = np.empty_like(inicio)
+        for dia_relativo in (0, 1):
+            for tipo in (TIPO_DIA_HABIL, TIPO_DIA_DOMINGO, TIPO_DIA_FESTIVO):
+                es_tipo = tipos[dia_relativo] == tipo
+                if not es_tipo.any():
+                    if dia_relativo == 0:
+                        segundos[tipo * 4:tipo * 4 + 4] = 0
+                    continue
+                es_tipo = es_tipo.astype(inicio.dtype)
+                for categoria, valor in tramos[dia_relativo]:
+                    fila = segundos[tipo * 4 + categoria]
+                    if dia_relativo == 0:
+                        np.multiply(valor, es_tipo, out=fila)
                     else:
-                        horas_categorizadas["horas_extras_diurnas"] += duration
-            
-            current_time = next_hour
-
-        # Calcular recargos basados en las horas categorizadas (se mantiene para cálculos internos)
-        recargo_total_jornada = 0.0
-        horas_con_recargo_jornada = 0.0
-        
-        # Horas Ordinarias Diurnas (no tienen recargo adicional, solo valor base)
-        recargo_total_jornada += horas_categorizadas["horas_ordinarias_diurnas"] * valor_hora_ordinaria
-
-        # Horas Ordinarias Nocturnas
-        if horas_categorizadas["horas_ordinarias_nocturnas"] > 0:
-            recargo_total_jornada += (horas_categorizadas["horas_ordinarias_nocturnas"] * valor_hora_ordinaria * (1 + self.ADDITIONAL_PERCENTAGE_DECIMAL_HORA_ORDINARIA_NOCTURNA))
-            horas_con_recargo_jornada += horas_categorizadas["horas_ordinarias_nocturnas"]
-
-        # Horas Extras Diurnas
-        if horas_categorizadas["horas_extras_diurnas"] > 0:
-            recargo_total_jornada += (horas_categorizadas["horas_extras_diurnas"] * valor_hora_ordinaria * self.MULTIPLIER_HORA_EXTRA_DIURNA)
-            horas_con_recargo_jornada += horas_categorizadas["horas_extras_diurnas"]
-
-        # Horas Extras Nocturnas
-        if horas_categorizadas["horas_extras_nocturnas"] > 0:
-            recargo_total_jornada += (horas_categorizadas["horas_extras_nocturnas"] * valor_hora_ordinaria * self.MULTIPLIER_HORA_EXTRA_NOCTURNA)
-            horas_con_recargo_jornada += horas_categorizadas["horas_extras_nocturnas"]
-
-        # Horas Ordinarias Diurnas Domingo/Festivo
-        if horas_categorizadas["horas_ordinarias_diurnas_domingo"] > 0:
-            recargo_total_jornada += (horas_categorizadas["horas_ordinarias_diurnas_domingo"] * valor_hora_ordinaria * (1 + self.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_BASE))
-            horas_con_recargo_jornada += horas_categorizadas["horas_ordinarias_diurnas_domingo"]
-
-        if horas_categorizadas["horas_ordinarias_diurnas_festivo"] > 0:
-            recargo_total_jornada += (horas_categorizadas["horas_ordinarias_diurnas_festivo"] * valor_hora_ordinaria * (1 + self.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_BASE))
-            horas_con_recargo_jornada += horas_categorizadas["horas_ordinarias_diurnas_festivo"]
-
-        # Horas Ordinarias Nocturnas Domingo/Festivo
-        if horas_categorizadas["horas_ordinarias_nocturnas_domingo"] > 0:
-            recargo_total_jornada += (horas_categorizadas["horas_ordinarias_nocturnas_domingo"] * valor_hora_ordinaria * (1 + self.ADDITIONAL_PERCENTAGE_DECIMAL_ORDINARIA_NOCTURNA_DOMINGOFESTIVO))
-            horas_con_recargo_jornada += horas_categorizadas["horas_ordinarias_nocturnas_domingo"]
-
-        if horas_categorizadas["horas_ordinarias_nocturnas_festivo"] > 0:
-            recargo_total_jornada += (horas_categorizadas["horas_ordinarias_nocturnas_festivo"] * valor_hora_ordinaria * (1 + self.ADDITIONAL_PERCENTAGE_DECIMAL_ORDINARIA_NOCTURNA_DOMINGOFESTIVO))
-            horas_con_recargo_jornada += horas_categorizadas["horas_ordinarias_nocturnas_festivo"]
-
-        # Horas Extras Diurnas Domingo/Festivo
-        if horas_categorizadas["horas_extras_diurnas_domingo"] > 0:
-            recargo_total_jornada += (horas_categorizadas["horas_extras_diurnas_domingo"] * valor_hora_ordinaria * self.MULTIPLIER_EXTRA_DIURNA_DOMINGOFESTIVO)
-            horas_con_recargo_jornada += horas_categorizadas["horas_extras_diurnas_domingo"]
-
-        if horas_categorizadas["horas_extras_diurnas_festivo"] > 0:
-            recargo_total_jornada += (horas_categorizadas["horas_extras_diurnas_festivo"] * valor_hora_ordinaria * self.MULTIPLIER_EXTRA_DIURNA_DOMINGOFESTIVO)
-            horas_con_recargo_jornada += horas_categorizadas["horas_extras_diurnas_festivo"]
-
-        # Horas Extras Nocturnas Domingo/Festivo
-        if horas_categorizadas["horas_extras_nocturnas_domingo"] > 0:
-            recargo_total_jornada += (horas_categorizadas["horas_extras_nocturnas_domingo"] * valor_hora_ordinaria * self.MULTIPLIER_EXTRA_NOCTURNA_DOMINGOFESTIVO)
-            horas_con_recargo_jornada += horas_categorizadas["horas_extras_nocturnas_domingo"]
-
-        if horas_categorizadas["horas_extras_nocturnas_festivo"] > 0:
-            recargo_total_jornada += (horas_categorizadas["horas_extras_nocturnas_festivo"] * valor_hora_ordinaria * self.MULTIPLIER_EXTRA_NOCTURNA_DOMINGOFESTIVO)
-            horas_con_recargo_jornada += horas_categorizadas["horas_extras_nocturnas_festivo"]
-
-        return recargo_total_jornada, horas_categorizadas, total_horas_jornada
-
-    def get_accumulated_hours_and_surcharges(self, empleado):
-        acum_horas = {
-            "horas_ordinarias_diurnas": 0.0,
-            "horas_ordinarias_nocturnas": 0.0,
-            "horas_extras_diurnas": 0.0,
-            "horas_extras_nocturnas": 0.0,
-            "horas_ordinarias_diurnas_domingo": 0.0,
-            "horas_ordinarias_nocturnas_domingo": 0.0,
-            "horas_extras_diurnas_domingo": 0.0,
-            "horas_extras_nocturnas_domingo": 0.0,
-            "horas_ordinarias_diurnas_festivo": 0.0,
-            "horas_ordinarias_nocturnas_festivo": 0.0,
-            "horas_extras_diurnas_festivo": 0.0,
-            "horas_extras_nocturnas_festivo": 0.0,
-        }
-        acum_surcharge_values = { # Almacena solo el valor del recargo adicional
-            "horas_ordinarias_nocturnas": 0.0,
-            "horas_extras_diurnas": 0.0,
-            "horas_extras_nocturnas": 0.0,
-            "horas_ordinarias_diurnas_domingo": 0.0,
-            "horas_ordinarias_nocturnas_domingo": 0.0,
-            "horas_extras_diurnas_domingo": 0.0,
-            "horas_extras_nocturnas_domingo": 0.0,
-            "horas_ordinarias_diurnas_festivo": 0.0,
-            "horas_ordinarias_nocturnas_festivo": 0.0,
-            "horas_extras_diurnas_festivo": 0.0,
-            "horas_extras_nocturnas_festivo": 0.0,
-        }
-        total_gross_value = 0.0 # Valor bruto total (valor base + recargos)
-
-        valor_hora_ordinaria = empleado.obtener_valor_hora_ordinaria()
-
-        for jornada in empleado.jornadas_registradas:
-            fecha = jornada["fecha"]
-            hora_entrada = jornada["hora_entrada"]
-            hora_salida = jornada["hora_salida"]
-
-            # Calcular duración total de la jornada en horas
-            if hora_salida <= hora_entrada:
-                delta_tiempo = (datetime.datetime.combine(fecha + datetime.timedelta(days=1), hora_salida) - 
-                                datetime.datetime.combine(fecha, hora_entrada))
-            else:
-                delta_tiempo = datetime.datetime.combine(fecha, hora_salida) - datetime.datetime.combine(fecha, hora_entrada)
-            
-            total_horas_jornada = delta_tiempo.total_seconds() / 3600.0
+                        np.multiply(valor, es_tipo, out=temporal)
+                        fila += temporal
 
-            # Categorizar horas para esta jornada
-            current_time = datetime.datetime.combine(fecha, hora_entrada)
-            end_time = datetime.datetime.combine(fecha, hora_salida)
-            if hora_salida <= hora_entrada:
-                end_time = datetime.datetime.combine(fecha + datetime.timedelta(days=1), hora_salida)
+    def calcular_lote(self, inicio_epoch, fin_epoch, standard_daily_hours, valor_hora):
+        """
+        Categoriza y valoriza de una vez todas las jornadas de un período (de uno o varios empleados)
+        con operaciones vectorizadas de NumPy.
 
-            horas_trabajadas_en_dia = 0.0 # Para controlar las horas estándar diarias
+        Recibe arreglos de igual longitud (una posición por jornada): inicio y fin en segundos desde
+        1970-01-01 00:00 hora local (ver jornada_a_epoch), horas diarias estándar y valor de la hora
+        ordinaria del empleado. Retorna (horas, recargos), dos matrices de forma (jornadas x 12) en el
+        orden de CATEGORIAS_HORAS, con los mismos valores que _calcular_jornada() para cada jornada.
+        """
+        np = _numpy()
+
+        inicio_epoch = np.asarray(inicio_epoch, dtype=np.int64)
+        fin_epoch = np.asarray(fin_epoch, dtype=np.int64)
+        duracion = fin_epoch - inicio_epoch
+        if np.any(duracion <= 0) or np.any(duracion > SEGUNDOS_DIA):
+            raise ValueError("Cada jornada debe durar más de 0 y como máximo 24 horas.")
+        # Un escalar vale para todas las jornadas; se mantiene escalar porque así las operaciones son más rápidas
+        standard_daily_hours = np.asarray(standard_daily_hours)
+        if standard_daily_hours.ndim:
+            standard_daily_hours = np.broadcast_to(standard_daily_hours, inicio_epoch.shape)
+        valor_hora = np.asarray(valor_hora, dtype=np.float64)
+        if valor_hora.ndim:
+            valor_hora = np.broadcast_to(valor_hora, inicio_epoch.shape)
+
+        # El tipo de día se resuelve por fecha distinta (pocas en un período), no por jornada
+        n = inicio_epoch.shape[0]
+        dia, inicio_dia = np.divmod(inicio_epoch, SEGUNDOS_DIA)
+        primer_dia = int(dia.min()) if n else 0
+        ultimo_dia = int(dia.max()) + 1 if n else 0
+        if ultimo_dia - primer_dia <= max(n, 366):
+            tipos_por_dia = self._tipos_por_dia(primer_dia, ultimo_dia)
+            dia -= primer_dia
+            tipos = np.stack((tipos_por_dia[dia], tipos_por_dia[dia + 1]))
+        else: # Fechas muy dispersas: resolver solo las fechas que aparecen
+            dias_unicos, posiciones = np.unique(np.concatenate((dia, dia + 1)), return_inverse=True)
+            tipos_unicos = np.array([self._tipo_dia(datetime.date.fromordinal(int(d) + EPOCH_ORDINAL)) for d in dias_unicos], dtype=np.int8)
+            tipos = tipos_unicos[posiciones].reshape(2, -1) # Fila 0: día de entrada, fila 1: día siguiente
+
+        # Con horas estándar enteras todo cabe en enteros de 32 bits (segundos de dos días), que son exactos y casi
+        # el doble de rápidos que float64. El límite de horas estándar se recorta a un día: como ninguna jornada dura
+        # más, recortarlo no cambia el resultado y evita desbordamientos.
+        if np.issubdtype(standard_daily_hours.dtype, np.integer):
+            tipo_dato = np.int32
+            segundos_estandar = np.clip(standard_daily_hours.astype(np.int64) * 3600, 0, SEGUNDOS_DIA)
+        else:
+            tipo_dato = np.float64
+            segundos_estandar = np.clip(standard_daily_hours * 3600.0, 0, SEGUNDOS_DIA)
+        inicio_dia = inicio_dia.astype(tipo_dato)
+        duracion = duracion.astype(tipo_dato)
+        segundos_estandar = segundos_estandar.astype(tipo_dato)
+
+        # Se procesa por bloques para que los arreglos temporales sean pequeños y se reutilicen en caché; cada bloque
+        # se valoriza mientras sigue en caché. Los resultados se guardan por filas (categorías) contiguas y se
+        # entregan transpuestos (jornadas x 12).
+        factores = np.asarray(self._factores_recargo())[:, None]
+        horas = np.empty((len(CATEGORIAS_HORAS), n))
+        recargos = np.empty((len(CATEGORIAS_HORAS), n))
+        segundos = np.empty((len(CATEGORIAS_HORAS), min(n, TAMANO_BLOQUE_LOTE)), dtype=tipo_dato)
+        for desde in range(0, n, TAMANO_BLOQUE_LOTE):
+            hasta = min(desde + TAMANO_BLOQUE_LOTE, n)
+            segundos_bloque = segundos[:, :hasta - desde]
+            self._categorizar_bloque(inicio_dia[desde:hasta], duracion[desde:hasta],
+                                     segundos_estandar[desde:hasta] if segundos_estandar.ndim else segundos_estandar,
+                                     tipos[:, desde:hasta], segundos_bloque)
+            horas_bloque = horas[:, desde:hasta]
+            np.divide(segundos_bloque, 3600.0, out=horas_bloque)
+            recargos_bloque = recargos[:, desde:hasta]
+            np.multiply(horas_bloque, valor_hora[desde:hasta] if valor_hora.ndim else valor_hora, out=recargos_bloque)
+            recargos_bloque *= factores
+        return horas.T, recargos.T
+
+    def get_accumulated_hours_and_surcharges(self, empleado, jornadas=None):
+        """
+        Acumula horas, recargos adicionales y valor bruto de las jornadas del empleado.
+        Si se pasa 'jornadas', se usan esas en lugar de todas las jornadas registradas del empleado
+        (por ejemplo, las de un período), sin necesidad de crear un empleado temporal. Para todas las jornadas
+        se usan los totales que se mantienen en el empleado (ver segundos_totales). En ambos casos se suman
+        segundos enteros por categoría y se valorizan una sola vez, así que el resultado no depende del camino
+        (ni del orden de las jornadas, ni de si se calcula en otro proceso).
+        """
+        if jornadas is None or jornadas is empleado.jornadas_registradas:
+            segundos = self.segundos_totales(empleado)
+        else:
+            segundos = self._sumar_segundos(jornadas, empleado.standard_daily_hours)
+        return self._valorizar_totales(segundos, empleado.obtener_valor_hora_ordinaria(), self._factores_recargo())
+
+    @staticmethod
+    def _valorizar_totales(segundos, valor_hora_ordinaria, factores):
+        """Acumulados como los de get_accumulated_hours_and_surcharges() a partir de los segundos por categoría."""
+        total_horas = [seg / 3600.0 for seg in segundos]
+        total_recargos = [0.0] * len(CATEGORIAS_HORAS)
+        total_gross_value = 0.0
+        for i, h in enumerate(total_horas):
+            if h > 0:
+                valor_base = h * valor_hora_ordinaria
+                total_recargos[i] = valor_base * factores[i]
+                total_gross_value += valor_base + total_recargos[i]
+        return (dict(zip(CATEGORIAS_HORAS, total_horas)), dict(zip(CATEGORIAS_HORAS[1:], total_recargos[1:])),
+                total_gross_value)
+
+    def segundos_totales(self, empleado):
+        """
+        Retorna los segundos por categoría de todas las jornadas del empleado. Los totales se guardan en el
+        empleado (empleado.totales) y en cada consulta solo se procesan las jornadas agregadas, editadas o
+        eliminadas desde la anterior y, si cambiaron festivos, las de los días que cambiaron. Se recalculan
+        completos la primera vez, si cambian las horas diarias estándar, si se reemplazan todas las jornadas o si
+        cambió el calendario de una forma que no se recuerda (ver CalendarioFestivos.fechas_cambiadas). Los
+        porcentajes y el salario no intervienen, así que cambiarlos no requiere recalcular nada.
+        """
+        columnas = empleado.jornadas_registradas
+        calendario = self._calendario_festivos
+        totales = empleado.totales
+        fechas = None
+        if totales is not None and totales.vigentes(columnas, calendario, empleado.standard_daily_hours):
+            fechas = calendario.fechas_cambiadas(totales.version_calendario)
+        if fechas is None:
+            totales = empleado.totales = TotalesJornadas(self._segundos_todas(columnas, empleado.standard_daily_hours),
+                                                         columnas, calendario, empleado.standard_daily_hours)
+        else:
+            self._actualizar_totales(totales, {fecha.toordinal() for fecha in fechas})
+        return list(totales.segundos)
+
+    def _segundos_todas(self, columnas, standard_daily_hours):
+        """Segundos por categoría de todas las jornadas, agrupando las que tienen el mismo horario y tipos de día."""
+        tipos = {}
+        for ordinal in set(columnas.ordinales):
+            for dia in (ordinal, ordinal + 1):
+                if dia not in tipos:
+                    tipos[dia] = self._tipo_dia(_FECHAS_POR_ORDINAL[dia])
+        siguientes = map((1).__add__, columnas.ordinales)
+        grupos = collections.Counter(zip(map(tipos.__getitem__, columnas.ordinales), map(tipos.__getitem__, siguientes),
+                                         columnas.entradas, columnas.salidas))
+        segundos = [0] * len(CATEGORIAS_HORAS)
+        for (tipo, tipo_siguiente, entrada, salida), cantidad in grupos.items():
+            for dia_tipo, tramos in zip((tipo, tipo_siguiente), _segundos_por_tramo(entrada, salida, standard_daily_hours)):
+                for tramo, seg in enumerate(tramos):
+                    segundos[dia_tipo * 4 + tramo] += seg * cantidad
+        return segundos
+
+    def _actualizar_totales(self, totales, cambiados):
+        """
+        Lleva los totales al estado actual. 'cambiados' son los días ordinales que pasaron de festivo a no festivo o
+        al revés desde la versión del calendario de los totales (en domingo no cambia nada: el domingo tiene
+        prioridad). Los totales corresponden a las jornadas anteriores a los cambios anotados y al calendario
+        anterior, así que primero se suman y restan esas jornadas con los tipos de día anteriores y luego se
+        mueven, en las jornadas actuales de los días cambiados, los segundos de esos días a su nueva categoría.
+        """
+        segundos = totales.segundos
+        standard_daily_hours = totales.standard_daily_hours
+        cambiados = {dia for dia in cambiados if _FECHAS_POR_ORDINAL[dia].weekday() != 6}
+
+        def tipo_actual(dia):
+            return self._tipo_dia(_FECHAS_POR_ORDINAL[dia])
+
+        def tipo_anterior(dia):
+            if dia in cambiados:
+                return TIPO_DIA_HABIL if tipo_actual(dia) == TIPO_DIA_FESTIVO else TIPO_DIA_FESTIVO
+            return tipo_actual(dia)
+
+        for signo, (ordinal, entrada, salida) in totales.cambios:
+            for dia, tramos in enumerate(_segundos_por_tramo(entrada, salida, standard_daily_hours)):
+                if any(tramos):
+                    indice = tipo_anterior(ordinal + dia) * 4
+                    for tramo, seg in enumerate(tramos):
+                        segundos[indice + tramo] += signo * seg
+        totales.cambios.clear()
+
+        columnas = totales.columnas
+        for dia in cambiados:
+            nuevo = tipo_actual(dia) * 4
+            anterior = tipo_anterior(dia) * 4
+            # Jornadas que empiezan ese día (su primera parte) y las del día anterior (la parte después de medianoche)
+            for ordinal, parte in ((dia, 0), (dia - 1, 1)):
+                desde = bisect.bisect_left(columnas.ordinales, ordinal)
+                hasta = bisect.bisect_right(columnas.ordinales, ordinal, desde)
+                for entrada, salida in zip(columnas.entradas[desde:hasta], columnas.salidas[desde:hasta]):
+                    for tramo, seg in enumerate(_segundos_por_tramo(entrada, salida, standard_daily_hours)[parte]):
+                        segundos[anterior + tramo] -= seg
+                        segundos[nuevo + tramo] += seg
+        totales.version_calendario = totales.calendario.version
+
+    def _segundos_jornada(self, jornada, standard_daily_hours):
+        """Segundos por categoría de una jornada (tupla de enteros), con caché. No depende de los porcentajes."""
+        clave = ("segundos", jornada["fecha"], jornada["hora_entrada"], jornada["hora_salida"], standard_daily_hours,
+                 self._calendario_festivos.version)
+        resultado = self._cache_jornadas.get(clave)
+        if resultado is not None:
+            self.cache_aciertos += 1
+            self._cache_jornadas.move_to_end(clave)
+            return resultado
+        self.cache_fallos += 1
+        resultado = tuple(self._segundos_por_categoria(jornada["fecha"], jornada["hora_entrada"], jornada["hora_salida"], standard_daily_hours)[0])
+        self._cache_jornadas[clave] = resultado
+        if len(self._cache_jornadas) > self.tamano_cache:
+            self._cache_jornadas.popitem(last=False)
+        return resultado
+
+    def _factores_exactos(self):
+        """Porcentajes adicionales de _factores_recargo() como enteros en centésimas de punto porcentual."""
+        return [int((decimal.Decimal(repr(factor)) * ESCALA_PORCENTAJES).quantize(1, decimal.ROUND_HALF_UP))
+                for factor in self._factores_recargo()]
+
+    def acumulados_exactos(self, empleado, jornadas=None):
+        """
+        Versión exacta de get_accumulated_hours_and_surcharges(): retorna (horas, recargos, valor bruto) con
+        valores Decimal. Cada jornada solo aporta segundos enteros por categoría; el dinero se calcula al final con
+        enteros a partir del salario en centavos y se redondea a centavos una vez por categoría. El valor bruto es
+        el valor base redondeado más la suma de los recargos ya redondeados, así que los totales siempre cuadran.
+        Las horas se entregan redondeadas a diezmilésimas.
+        """
+        if jornadas is None or jornadas is empleado.jornadas_registradas:
+            return self._valorizar_segundos(empleado.salario_mensual, self.segundos_totales(empleado))
+        return self._valorizar_segundos(empleado.salario_mensual, self._sumar_segundos(jornadas, empleado.standard_daily_hours))
+
+    def _sumar_segundos(self, jornadas, standard_daily_hours):
+        """Segundos por categoría de las jornadas: suma por columnas (categorías); con enteros la suma es exacta."""
+        segundos = [sum(columna) for columna in zip(*(self._segundos_jornada(j, standard_daily_hours) for j in jornadas))]
+        return segundos or [0] * len(CATEGORIAS_HORAS)
+
+    def _valorizar_segundos(self, salario_mensual, segundos):
+        salario_centavos = int((decimal.Decimal(repr(salario_mensual)) * 100).quantize(1, decimal.ROUND_HALF_UP))
+        if salario_centavos <= 0:
+            salario_centavos = 0
+        divisor = HORAS_MES_VALOR_HORA * 3600 * ESCALA_PORCENTAJES # segundos por hora y escala de los porcentajes
+
+        def centavos(numerador): # División entera redondeando la mitad hacia arriba (valores no negativos)
+            cociente, resto = divmod(numerador, divisor)
+            return cociente + (2 * resto >= divisor)
+
+        recargos = [centavos(seg * salario_centavos * factor) for seg, factor in zip(segundos, self._factores_exactos())]
+        valor_base = centavos(sum(segundos) * salario_centavos * ESCALA_PORCENTAJES)
+        acum_horas = {categoria: (decimal.Decimal(seg) / 3600).quantize(DIEZMILESIMA, decimal.ROUND_HALF_UP)
+                      for categoria, seg in zip(CATEGORIAS_HORAS, segundos)}
+        acum_recargos = {categoria: decimal.Decimal(c).scaleb(-2)
+                         for categoria, c in zip(CATEGORIAS_HORAS[1:], recargos[1:])}
+        return acum_horas, acum_recargos, decimal.Decimal(valor_base + sum(recargos)).scaleb(-2)
+
+    def acumulados_por_empleado(self, lista_empleados, periodo_inicio=None, periodo_fin=None, procesos=None,
+                                tamano_lote=TAMANO_LOTE_PROCESOS, exacto=False):
+        """
+        Entrega (empleado, jornadas del período, acumulados) en el orden de lista_empleados, donde acumulados es
+        el resultado de get_accumulated_hours_and_surcharges() (o de acumulados_exactos() si 'exacto') para esas
+        jornadas (None si no tiene jornadas). Con 'procesos' > 1 se calcula en paralelo como en
+        generar_reporte_consolidado.
+        """
+        jornadas_por_empleado = [empleado.jornadas_en_periodo(periodo_inicio, periodo_fin) for empleado in lista_empleados]
+        if procesos and procesos > 1:
+            acumulados = self._acumular_en_paralelo(lista_empleados, jornadas_por_empleado, procesos, tamano_lote, exacto)
+        else:
+            acumular = self.acumulados_exactos if exacto else self.get_accumulated_hours_and_surcharges
+            acumulados = (acumular(empleado, jornadas) if jornadas else None
+                          for empleado, jornadas in zip(lista_empleados, jornadas_por_empleado))
+        return zip(lista_empleados, jornadas_por_empleado, acumulados)
 
-            temp_jornada_horas = {key: 0.0 for key in acum_horas.keys()} # Horas para esta jornada
-            
-            while current_time < end_time:
-                next_hour = current_time + datetime.timedelta(hours=1)
-                if next_hour > end_time:
-                    next_hour = end_time
-                
-                duration = (next_hour - current_time).total_seconds() / 3600.0
-                
-                is_domingo_o_festivo = self.es_festivo_o_domingo(current_time.date())
-                
-                is_nocturno = (current_time.time() >= datetime.time(21, 0) or 
-                                current_time.time() < datetime.time(6, 0))
-
-                horas_trabajadas_en_dia += duration
-
-                if is_domingo_o_festivo:
-                    if current_time.date().weekday() == 6: # Es domingo
-                        if is_nocturno:
-                            if horas_trabajadas_en_dia <= empleado.standard_daily_hours:
-                                temp_jornada_horas["horas_ordinarias_nocturnas_domingo"] += duration
-                            else:
-                                temp_jornada_horas["horas_extras_nocturnas_domingo"] += duration
-                        else: # Diurno en domingo
-                            if horas_trabajadas_en_dia <= empleado.standard_daily_hours:
-                                temp_jornada_horas["horas_ordinarias_diurnas_domingo"] += duration
-                            else:
-                                temp_jornada_horas["horas_extras_diurnas_domingo"] += duration
-                    elif current_time.date() in self.dias_festivos: # Es festivo
-                        if is_nocturno:
-                            if horas_trabajadas_en_dia <= empleado.standard_daily_hours:
-                                temp_jornada_horas["horas_ordinarias_nocturnas_festivo"] += duration
-                            else:
-                                temp_jornada_horas["horas_extras_nocturnas_festivo"] += duration
-                        else: # Diurno en festivo
-                            if horas_trabajadas_en_dia <= empleado.standard_daily_hours:
-                                temp_jornada_horas["horas_ordinarias_diurnas_festivo"] += duration
-                            else:
-                                temp_jornada_horas["horas_extras_diurnas_festivo"] += duration
-                else: # Día hábil
-                    if is_nocturno:
-                        if horas_trabajadas_en_dia <= empleado.standard_daily_hours:
-                            temp_jornada_horas["horas_ordinarias_nocturnas"] += duration
-                        else:
-                            temp_jornada_horas["horas_extras_nocturnas"] += duration
-                    else: # Diurno en día hábil
-                        if horas_trabajadas_en_dia <= empleado.standard_daily_hours:
-                            temp_jornada_horas["horas_ordinarias_diurnas"] += duration
-                        else:
-                            temp_jornada_horas["horas_extras_diurnas"] += duration
-                
-                current_time = next_hour
-
-            # Acumular horas y calcular recargos para esta jornada
-            for key, hours in temp_jornada_horas.items():
-                if hours > 0:
-                    acum_horas[key] += hours
-                    
-                    # Calcular el valor del recargo adicional para cada tipo de hora
-                    if key == "horas_ordinarias_diurnas":
-                        # Estas horas no tienen recargo adicional, solo contribuyen al valor base total
-                        total_gross_value += hours * valor_hora_ordinaria
-                    elif key == "horas_ordinarias_nocturnas":
-                        surcharge_value = hours * valor_hora_ordinaria * self.ADDITIONAL_PERCENTAGE_DECIMAL_HORA_ORDINARIA_NOCTURNA
-                        acum_surcharge_values[key] += surcharge_value
-                        total_gross_value += (hours * valor_hora_ordinaria) + surcharge_value
-                    elif key == "horas_extras_diurnas":
-                        surcharge_value = hours * valor_hora_ordinaria * (self.MULTIPLIER_HORA_EXTRA_DIURNA - 1.0)
-                        acum_surcharge_values[key] += surcharge_value
-                        total_gross_value += hours * valor_hora_ordinaria * self.MULTIPLIER_HORA_EXTRA_DIURNA
-                    elif key == "horas_extras_nocturnas":
-                        surcharge_value = hours * valor_hora_ordinaria * (self.MULTIPLIER_HORA_EXTRA_NOCTURNA - 1.0)
-                        acum_surcharge_values[key] += surcharge_value
-                        total_gross_value += hours * valor_hora_ordinaria * self.MULTIPLIER_HORA_EXTRA_NOCTURNA
-                    elif key in ["horas_ordinarias_diurnas_domingo", "horas_ordinarias_diurnas_festivo"]:
-                        surcharge_value = hours * valor_hora_ordinaria * self.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_BASE
-                        acum_surcharge_values[key] += surcharge_value
-                        total_gross_value += (hours * valor_hora_ordinaria) + surcharge_value
-                    elif key in ["horas_ordinarias_nocturnas_domingo", "horas_ordinarias_nocturnas_festivo"]:
-                        surcharge_value = hours * valor_hora_ordinaria * self.ADDITIONAL_PERCENTAGE_DECIMAL_ORDINARIA_NOCTURNA_DOMINGOFESTIVO
-                        acum_surcharge_values[key] += surcharge_value
-                        total_gross_value += (hours * valor_hora_ordinaria) + surcharge_value
-                    elif key in ["horas_extras_diurnas_domingo", "horas_extras_diurnas_festivo"]:
-                        surcharge_value = hours * valor_hora_ordinaria * (self.MULTIPLIER_EXTRA_DIURNA_DOMINGOFESTIVO - 1.0)
-                        acum_surcharge_values[key] += surcharge_value
-                        total_gross_value += hours * valor_hora_ordinaria * self.MULTIPLIER_EXTRA_DIURNA_DOMINGOFESTIVO
-                    elif key in ["horas_extras_nocturnas_domingo", "horas_extras_nocturnas_festivo"]:
-                        surcharge_value = hours * valor_hora_ordinaria * (self.MULTIPLIER_EXTRA_NOCTURNA_DOMINGOFESTIVO - 1.0)
-                        acum_surcharge_values[key] += surcharge_value
-                        total_gross_value += hours * valor_hora_ordinaria * self.MULTIPLIER_EXTRA_NOCTURNA_DOMINGOFESTIVO
-        
-        return acum_horas, acum_surcharge_values, total_gross_value
+    def _acumular_en_paralelo(self, lista_empleados, jornadas_por_empleado, procesos, tamano_lote, exacto=False):
+        """
+        Calcula los acumulados (horas, recargos, valor bruto) de cada empleado en un ProcessPoolExecutor. A cada
+        proceso solo se envía la configuración de la calculadora y las jornadas en forma compacta; los resultados
+        vuelven en el mismo orden de lista_empleados (None para empleados sin jornadas).
+        """
+        config = self.exportar_configuracion()
+        trabajos = [(empleado.salario_mensual, empleado.standard_daily_hours,
+                     list(jornadas.tuplas()) if isinstance(jornadas, JornadasCompactas) else [_compactar_jornada(j) for j in jornadas])
+                    for empleado, jornadas in zip(lista_empleados, jornadas_por_empleado)]
+        lotes = [trabajos[i:i + tamano_lote] for i in range(0, len(trabajos), tamano_lote)]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=procesos) as executor:
+            resultados = executor.map(_acumular_lote_empleados, [config] * len(lotes), lotes, [exacto] * len(lotes))
+            return [acumulados for lote in resultados for acumulados in lote]
 
     def generar_reporte_empleado(self, empleado):
+        return "".join(self.secciones_reporte_empleado(empleado))
+
+    def secciones_reporte_empleado(self, empleado):
+        """Genera el reporte de un empleado por partes: encabezado, una sección por jornada y resumen."""
         reporte_str = f"--- Reporte de Horas para {empleado.nombre} ---\n"
         reporte_str += f"Horas Diarias Estándar: {empleado.standard_daily_hours} horas\n\n"
         reporte_str += "Detalle de Jornadas:\n"
@@ -424,12 +1142,17 @@ class CalculadoraRecargos:
 
         if not empleado.jornadas_registradas:
             reporte_str += "  No hay jornadas registradas para este empleado.\n"
+            yield reporte_str
         else:
+            yield reporte_str
+            valor_hora_ordinaria = empleado.obtener_valor_hora_ordinaria()
+            factores = self._factores_recargo()
             for i, jornada in enumerate(empleado.jornadas_registradas):
                 # No necesitamos el valor total de recargo ni los valores de recargo por categoría aquí
-                _, horas_categorizadas, total_horas_jornada = self.calcular_recargos_jornada(empleado, jornada)
+                horas, total_horas_jornada, _, _ = self._calcular_jornada(jornada, valor_hora_ordinaria, empleado.standard_daily_hours, factores)
+                horas_categorizadas = dict(zip(CATEGORIAS_HORAS, horas))
                 
-                reporte_str += f"\nJornada {i+1} - Fecha: {jornada['fecha'].strftime('%Y-%m-%d')} ({jornada['hora_entrada'].strftime('%I:%M %p')} - {jornada['hora_salida'].strftime('%I:%M %p')})\n"
+                reporte_str = f"\nJornada {i+1} - Fecha: {jornada['fecha'].strftime('%Y-%m-%d')} ({jornada['hora_entrada'].strftime('%I:%M %p')} - {jornada['hora_salida'].strftime('%I:%M %p')})\n"
                 reporte_str += f"  Total Horas Trabajadas: {total_horas_jornada:.2f}h\n"
                 reporte_str += "  Horas Categorizadas:\n"
 
@@ -481,16 +1204,34 @@ class CalculadoraRecargos:
                 reporte_str += f"  Horas con Recargo en Jornada: {jornada_horas_con_recargo:.2f}h\n"
                 total_horas_con_recargo_acumulado += jornada_horas_con_recargo
                 total_horas_ordinarias_diurnas_acumulado += horas_categorizadas["horas_ordinarias_diurnas"] # Asegurarse de sumar estas también para el total general
+                yield reporte_str
 
         total_todas_las_horas = total_horas_con_recargo_acumulado + total_horas_ordinarias_diurnas_acumulado
 
-        reporte_str += "\n--- Resumen General ---\n"
+        reporte_str = "\n--- Resumen General ---\n"
         reporte_str += f"Total Horas Acumuladas con Recargo: {total_horas_con_recargo_acumulado:.2f}h\n"
         reporte_str += f"Total de Todas las Horas Acumuladas (Recargo + Ordinarias Diurnas): {total_todas_las_horas:.2f}h\n"
         reporte_str += "-----------------------------------------------------\n"
-        return reporte_str
+        yield reporte_str
 
-    def generar_reporte_consolidado(self, lista_empleados, periodo_inicio=None, periodo_fin=None):
+    def generar_reporte_consolidado(self, lista_empleados, periodo_inicio=None, periodo_fin=None, procesos=None, tamano_lote=TAMANO_LOTE_PROCESOS,
+                                    progreso=None):
+        """
+        Genera el reporte consolidado de horas de todos los empleados.
+        Con 'procesos' > 1 los acumulados se calculan en paralelo en un ProcessPoolExecutor, repartiendo los
+        empleados en lotes de 'tamano_lote'; el texto resultante es idéntico al del cálculo secuencial.
+        Si se pasa 'progreso', en el cálculo secuencial se llama progreso(empleados_calculados, total) después de
+        cada empleado (la función puede lanzar una excepción para detener el reporte).
+        """
+        return "".join(self.secciones_reporte_consolidado(lista_empleados, periodo_inicio, periodo_fin, procesos, tamano_lote, progreso))
+
+    def secciones_reporte_consolidado(self, lista_empleados, periodo_inicio=None, periodo_fin=None, procesos=None, tamano_lote=TAMANO_LOTE_PROCESOS,
+                                      progreso=None):
+        """
+        Genera el reporte consolidado por partes: encabezado, una sección por empleado (en el orden de
+        lista_empleados) y resumen. En el cálculo secuencial cada empleado se calcula justo antes de entregar su
+        sección, así el primero está disponible de inmediato.
+        """
         reporte_str = "--- Reporte Consolidado de Horas ---\n"
         if periodo_inicio and periodo_fin:
             reporte_str += f"Período: {periodo_inicio.strftime('%Y-%m-%d')} a {periodo_fin.strftime('%Y-%m-%d')}\n"
@@ -507,114 +1248,143 @@ class CalculadoraRecargos:
 
         if not lista_empleados:
             reporte_str += "No hay empleados registrados.\n"
-            return reporte_str
-
-        for empleado in lista_empleados:
-            jornadas_filtradas = []
-            if periodo_inicio and periodo_fin:
-                for jornada in empleado.jornadas_registradas:
-                    if periodo_inicio <= jornada["fecha"] <= periodo_fin:
-                        jornadas_filtradas.append(jornada)
-            elif periodo_inicio: # Solo fecha de inicio
-                for jornada in empleado.jornadas_registradas:
-                    if jornada["fecha"] >= periodo_inicio:
-                        jornadas_filtradas.append(jornada)
-            elif periodo_fin: # Solo fecha de fin
-                for jornada in empleado.jornadas_registradas:
-                    if jornada["fecha"] <= periodo_fin:
-                        jornadas_filtradas.append(jornada)
-            else: # Sin filtro de período
-                jornadas_filtradas = empleado.jornadas_registradas
-
-            if not jornadas_filtradas:
-                reporte_str += f"Empleado: {empleado.nombre} - No hay jornadas en el período seleccionado.\n\n"
-                continue
-
-            # Crear un empleado temporal con solo las jornadas filtradas para el cálculo
-            temp_empleado = Empleado(empleado.nombre, empleado.salario_mensual, empleado.standard_daily_hours, empleado.tipo_contrato)
-            temp_empleado.jornadas_registradas = jornadas_filtradas
-
-            acum_horas, _, _ = self.get_accumulated_hours_and_surcharges(temp_empleado) # No necesitamos los valores de recargo ni el total bruto aquí
-
-            reporte_str += f"--- Empleado: {empleado.nombre} ---\n"
-            reporte_str += f"  Horas Diarias Estándar: {empleado.standard_daily_hours} horas\n"
-            reporte_str += "  Acumulados por Categoría:\n"
-
-            empleado_horas_con_recargo = 0.0
-            empleado_horas_ordinarias_diurnas = 0.0
-
-            display_names = {
-                "horas_ordinarias_diurnas": "Horas Ordinarias Diurnas",
-                "horas_ordinarias_nocturnas": "Horas Ordinarias Nocturnas",
-                "horas_extras_diurnas": "Horas Extras Diurnas",
-                "horas_extras_nocturnas": "Horas Extras Nocturnas",
-                "horas_ordinarias_diurnas_domingo": "Horas Ordinarias Diurnas Domingo",
-                "horas_ordinarias_nocturnas_domingo": "Horas Ordinarias Nocturnas Domingo",
-                "horas_extras_diurnas_domingo": "Horas Extras Diurnas Domingo",
-                "horas_extras_nocturnas_domingo": "Horas Extras Nocturnas Domingo",
-                "horas_ordinarias_diurnas_festivo": "Horas Ordinarias Diurnas Festivo",
-                "horas_ordinarias_nocturnas_festivo": "Horas Ordinarias Nocturnas Festivo",
-                "horas_extras_diurnas_festivo": "Horas Extras Diurnas Festivo",
-                "horas_extras_nocturnas_festivo": "Horas Extras Nocturnas Festivo",
-            }
-
-            # Sección para horas regulares
-            regular_keys = [
-                "horas_ordinarias_diurnas",
-                "horas_ordinarias_nocturnas",
-                "horas_extras_diurnas",
-                "horas_extras_nocturnas",
-            ]
-            for key in regular_keys:
-                hours = acum_horas.get(key, 0.0)
-                if hours > 0:
-                    reporte_str += f"    - {display_names[key]}: {hours:.2f}h\n"
-                    if key == "horas_ordinarias_diurnas":
-                        empleado_horas_ordinarias_diurnas += hours
-                    else:
-                        empleado_horas_con_recargo += hours
-            
-            # Sección para horas de Domingo
-            domingo_keys = [
-                "horas_ordinarias_diurnas_domingo",
-                "horas_ordinarias_nocturnas_domingo",
-                "horas_extras_diurnas_domingo",
-                "horas_extras_nocturnas_domingo",
-            ]
-            for key in domingo_keys:
-                hours = acum_horas.get(key, 0.0)
-                if hours > 0:
-                    reporte_str += f"    - {display_names[key]}: {hours:.2f}h\n"
-                    empleado_horas_con_recargo += hours
-
-            # Sección para horas de Festivo
-            festivo_keys = [
-                "horas_ordinarias_diurnas_festivo",
-                "horas_ordinarias_nocturnas_festivo",
-                "horas_extras_diurnas_festivo",
-                "horas_extras_nocturnas_festivo",
-            ]
-            for key in festivo_keys:
-                hours = acum_horas.get(key, 0.0)
-                if hours > 0:
-                    reporte_str += f"    - {display_names[key]}: {hours:.2f}h\n"
-                    empleado_horas_con_recargo += hours
-
-
-            total_empleado_horas = empleado_horas_con_recargo + empleado_horas_ordinarias_diurnas
+            yield reporte_str
+            return
+        yield reporte_str
+
+        jornadas_por_empleado = [empleado.jornadas_en_periodo(periodo_inicio, periodo_fin) for empleado in lista_empleados]
+        if procesos and procesos > 1:
+            acumulados = [acum[0] if acum else None
+                          for acum in self._acumular_en_paralelo(lista_empleados, jornadas_por_empleado, procesos, tamano_lote)]
+        else:
+            acumulados = self._acumular_secuencial(lista_empleados, jornadas_por_empleado, progreso)
 
-            reporte_str += f"  Total Horas Acumuladas con Recargo para {empleado.nombre}: {empleado_horas_con_recargo:.2f}h\n"
-            reporte_str += f"  Total de Todas las Horas Acumuladas para {empleado.nombre}: {total_empleado_horas:.2f}h\n\n"
-            
+        for empleado, acum_horas in zip(lista_empleados, acumulados):
+            reporte_str, empleado_horas_con_recargo, total_empleado_horas = self._seccion_reporte_consolidado(empleado, acum_horas)
             total_general_horas_con_recargo += empleado_horas_con_recargo
             total_general_todas_las_horas += total_empleado_horas
+            yield reporte_str
 
-        reporte_str += "--- Resumen General Consolidado ---\n"
+        reporte_str = "--- Resumen General Consolidado ---\n"
         reporte_str += f"Total General de Horas Acumuladas con Recargo: {total_general_horas_con_recargo:.2f}h\n"
         reporte_str += f"Total General de Todas las Horas Acumuladas (Recargo + Ordinarias): {total_general_todas_las_horas:.2f}h\n"
         reporte_str += "-----------------------------------------------------\n"
+        yield reporte_str
+
+    def _acumular_secuencial(self, lista_empleados, jornadas_por_empleado, progreso=None):
+        """Entrega las horas acumuladas de cada empleado a medida que se calculan (None si no tiene jornadas)."""
+        for i, (empleado, jornadas) in enumerate(zip(lista_empleados, jornadas_por_empleado)):
+            # No necesitamos los valores de recargo ni el total bruto aquí
+            yield self.get_accumulated_hours_and_surcharges(empleado, jornadas)[0] if jornadas else None
+            if progreso is not None:
+                progreso(i + 1, len(lista_empleados))
+
+    def _seccion_reporte_consolidado(self, empleado, acum_horas):
+        """Retorna (texto, horas con recargo, total de horas) de un empleado en el reporte consolidado."""
+        if acum_horas is None:
+            return f"Empleado: {empleado.nombre} - No hay jornadas en el período seleccionado.\n\n", 0.0, 0.0
+
+        reporte_str = f"--- Empleado: {empleado.nombre} ---\n"
+        reporte_str += f"  Horas Diarias Estándar: {empleado.standard_daily_hours} horas\n"
+        reporte_str += "  Acumulados por Categoría:\n"
+
+        empleado_horas_con_recargo = 0.0
+        empleado_horas_ordinarias_diurnas = 0.0
+
+        display_names = {
+            "horas_ordinarias_diurnas": "Horas Ordinarias Diurnas",
+            "horas_ordinarias_nocturnas": "Horas Ordinarias Nocturnas",
+            "horas_extras_diurnas": "Horas Extras Diurnas",
+            "horas_extras_nocturnas": "Horas Extras Nocturnas",
+            "horas_ordinarias_diurnas_domingo": "Horas Ordinarias Diurnas Domingo",
+            "horas_ordinarias_nocturnas_domingo": "Horas Ordinarias Nocturnas Domingo",
+            "horas_extras_diurnas_domingo": "Horas Extras Diurnas Domingo",
+            "horas_extras_nocturnas_domingo": "Horas Extras Nocturnas Domingo",
+            "horas_ordinarias_diurnas_festivo": "Horas Ordinarias Diurnas Festivo",
+            "horas_ordinarias_nocturnas_festivo": "Horas Ordinarias Nocturnas Festivo",
+            "horas_extras_diurnas_festivo": "Horas Extras Diurnas Festivo",
+            "horas_extras_nocturnas_festivo": "Horas Extras Nocturnas Festivo",
+        }
+
+        # Sección para horas regulares
+        regular_keys = [
+            "horas_ordinarias_diurnas",
+            "horas_ordinarias_nocturnas",
+            "horas_extras_diurnas",
+            "horas_extras_nocturnas",
+        ]
+        for key in regular_keys:
+            hours = acum_horas.get(key, 0.0)
+            if hours > 0:
+                reporte_str += f"    - {display_names[key]}: {hours:.2f}h\n"
+                if key == "horas_ordinarias_diurnas":
+                    empleado_horas_ordinarias_diurnas += hours
+                else:
+                    empleado_horas_con_recargo += hours
+        
+        # Sección para horas de Domingo
+        domingo_keys = [
+            "horas_ordinarias_diurnas_domingo",
+            "horas_ordinarias_nocturnas_domingo",
+            "horas_extras_diurnas_domingo",
+            "horas_extras_nocturnas_domingo",
+        ]
+        for key in domingo_keys:
+            hours = acum_horas.get(key, 0.0)
+            if hours > 0:
+                reporte_str += f"    - {display_names[key]}: {hours:.2f}h\n"
+                empleado_horas_con_recargo += hours
+
+        # Sección para horas de Festivo
+        festivo_keys = [
+            "horas_ordinarias_diurnas_festivo",
+            "horas_ordinarias_nocturnas_festivo",
+            "horas_extras_diurnas_festivo",
+            "horas_extras_nocturnas_festivo",
+        ]
+        for key in festivo_keys:
+            hours = acum_horas.get(key, 0.0)
+            if hours > 0:
+                reporte_str += f"    - {display_names[key]}: {hours:.2f}h\n"
+                empleado_horas_con_recargo += hours
+
+
+        total_empleado_horas = empleado_horas_con_recargo + empleado_horas_ordinarias_diurnas
 
-        return reporte_str
+        reporte_str += f"  Total Horas Acumuladas con Recargo para {empleado.nombre}: {empleado_horas_con_recargo:.2f}h\n"
+        reporte_str += f"  Total de Todas las Horas Acumuladas para {empleado.nombre}: {total_empleado_horas:.2f}h\n\n"
+        return reporte_str, empleado_horas_con_recargo, total_empleado_horas
+
+    def exportar_configuracion(self):
+        """Retorna la configuración de porcentajes y festivos manuales como un diccionario serializable (JSON)."""
+        config = {campo: getattr(self, campo) for campo in CAMPOS_CONFIGURACION}
+        # Solo se guardan los cambios manuales; el resto de festivos se genera por regla
+        config["festivos_agregados"] = sorted(d.isoformat() for d in self.dias_festivos.agregados)
+        config["festivos_eliminados"] = sorted(d.isoformat() for d in self.dias_festivos.eliminados)
+        return config
+
+    def copiar(self):
+        """
+        Retorna una calculadora nueva con la misma configuración (porcentajes y festivos manuales) y sus propias
+        cachés, para usarla desde otro hilo sin compartir el calendario de festivos.
+        """
+        copia = CalculadoraRecargos()
+        copia.cargar_configuracion(self.exportar_configuracion())
+        return copia
+
+    def cargar_configuracion(self, config):
+        """Aplica una configuración producida por exportar_configuracion() (o por versiones anteriores)."""
+        for campo in CAMPOS_CONFIGURACION:
+            if campo in config:
+                setattr(self, campo, config[campo])
+
+        if "festivos_agregados" in config or "festivos_eliminados" in config:
+            self.dias_festivos.establecer_cambios_manuales(
+                [datetime.date.fromisoformat(d) for d in config.get("festivos_agregados", [])],
+                [datetime.date.fromisoformat(d) for d in config.get("festivos_eliminados", [])])
+        elif "dias_festivos" in config: # Formato anterior: lista completa de festivos
+            self.dias_festivos = [datetime.date.fromisoformat(d) for d in config["dias_festivos"]]
+        self._porcentajes_modificados()
 
     def actualizar_porcentajes_recargo(self, nuevo_extra_diurna=None, nuevo_extra_nocturna=None,
                                         nuevo_extra_diurna_domingofestivo=None, nuevo_extra_nocturna_domingofestivo=None,
@@ -643,79 +1413,183 @@ class CalculadoraRecargos:
         if nuevo_recargo_domingofestivo_nocturno_larga_jornada_recargo is not None:
             self.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_NOCTURNO_LARGA_JORNADA = nuevo_recargo_domingofestivo_nocturno_larga_jornada_recargo / 100.0
 
+        self._porcentajes_modificados()
         return "Porcentajes de recargo actualizados con éxito."
 
 
-def save_app_data(empleados, calculadora, filename="app_data.json"):
+def _compactar_jornada(jornada):
+    """
+    Representa una jornada como (día ordinal, segundo de entrada, segundo de salida): la forma en que la guarda
+    JornadasCompactas y en que se envía a otro proceso.
+    """
+    entrada, salida = jornada["hora_entrada"], jornada["hora_salida"]
+    return (jornada["fecha"].toordinal(),
+            entrada.hour * 3600 + entrada.minute * 60 + entrada.second,
+            salida.hour * 3600 + salida.minute * 60 + salida.second)
+
+
+def _expandir_jornada(compacta):
+    ordinal, entrada, salida = compacta
+    return {
+        "fecha": _FECHAS_POR_ORDINAL[ordinal],
+        "hora_entrada": _HORAS_POR_SEGUNDO[entrada],
+        "hora_salida": _HORAS_POR_SEGUNDO[salida],
+    }
+
+
+def _acumular_lote_empleados(config, lote, exacto=False):
+    """Tarea de un proceso de _acumular_en_paralelo: acumulados (horas, recargos, valor bruto) de un lote de empleados."""
+    calculadora = CalculadoraRecargos()
+    calculadora.cargar_configuracion(config)
+    resultados = []
+    for salario_mensual, standard_daily_hours, jornadas in lote:
+        if not jornadas:
+            resultados.append(None)
+            continue
+        # Las jornadas recibidas pasan a ser las del empleado temporal: se acumulan por el mismo camino que el
+        # cálculo secuencial sin período (segundos_totales, con las jornadas agrupadas por horario)
+        empleado = Empleado("", salario_mensual, standard_daily_hours)
+        empleado.jornadas_registradas = JornadasCompactas.desde_tuplas(jornadas)
+        acumular = calculadora.acumulados_exactos if exacto else calculadora.get_accumulated_hours_and_surcharges
+        resultados.append(acumular(empleado))
+    return resultados
+
+
+def _jornada_a_json(jornada):
+    return {
+        "fecha": jornada["fecha"].isoformat(),
+        "hora_entrada": jornada["hora_entrada"].isoformat(),
+        "hora_salida": jornada["hora_salida"].isoformat()
+    }
+
+
+def _jornada_desde_json(j):
+    return {
+        "fecha": datetime.date.fromisoformat(j["fecha"]),
+        "hora_entrada": datetime.time.fromisoformat(j["hora_entrada"]),
+        "hora_salida": datetime.time.fromisoformat(j["hora_salida"])
+    }
+
+
+def _jornadas_compactas_a_json(jornadas):
+    # Una lista [día ordinal, segundo de entrada, segundo de salida] por jornada
+    if not isinstance(jornadas, JornadasCompactas):
+        jornadas = JornadasCompactas(jornadas)
+    return list(jornadas.tuplas())
+
+
+def _jornadas_compactas_desde_json(tripletas):
+    """Convierte las tripletas de 'jornadas_compactas' en una JornadasCompactas. Lanza ValueError si son inválidas."""
+    if tripletas and set(map(len, tripletas)) != {3}:
+        raise ValueError("cada jornada debe tener día, entrada y salida")
+    try:
+        valores = array.array("i", itertools.chain.from_iterable(tripletas))
+    except (TypeError, OverflowError) as e:
+        raise ValueError(str(e))
+    jornadas = JornadasCompactas()
+    jornadas.ordinales, jornadas.entradas, jornadas.salidas = valores[0::3], valores[1::3], valores[2::3]
+    if jornadas and (min(jornadas.ordinales) < 1 or min(jornadas.entradas) < 0 or min(jornadas.salidas) < 0
+                     or max(jornadas.entradas) >= SEGUNDOS_DIA or max(jornadas.salidas) >= SEGUNDOS_DIA):
+        raise ValueError("día u hora fuera de rango")
+    return jornadas
+
+
+def _codificar_json_compacto(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _leer_json(f):
+    contenido = f.read()
+    # El resultado crea muchas listas y diccionarios sin referencias circulares: se pausa el recolector de ciclos
+    # para que no recorra una y otra vez los objetos ya creados mientras se lee
+    recolector_activo = gc.isenabled()
+    gc.disable()
+    try:
+        if orjson is not None:
+            try:
+                return orjson.loads(contenido)
+            except orjson.JSONDecodeError:
+                pass # Se deja que el módulo json informe el error (o acepte lo que orjson no acepta, como NaN)
+        return json.loads(contenido)
+    finally:
+        if recolector_activo:
+            gc.enable()
+
+
+def save_app_data(empleados, calculadora, filename="app_data.json", generacion_diario=None, compacto=False):
+    """
+    Guarda los empleados y la configuración de la calculadora. Con 'compacto' el archivo se escribe sin sangría y
+    las jornadas de cada empleado van en 'jornadas_compactas' como listas [día ordinal, segundo de entrada,
+    segundo de salida] en lugar de diccionarios con fechas y horas en texto; si orjson está instalado se usa
+    para escribirlo. load_app_data lee ambos formatos. Si no se puede guardar lanza OSError y el archivo anterior
+    queda intacto.
+    """
     data = {
         "empleados": {},
-        "calculadora_config": {
-            "MULTIPLIER_HORA_EXTRA_DIURNA": calculadora.MULTIPLIER_HORA_EXTRA_DIURNA,
-            "MULTIPLIER_HORA_EXTRA_NOCTURNA": calculadora.MULTIPLIER_HORA_EXTRA_NOCTURNA,
-            "MULTIPLIER_EXTRA_DIURNA_DOMINGOFESTIVO": calculadora.MULTIPLIER_EXTRA_DIURNA_DOMINGOFESTIVO,
-            "MULTIPLIER_EXTRA_NOCTURNA_DOMINGOFESTIVO": calculadora.MULTIPLIER_EXTRA_NOCTURNA_DOMINGOFESTIVO,
-            "ADDITIONAL_PERCENTAGE_DECIMAL_HORA_ORDINARIA_NOCTURNA": calculadora.ADDITIONAL_PERCENTAGE_DECIMAL_HORA_ORDINARIA_NOCTURNA,
-            "ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_BASE": calculadora.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_BASE,
-            "ADDITIONAL_PERCENTAGE_DECIMAL_ORDINARIA_NOCTURNA_DOMINGOFESTIVO": calculadora.ADDITIONAL_PERCENTAGE_DECIMAL_ORDINARIA_NOCTURNA_DOMINGOFESTIVO,
-            "ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_LARGA_JORNADA": calculadora.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_LARGA_JORNADA,
-            "ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_NOCTURNO_LARGA_JORNADA": calculadora.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_NOCTURNO_LARGA_JORNADA,
-            "dias_festivos": [d.isoformat() for d in calculadora.dias_festivos]
-        }
+        "calculadora_config": calculadora.exportar_configuracion()
     }
+    if generacion_diario is not None:
+        # Solo se reproducirá el diario de esta generación (ver DiarioCambios)
+        data["generacion_diario"] = generacion_diario
     for nombre, empleado in empleados.items():
         data["empleados"][nombre] = {
             "nombre": empleado.nombre,
             "salario_mensual": empleado.salario_mensual,
             "standard_daily_hours": empleado.standard_daily_hours,
             "tipo_contrato": empleado.tipo_contrato, # Guardar el tipo_contrato
-            "jornadas_registradas": [
-                {
-                    "fecha": j["fecha"].isoformat(),
-                    "hora_entrada": j["hora_entrada"].isoformat(),
-                    "hora_salida": j["hora_salida"].isoformat()
-                } for j in empleado.jornadas_registradas
-            ]
         }
+        if compacto:
+            data["empleados"][nombre]["jornadas_compactas"] = _jornadas_compactas_a_json(empleado.jornadas_registradas)
+        else:
+            data["empleados"][nombre]["jornadas_registradas"] = [_jornada_a_json(j) for j in empleado.jornadas_registradas]
+    # Se escribe en un archivo temporal que luego reemplaza al original: si la escritura se interrumpe, el archivo
+    # anterior queda intacto
+    temporal = filename + ".tmp"
     try:
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=4)
-        print(f"Datos de la aplicación guardados en {filename}")
+        if compacto:
+            with open(temporal, 'wb') as f:
+                f.write(_codificar_json_compacto(data))
+                f.flush()
+                os.fsync(f.fileno())
+        else:
+            with open(temporal, 'w') as f:
+                json.dump(data, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temporal, filename)
     except IOError as e:
         print(f"Error al guardar los datos: {e}")
-
-def load_app_data(filename="app_data.json"):
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        raise
+    print(f"Datos de la aplicación guardados en {filename}")
+
+def load_app_data(filename="app_data.json", diario=None, solo_lectura=False):
+    """
+    Carga los empleados y la configuración de la calculadora, en el formato normal o en el compacto (ver
+    save_app_data). Si existe un diario de cambios (DiarioCambios) de la misma generación que el archivo, sus
+    cambios se reproducen encima, recuperando lo registrado después de la última compactación (por ejemplo, si
+    la aplicación se cerró inesperadamente). Con 'solo_lectura' no se modifica ningún archivo y, si el archivo o
+    su diario no se pueden leer, se lanza OSError o ValueError en lugar de continuar con datos incompletos.
+    """
     empleados = {}
     calculadora = CalculadoraRecargos() # Inicializar con valores por defecto
+    generacion = 0
+    compacto = False
     
     if os.path.exists(filename):
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
+            with open(filename, 'rb') as f:
+                data = _leer_json(f)
             
+            generacion = data.get("generacion_diario", 0)
+
             # Cargar configuración de la calculadora
-            config = data.get("calculadora_config", {})
-            if "MULTIPLIER_HORA_EXTRA_DIURNA" in config:
-                calculadora.MULTIPLIER_HORA_EXTRA_DIURNA = config["MULTIPLIER_HORA_EXTRA_DIURNA"]
-            if "MULTIPLIER_HORA_EXTRA_NOCTURNA" in config:
-                calculadora.MULTIPLIER_HORA_EXTRA_NOCTURNA = config["MULTIPLIER_HORA_EXTRA_NOCTURNA"]
-            if "MULTIPLIER_EXTRA_DIURNA_DOMINGOFESTIVO" in config:
-                calculadora.MULTIPLIER_EXTRA_DIURNA_DOMINGOFESTIVO = config["MULTIPLIER_EXTRA_DIURNA_DOMINGOFESTIVO"]
-            if "MULTIPLIER_EXTRA_NOCTURNA_DOMINGOFESTIVO" in config:
-                calculadora.MULTIPLIER_EXTRA_NOCTURNA_DOMINGOFESTIVO = config["MULTIPLIER_EXTRA_NOCTURNA_DOMINGOFESTIVO"]
-            
-            if "ADDITIONAL_PERCENTAGE_DECIMAL_HORA_ORDINARIA_NOCTURNA" in config:
-                calculadora.ADDITIONAL_PERCENTAGE_DECIMAL_HORA_ORDINARIA_NOCTURNA = config["ADDITIONAL_PERCENTAGE_DECIMAL_HORA_ORDINARIA_NOCTURNA"]
-            if "ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_BASE" in config:
-                calculadora.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_BASE = config["ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_BASE"]
-            if "ADDITIONAL_PERCENTAGE_DECIMAL_ORDINARIA_NOCTURNA_DOMINGOFESTIVO" in config:
-                calculadora.ADDITIONAL_PERCENTAGE_DECIMAL_ORDINARIA_NOCTURNA_DOMINGOFESTIVO = config["ADDITIONAL_PERCENTAGE_DECIMAL_ORDINARIA_NOCTURNA_DOMINGOFESTIVO"]
-            if "ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_LARGA_JORNADA" in config:
-                calculadora.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_LARGA_JORNADA = config["ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_DIURNO_LARGA_JORNADA"]
-            if "ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_NOCTURNO_LARGA_JORNADA" in config:
-                calculadora.ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_NOCTURNO_LARGA_JORNADA = config["ADDITIONAL_PERCENTAGE_DECIMAL_RECARGO_DOMINGOFESTIVO_NOCTURNO_LARGA_JORNADA"]
-
-            if "dias_festivos" in config:
-                calculadora.dias_festivos = sorted([datetime.date.fromisoformat(d) for d in config["dias_festivos"]])
+            calculadora.cargar_configuracion(data.get("calculadora_config", {}))
 
             # Cargar empleados de forma más segura
             for nombre_empleado_key, emp_data in data.get("empleados", {}).items():
@@ -731,20 +1605,25 @@ def load_app_data(filename="app_data.json"):
                         continue # Saltar esta entrada si faltan datos esenciales
 
                     empleado = Empleado(nombre, salario_mensual, standard_daily_hours, tipo_contrato)
-                    
-                    jornadas_raw = emp_data.get("jornadas_registradas", [])
-                    empleado.jornadas_registradas = []
-                    for j in jornadas_raw:
+
+                    if "jornadas_compactas" in emp_data: # Formato compacto
+                        compacto = True
                         try:
-                            jornada_parsed = {
-                                "fecha": datetime.date.fromisoformat(j["fecha"]),
-                                "hora_entrada": datetime.time.fromisoformat(j["hora_entrada"]),
-                                "hora_salida": datetime.time.fromisoformat(j["hora_salida"])
-                            }
-                            empleado.jornadas_registradas.append(jornada_parsed)
-                        except (KeyError, ValueError) as je:
-                            print(f"Advertencia: Jornada mal formada para empleado {nombre}. Saltando jornada: {j}. Error: {je}")
-                            continue
+                            jornadas = _jornadas_compactas_desde_json(emp_data["jornadas_compactas"])
+                        except (TypeError, ValueError) as je:
+                            print(f"Advertencia: Jornadas mal formadas para empleado {nombre}. Se omiten sus jornadas. Error: {je}")
+                            jornadas = JornadasCompactas()
+                        empleado.jornadas_registradas = jornadas
+                    else:
+                        jornadas_raw = emp_data.get("jornadas_registradas", [])
+                        jornadas = []
+                        for j in jornadas_raw:
+                            try:
+                                jornadas.append(_jornada_desde_json(j))
+                            except (KeyError, ValueError) as je:
+                                print(f"Advertencia: Jornada mal formada para empleado {nombre}. Saltando jornada: {j}. Error: {je}")
+                                continue
+                        empleado.jornadas_registradas = jornadas # Se ordenan por fecha una sola vez
 
                     empleados[nombre] = empleado
                 except (KeyError, ValueError) as e:
@@ -753,8 +1632,377 @@ def load_app_data(filename="app_data.json"):
 
             print(f"Datos de la aplicación cargados desde {filename}")
         except (IOError, json.JSONDecodeError) as e:
+            if solo_lectura:
+                raise
             print(f"Error al cargar los datos del archivo {filename}: {e}. Se iniciará con datos vacíos.")
     else:
         print(f"Archivo {filename} no encontrado. Se iniciará con datos vacíos.")
+
+    aplicados = _reproducir_diario(filename + ".journal", generacion, empleados, calculadora, solo_lectura)
+    if diario is not None:
+        diario.vincular(empleados, calculadora, generacion, aplicados, compacto)
     
     return empleados, calculadora
+
+
+def _aplicar_cambio(cambio, empleados, calculadora):
+    """Aplica a los datos en memoria un cambio escrito por DiarioCambios."""
+    operacion = cambio["op"]
+    if operacion == "empleado": # Alta o actualización de los datos básicos
+        empleado = empleados.get(cambio["nombre"])
+        if empleado is None:
+            empleados[cambio["nombre"]] = Empleado(cambio["nombre"], cambio["salario_mensual"], cambio["standard_daily_hours"], cambio["tipo_contrato"])
+        else:
+            empleado.salario_mensual = cambio["salario_mensual"]
+            empleado.standard_daily_hours = cambio["standard_daily_hours"]
+            empleado.tipo_contrato = cambio["tipo_contrato"]
+    elif operacion == "renombrar_empleado":
+        anterior = empleados.pop(cambio["nombre"])
+        nuevo = Empleado(cambio["nuevo_nombre"], anterior.salario_mensual, anterior.standard_daily_hours, anterior.tipo_contrato)
+        nuevo.jornadas_registradas = anterior.jornadas_registradas
+        empleados[nuevo.nombre] = nuevo
+    elif operacion == "eliminar_empleado":
+        empleados.pop(cambio["nombre"], None)
+    elif operacion == "jornada":
+        empleados[cambio["nombre"]].insertar_jornada(_jornada_desde_json(cambio["jornada"]))
+    elif operacion == "jornadas": # Varias jornadas de un empleado a la vez (importación)
+        empleados[cambio["nombre"]].agregar_jornadas(_jornada_desde_json(j) for j in cambio["jornadas"])
+    elif operacion == "reemplazar_jornada":
+        empleado = empleados[cambio["nombre"]]
+        indice = empleado.buscar_jornada(_jornada_desde_json(cambio["anterior"]))
+        if indice is not None:
+            empleado.reemplazar_jornada(indice, _jornada_desde_json(cambio["jornada"]))
+    elif operacion == "eliminar_jornada":
+        empleado = empleados[cambio["nombre"]]
+        indice = empleado.buscar_jornada(_jornada_desde_json(cambio["jornada"]))
+        if indice is not None:
+            empleado.eliminar_jornada(indice)
+    elif operacion == "configuracion":
+        calculadora.cargar_configuracion(cambio["config"])
+    else:
+        raise ValueError(f"Operación desconocida en el diario: {operacion}")
+
+
+def _reproducir_diario(ruta, generacion, empleados, calculadora, solo_lectura=False):
+    """
+    Reproduce el diario 'ruta' si pertenece a 'generacion'. Retorna el número de cambios aplicados, o None si no se
+    usó. Con 'solo_lectura' el diario no se recorta y un error de lectura se lanza en lugar de ignorar el diario.
+    """
+    if not os.path.exists(ruta):
+        return None
+    aplicados = 0
+    try:
+        with open(ruta, 'rb' if solo_lectura else 'rb+') as f:
+            encabezado = json.loads(f.readline() or b"{}")
+            if encabezado.get("generacion_diario") != generacion:
+                # Diario de una compactación anterior cuyos cambios ya están en el archivo principal
+                return None
+            posicion = f.tell()
+            for linea in iter(f.readline, b""):
+                try:
+                    if not linea.endswith(b"\n"):
+                        raise ValueError("línea incompleta")
+                    cambio = json.loads(linea)
+                except ValueError:
+                    # Última línea incompleta (la aplicación se cerró mientras se escribía): se descarta
+                    # y se recorta el diario para que los cambios siguientes no queden detrás de ella
+                    print(f"Advertencia: Se descartó una entrada incompleta del diario {ruta}.")
+                    if not solo_lectura:
+                        f.truncate(posicion)
+                    break
+                posicion = f.tell()
+                try:
+                    _aplicar_cambio(cambio, empleados, calculadora)
+                    aplicados += 1
+                except (KeyError, ValueError) as e:
+                    print(f"Advertencia: No se pudo aplicar un cambio del diario: {cambio}. Error: {e}")
+    except (IOError, json.JSONDecodeError) as e:
+        if solo_lectura:
+            raise
+        print(f"Error al leer el diario {ruta}: {e}.")
+        return None
+    if aplicados:
+        print(f"Se recuperaron {aplicados} cambios del diario {ruta}")
+    return aplicados
+
+
+class DiarioCambios:
+    """
+    Diario de cambios (write-ahead log) de app_data.json. Cada modificación se agrega como una línea JSON a
+    '<archivo>.journal', de modo que guardar un cambio cuesta lo mismo sin importar el tamaño de los datos.
+    Cada 'max_cambios' cambios (y en compactar()) se reescribe el archivo principal con todos los datos y se
+    empieza un diario nuevo. El archivo principal guarda la generación del diario que le corresponde, así un
+    diario viejo (por ejemplo, si la aplicación se cerró durante la compactación) nunca se aplica dos veces.
+    Con compacto=True (o False) el archivo principal se guarda en el formato compacto (o el normal) de
+    save_app_data; por defecto se conserva el formato del archivo cargado. Si el diario no se puede escribir,
+    registrar() guarda todos los datos en el archivo principal y, si tampoco puede, lanza OSError.
+
+    Con segundo_plano=True los cambios se escriben en un hilo aparte: registrar() solo los pone en cola, y el
+    hilo espera a que pasen 'espera' segundos sin cambios nuevos (como máximo ESPERA_MAXIMA_GUARDADO desde el
+    primero) para escribirlos todos con una sola sincronización a disco. Las compactaciones también se escriben
+    en ese hilo, a partir de una copia de los datos tomada al pedirlas. vaciar() espera a que todo lo pendiente
+    esté en disco y cerrar() además detiene el hilo; debe llamarse antes de terminar la aplicación. Si el hilo no
+    pudo escribir algo, vaciar() y cerrar() lanzan ese error (OSError).
+
+    Uso:
+        diario = DiarioCambios()
+        empleados, calculadora = diario.cargar()
+        ...
+        empleado.registrar_jornada(...)
+        diario.jornada_registrada(empleado, jornada)
+    """
+
+    def __init__(self, filename="app_data.json", max_cambios=TAMANO_MAXIMO_DIARIO, compacto=None,
+                 segundo_plano=False, espera=ESPERA_GUARDADO):
+        self.filename = filename
+        self.ruta_diario = filename + ".journal"
+        self.max_cambios = max_cambios
+        # Formato del archivo principal (ver save_app_data). None: el mismo del archivo cargado
+        self.compacto = compacto
+        self.segundo_plano = segundo_plano
+        self.espera = espera
+        self.empleados = None
+        self.calculadora = None
+        self.generacion = 0
+        self.cambios = 0 # Cambios en el diario actual
+        # Estado del archivo de diario en disco; en segundo plano solo lo usa el hilo de escritura
+        self._archivo = None
+        self._diario_valido = False
+        self._generacion_diario = 0 # Generación escrita en el encabezado del diario
+        # Cola del hilo de escritura: ("cambio", cambio) o ("compactar", empleados, calculadora, generacion)
+        self._pendientes = collections.deque()
+        self._condicion = threading.Condition()
+        self._hilo = None
+        self._escribiendo = False
+        self._vaciar = False
+        self._detener = False
+        self._ultimo_encolado = 0.0
+        self._error = None # Último error del hilo de escritura, que se lanza en vaciar()
+
+    def cargar(self):
+        """Carga los datos (reproduciendo el diario) y los asocia a este diario."""
+        return load_app_data(self.filename, diario=self)
+
+    def vincular(self, empleados, calculadora, generacion=0, cambios=None, compacto=False):
+        """Asocia el diario a los datos cargados. Lo llama load_app_data(diario=...)."""
+        if self.compacto is None:
+            self.compacto = compacto
+        self.empleados = empleados
+        self.calculadora = calculadora
+        self.generacion = generacion
+        self._generacion_diario = generacion
+        self._diario_valido = cambios is not None # El diario existente pertenece a esta generación
+        self.cambios = cambios or 0
+
+    def _abrir(self):
+        if self._archivo is None:
+            if self._diario_valido:
+                self._archivo = open(self.ruta_diario, 'a', encoding='utf-8')
+            else:
+                self._archivo = open(self.ruta_diario, 'w', encoding='utf-8')
+                self._archivo.write(json.dumps({"generacion_diario": self._generacion_diario}) + "\n")
+                self._diario_valido = True
+        return self._archivo
+
+    def _escribir(self, cambios):
+        archivo = self._abrir()
+        archivo.write("".join(json.dumps(cambio, ensure_ascii=False) + "\n" for cambio in cambios))
+        archivo.flush()
+        os.fsync(archivo.fileno()) # Los cambios quedan en disco antes de continuar
+
+    def _cerrar_archivo(self):
+        if self._archivo is not None:
+            archivo, self._archivo = self._archivo, None # Aunque close() falle, el archivo queda cerrado
+            archivo.close()
+
+    def registrar(self, cambio):
+        """
+        Agrega un cambio (ver _aplicar_cambio) al diario y compacta si el diario creció demasiado. Si el diario no
+        se puede escribir se guardan todos los datos con compactar(); si tampoco se puede, lanza OSError.
+        """
+        self.registrar_varios([cambio])
+
+    def registrar_varios(self, cambios):
+        """Como registrar(), con varios cambios que se escriben juntos (una sola sincronización a disco)."""
+        if not cambios:
+            return
+        if self.segundo_plano:
+            for cambio in cambios:
+                self._encolar(("cambio", cambio))
+        else:
+            try:
+                self._escribir(cambios)
+            except OSError:
+                # Los datos en memoria ya incluyen los cambios: se guardan completos en el archivo principal, que
+                # empieza un diario nuevo. Si eso también falla, el error llega a quien registró los cambios
+                try:
+                    self._cerrar_archivo()
+                except OSError:
+                    pass
+                self.compactar()
+                return
+        self.cambios += len(cambios)
+        if self.cambios >= self.max_cambios:
+            try:
+                self.compactar()
+            except IOError:
+                pass # El cambio ya está en el diario; se intentará compactar de nuevo con el siguiente
+
+    def compactar(self):
+        """
+        Guarda todos los datos en el archivo principal y empieza un diario vacío. Si no se puede guardar lanza
+        OSError y el diario actual se conserva (sus cambios se siguen recuperando al cargar).
+        """
+        if self.segundo_plano:
+            self.generacion += 1
+            self.cambios = 0
+            # Copia de los datos en su estado actual: la interfaz puede seguir modificándolos mientras se escriben
+            empleados = {nombre: empleado.copiar() for nombre, empleado in self.empleados.items()}
+            calculadora = CalculadoraRecargos()
+            calculadora.cargar_configuracion(self.calculadora.exportar_configuracion())
+            self._encolar(("compactar", empleados, calculadora, self.generacion))
+        else:
+            self._reescribir(self.empleados, self.calculadora, self.generacion + 1)
+            self.generacion += 1
+            self.cambios = 0
+
+    def _reescribir(self, empleados, calculadora, generacion):
+        self._cerrar_archivo()
+        # Si falla, la excepción llega antes de borrar el diario: el archivo principal sigue en la generación
+        # anterior y el diario conserva sus cambios
+        self._guardar_archivo_principal(empleados, calculadora, generacion)
+        # Desde aquí el diario anterior ya no coincide con la generación del archivo principal
+        try:
+            os.remove(self.ruta_diario)
+        except OSError:
+            pass
+        self._diario_valido = False
+        self._generacion_diario = generacion
+
+    def _guardar_archivo_principal(self, empleados, calculadora, generacion):
+        save_app_data(empleados, calculadora, self.filename, generacion_diario=generacion,
+                      compacto=bool(self.compacto))
+
+    def guardar_todo(self, empleados, calculadora):
+        """Guarda todos los datos indicados en el archivo principal (por ejemplo, después de cargar datos de ejemplo)."""
+        self.empleados = empleados
+        self.calculadora = calculadora
+        self.compactar()
+
+    def _encolar(self, tarea):
+        with self._condicion:
+            if self._hilo is None:
+                self._detener = False
+                self._hilo = threading.Thread(target=self._trabajar, name="DiarioCambios", daemon=True)
+                self._hilo.start()
+            self._pendientes.append(tarea)
+            self._ultimo_encolado = time.monotonic()
+            self._condicion.notify_all()
+
+    def _trabajar(self):
+        """Hilo de escritura: toma las tareas pendientes después de la espera y las escribe juntas."""
+        while True:
+            with self._condicion:
+                while not self._pendientes and not self._detener:
+                    self._condicion.wait()
+                if not self._pendientes:
+                    return
+                limite = time.monotonic() + ESPERA_MAXIMA_GUARDADO
+                while not (self._vaciar or self._detener):
+                    restante = min(self._ultimo_encolado + self.espera, limite) - time.monotonic()
+                    if restante <= 0:
+                        break
+                    self._condicion.wait(restante)
+                tareas = list(self._pendientes)
+                self._pendientes.clear()
+                self._escribiendo = True
+            error = None
+            try:
+                self._ejecutar(tareas)
+            except Exception as e:
+                print(f"Error al escribir en el diario de cambios: {e}")
+                error = e
+            with self._condicion:
+                if error is not None:
+                    self._error = error
+                self._escribiendo = False
+                self._condicion.notify_all()
+
+    def _ejecutar(self, tareas):
+        # La copia de la última compactación ya incluye los cambios anteriores a ella: solo se escriben esa copia y
+        # los cambios posteriores
+        cambios = [tarea[1] for tarea in tareas if tarea[0] == "cambio"]
+        for indice in range(len(tareas) - 1, -1, -1):
+            if tareas[indice][0] == "compactar":
+                try:
+                    self._reescribir(*tareas[indice][1:])
+                except Exception:
+                    # El diario anterior sigue vigente: se le agregan todos los cambios para no perder ninguno
+                    if cambios:
+                        self._escribir(cambios)
+                    raise
+                cambios = [tarea[1] for tarea in tareas[indice + 1:]]
+                break
+        if cambios:
+            self._escribir(cambios)
+
+    def vaciar(self):
+        """Espera a que los cambios y compactaciones pendientes del hilo de escritura queden en disco."""
+        with self._condicion:
+            self._vaciar = True
+            self._condicion.notify_all()
+            while self._pendientes or self._escribiendo:
+                self._condicion.wait()
+            self._vaciar = False
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def cerrar(self):
+        """Escribe lo pendiente, detiene el hilo de escritura y cierra el diario. Lanza el error de vaciar(), si lo hay."""
+        try:
+            if self._hilo is not None:
+                self.vaciar()
+        finally:
+            if self._hilo is not None:
+                with self._condicion:
+                    self._detener = True
+                    self._condicion.notify_all()
+                self._hilo.join()
+                self._hilo = None
+            self._cerrar_archivo()
+
+    def empleado_guardado(self, empleado):
+        self.registrar({"op": "empleado", "nombre": empleado.nombre, "salario_mensual": empleado.salario_mensual,
+                        "standard_daily_hours": empleado.standard_daily_hours, "tipo_contrato": empleado.tipo_contrato})
+
+    def empleado_renombrado(self, nombre_anterior, nuevo_nombre):
+        self.registrar({"op": "renombrar_empleado", "nombre": nombre_anterior, "nuevo_nombre": nuevo_nombre})
+
+    def empleado_eliminado(self, nombre):
+        self.registrar({"op": "eliminar_empleado", "nombre": nombre})
+
+    def jornada_registrada(self, empleado, jornada):
+        self.registrar({"op": "jornada", "nombre": empleado.nombre, "jornada": _jornada_a_json(jornada)})
+
+    def jornadas_importadas(self, jornadas_por_empleado):
+        """
+        Registra las jornadas agregadas por una importación ({nombre: jornadas}), un cambio por empleado. Si con esas
+        jornadas el diario pasaría de max_cambios, se compacta directamente en lugar de escribirlas antes en él.
+        """
+        if self.cambios + sum(len(jornadas) for jornadas in jornadas_por_empleado.values()) >= self.max_cambios:
+            self.compactar()
+            return
+        self.registrar_varios([{"op": "jornadas", "nombre": nombre, "jornadas": [_jornada_a_json(j) for j in jornadas]}
+                               for nombre, jornadas in jornadas_por_empleado.items() if jornadas])
+
+    def jornada_reemplazada(self, empleado, anterior, jornada):
+        self.registrar({"op": "reemplazar_jornada", "nombre": empleado.nombre,
+                        "anterior": _jornada_a_json(anterior), "jornada": _jornada_a_json(jornada)})
+
+    def jornada_eliminada(self, empleado, jornada):
+        self.registrar({"op": "eliminar_jornada", "nombre": empleado.nombre, "jornada": _jornada_a_json(jornada)})
+
+    def configuracion_actualizada(self):
+        """Registra los porcentajes y festivos manuales actuales (cambios de configuración o de festivos)."""
+        self.registrar({"op": "configuracion", "config": self.calculadora.exportar_configuracion()})
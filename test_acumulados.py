@@ -0,0 +1,157 @@
+"""
+Pruebas de los acumulados por empleado: el reporte consolidado y acumulados_por_empleado deben dar el mismo
+resultado en secuencia y en paralelo, con y sin período, y los totales que se actualizan con cada cambio
+(CalculadoraRecargos.segundos_totales) deben coincidir con un recálculo completo.
+
+Uso:
+    python -m pytest -q test_acumulados.py
+    python -m unittest test_acumulados
+"""
+import datetime
+import random
+import unittest
+
+from recargos_logic import HISTORIAL_FESTIVOS, CalculadoraRecargos, Empleado
+
+EMPLEADOS_AL_AZAR = 300
+PERIODO = (datetime.date(2024, 3, 1), datetime.date(2024, 4, 30))
+
+
+def hora_al_azar(aleatorio):
+    # Con segundos, como los acepta la importación desde CSV (HH:MM:SS)
+    return datetime.time(aleatorio.randrange(24), aleatorio.randrange(60), aleatorio.randrange(60))
+
+
+def jornada_al_azar(aleatorio):
+    return {
+        "fecha": datetime.date(2024, 1, 1) + datetime.timedelta(days=aleatorio.randrange(365)),
+        "hora_entrada": hora_al_azar(aleatorio),
+        "hora_salida": hora_al_azar(aleatorio),
+    }
+
+
+def crear_empleados(aleatorio, cantidad, jornadas_por_empleado=40):
+    empleados = []
+    for i in range(cantidad):
+        empleado = Empleado(f"Empleado {i}", aleatorio.randrange(1300000, 9000000), aleatorio.randint(4, 10))
+        empleado.agregar_jornadas(jornada_al_azar(aleatorio) for _ in range(jornadas_por_empleado))
+        empleados.append(empleado)
+    return empleados
+
+
+class AcumuladosParaleloTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.empleados = crear_empleados(random.Random(6), EMPLEADOS_AL_AZAR)
+        cls.calculadora = CalculadoraRecargos()
+        cls.calculadora.agregar_dia_festivo(datetime.date(2024, 3, 12))
+
+    def test_reporte_consolidado_igual_en_paralelo(self):
+        for periodo in ((None, None), PERIODO):
+            with self.subTest(periodo=periodo):
+                secuencial = self.calculadora.generar_reporte_consolidado(self.empleados, *periodo)
+                paralelo = self.calculadora.generar_reporte_consolidado(self.empleados, *periodo, procesos=2, tamano_lote=64)
+                self.assertEqual(secuencial, paralelo)
+
+    def test_acumulados_por_empleado_iguales_en_paralelo(self):
+        for periodo in ((None, None), PERIODO):
+            for exacto in (False, True):
+                with self.subTest(periodo=periodo, exacto=exacto):
+                    secuencial = [acumulados for _, _, acumulados in
+                                  self.calculadora.acumulados_por_empleado(self.empleados, *periodo, exacto=exacto)]
+                    paralelo = [acumulados for _, _, acumulados in
+                                self.calculadora.acumulados_por_empleado(self.empleados, *periodo, procesos=2,
+                                                                         tamano_lote=64, exacto=exacto)]
+                    self.assertEqual(secuencial, paralelo)
+
+    def test_totales_iguales_a_la_suma_de_las_jornadas(self):
+        # Sin período se usan los totales del empleado; con la lista de jornadas, la suma por jornada
+        for empleado in self.empleados[:50]:
+            self.assertEqual(self.calculadora.get_accumulated_hours_and_surcharges(empleado),
+                             self.calculadora.get_accumulated_hours_and_surcharges(empleado, list(empleado.jornadas_registradas)))
+
+
+class TotalesIncrementalesTest(unittest.TestCase):
+    OPERACIONES = 400
+
+    def setUp(self):
+        self.aleatorio = random.Random(25)
+        self.calculadora = CalculadoraRecargos()
+        self.empleado = Empleado("Ana", 2000000, 8)
+        self.empleado.agregar_jornadas(jornada_al_azar(self.aleatorio) for _ in range(1000))
+
+    def fecha_al_azar(self):
+        return datetime.date(2024, 1, 1) + datetime.timedelta(days=self.aleatorio.randrange(366))
+
+    def cambiar_festivo(self):
+        festivos = self.calculadora.dias_festivos.ordenadas()
+        if festivos and self.aleatorio.random() < 0.5:
+            self.calculadora.eliminar_dia_festivo(self.aleatorio.choice(festivos))
+        else:
+            self.calculadora.agregar_dia_festivo(self.fecha_al_azar())
+
+    def comprobar(self, mensaje):
+        empleado = self.empleado
+        recalculados = self.calculadora._segundos_todas(empleado.jornadas_registradas, empleado.standard_daily_hours)
+        self.assertEqual(self.calculadora.segundos_totales(empleado), recalculados, mensaje)
+
+    def aplicar(self, cambiar, incremental=True):
+        """Aplica OPERACIONES cambios al azar y compara los totales con un recálculo completo después de cada uno."""
+        self.comprobar("inicio")
+        totales = self.empleado.totales
+        for i in range(self.OPERACIONES):
+            cambiar()
+            self.comprobar(f"operación {i}")
+        if incremental: # Los totales se actualizaron sin recalcularlos desde cero
+            self.assertIs(self.empleado.totales, totales)
+
+    def test_insertar(self):
+        self.aplicar(lambda: self.empleado.insertar_jornada(jornada_al_azar(self.aleatorio)))
+
+    def test_eliminar(self):
+        self.aplicar(lambda: self.empleado.eliminar_jornada(self.aleatorio.randrange(len(self.empleado.jornadas_registradas))))
+
+    def test_reemplazar(self):
+        self.aplicar(lambda: self.empleado.reemplazar_jornada(self.aleatorio.randrange(len(self.empleado.jornadas_registradas)),
+                                                              jornada_al_azar(self.aleatorio)))
+
+    def test_agregar_y_quitar_festivos(self):
+        self.aplicar(self.cambiar_festivo)
+
+    def test_festivos_desde_la_configuracion(self):
+        def cambiar():
+            config = self.calculadora.exportar_configuracion()
+            config["festivos_agregados"] = [self.fecha_al_azar().isoformat() for _ in range(self.aleatorio.randrange(4))]
+            self.calculadora.cargar_configuracion(config)
+        self.aplicar(cambiar)
+
+    def test_cambios_mezclados_entre_consultas(self):
+        # Varios cambios de jornadas y festivos entre una consulta y la siguiente
+        def cambiar():
+            for _ in range(self.aleatorio.randrange(1, 6)):
+                operacion = self.aleatorio.randrange(3)
+                if operacion == 0:
+                    self.empleado.insertar_jornada(jornada_al_azar(self.aleatorio))
+                elif operacion == 1:
+                    self.empleado.eliminar_jornada(self.aleatorio.randrange(len(self.empleado.jornadas_registradas)))
+                else:
+                    self.cambiar_festivo()
+        self.aplicar(cambiar)
+
+    def test_horas_estandar(self):
+        def cambiar():
+            self.empleado.standard_daily_hours = self.aleatorio.randint(4, 12)
+            self.empleado.insertar_jornada(jornada_al_azar(self.aleatorio))
+        self.aplicar(cambiar, incremental=False)
+
+    def test_mas_cambios_de_festivos_que_el_historial(self):
+        # Con más cambios de los que recuerda el calendario entre dos consultas, los totales se recalculan completos
+        def cambiar():
+            for _ in range(HISTORIAL_FESTIVOS + 1):
+                self.calculadora.agregar_dia_festivo(self.fecha_al_azar())
+        self.OPERACIONES = 3
+        self.aplicar(cambiar, incremental=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
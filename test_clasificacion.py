@@ -0,0 +1,135 @@
+"""
+Compara la clasificación de horas por tramos (CalculadoraRecargos._categorizar_jornada) con el recorrido hora por
+hora que usaba la versión anterior de calcular_recargos_jornada, conservado aquí como referencia.
+
+Uso:
+    python -m pytest -q test_clasificacion.py
+    python -m unittest test_clasificacion
+"""
+import datetime
+import random
+import unittest
+
+from recargos_logic import CATEGORIAS_HORAS, CalculadoraRecargos, festivos_colombia
+
+JORNADAS_AL_AZAR = 3000
+
+
+def clasificar_por_pasos(calculadora, fecha, hora_entrada, hora_salida, standard_daily_hours,
+                         paso=datetime.timedelta(hours=1)):
+    """
+    Recorrido de la versión anterior: avanza de 'paso' en 'paso' desde la entrada y asigna cada paso completo a la
+    categoría de su instante inicial. Con el paso de una hora reproduce los resultados anteriores; con un paso de un
+    minuto (y horas al minuto) divide la jornada en sus límites reales.
+    Las horas trabajadas se miden desde la entrada en cada paso en lugar de sumar las duraciones, para que el
+    redondeo de los pasos cortos no mueva el límite de las horas extra.
+    Retorna (diccionario de horas por categoría, total de horas).
+    """
+    horas_categorizadas = dict.fromkeys(CATEGORIAS_HORAS, 0.0)
+    inicio = datetime.datetime.combine(fecha, hora_entrada)
+    end_time = datetime.datetime.combine(fecha, hora_salida)
+    if hora_salida <= hora_entrada:
+        end_time = datetime.datetime.combine(fecha + datetime.timedelta(days=1), hora_salida)
+
+    current_time = inicio
+    while current_time < end_time:
+        next_hour = min(current_time + paso, end_time)
+        duration = (next_hour - current_time).total_seconds() / 3600.0
+        horas_trabajadas_hoy = (next_hour - inicio).total_seconds() / 3600.0
+        is_nocturno = current_time.time() >= datetime.time(21, 0) or current_time.time() < datetime.time(6, 0)
+
+        clave = ("horas_ordinarias" if horas_trabajadas_hoy <= standard_daily_hours else "horas_extras")
+        clave += "_nocturnas" if is_nocturno else "_diurnas"
+        if current_time.date().weekday() == 6: # El domingo tiene prioridad sobre el festivo
+            clave += "_domingo"
+        elif current_time.date() in calculadora.dias_festivos:
+            clave += "_festivo"
+        horas_categorizadas[clave] += duration
+        current_time = next_hour
+    return horas_categorizadas, (end_time - inicio).total_seconds() / 3600.0
+
+
+def clasificar_por_tramos(calculadora, fecha, hora_entrada, hora_salida, standard_daily_hours):
+    """Clasificación actual, con el mismo formato de resultado que clasificar_por_pasos."""
+    horas, total_horas = calculadora._categorizar_jornada(fecha, hora_entrada, hora_salida, standard_daily_hours)
+    return dict(zip(CATEGORIAS_HORAS, horas)), total_horas
+
+
+class ClasificacionTest(unittest.TestCase):
+    def setUp(self):
+        self.calculadora = CalculadoraRecargos()
+        self.aleatorio = random.Random(20240101)
+        festivos = festivos_colombia(2024) | festivos_colombia(2025)
+        # Un tercio de las fechas cae en un festivo o el día anterior, para cubrir jornadas que terminan en uno
+        self.fechas_festivas = sorted(festivos | {fecha - datetime.timedelta(days=1) for fecha in festivos})
+
+    def fecha_al_azar(self):
+        if self.aleatorio.random() < 1 / 3:
+            return self.aleatorio.choice(self.fechas_festivas)
+        return datetime.date(2024, 1, 1) + datetime.timedelta(days=self.aleatorio.randrange(731))
+
+    def comparar(self, esperado, obtenido, mensaje):
+        horas_esperadas, total_esperado = esperado
+        horas_obtenidas, total_obtenido = obtenido
+        self.assertAlmostEqual(total_obtenido, total_esperado, places=9, msg=mensaje)
+        for categoria in CATEGORIAS_HORAS:
+            self.assertAlmostEqual(horas_obtenidas[categoria], horas_esperadas[categoria], places=9,
+                                   msg=f"{mensaje}: {categoria}")
+
+    def test_entradas_en_hora_exacta_igual_que_el_recorrido_anterior(self):
+        # Con la entrada en punto, los pasos de una hora caen en 06:00, 21:00, la medianoche y el límite de
+        # las horas estándar, así que ambos métodos deben coincidir categoría por categoría.
+        for _ in range(JORNADAS_AL_AZAR):
+            fecha = self.fecha_al_azar()
+            entrada = datetime.time(self.aleatorio.randrange(24))
+            salida = datetime.time(self.aleatorio.randrange(24), self.aleatorio.choice((0, 30)))
+            estandar = self.aleatorio.randint(4, 12)
+            self.comparar(clasificar_por_pasos(self.calculadora, fecha, entrada, salida, estandar),
+                          clasificar_por_tramos(self.calculadora, fecha, entrada, salida, estandar),
+                          f"{fecha} {entrada}-{salida} ({estandar} h)")
+
+    def test_entradas_fraccionarias_se_dividen_en_los_limites_reales(self):
+        # Con entradas a los :15, :30 o :45 el recorrido anterior asignaba cada hora completa a la categoría de su
+        # inicio. La clasificación actual debe coincidir con el recorrido minuto a minuto, y conservar el total de
+        # horas y la división entre ordinarias y extras del recorrido por horas.
+        diferentes = 0
+        for _ in range(JORNADAS_AL_AZAR):
+            fecha = self.fecha_al_azar()
+            entrada = datetime.time(self.aleatorio.randrange(24), self.aleatorio.choice((15, 30, 45)))
+            salida = datetime.time(self.aleatorio.randrange(24), self.aleatorio.randrange(60))
+            estandar = self.aleatorio.randint(4, 12)
+            mensaje = f"{fecha} {entrada}-{salida} ({estandar} h)"
+            obtenido = clasificar_por_tramos(self.calculadora, fecha, entrada, salida, estandar)
+            self.comparar(clasificar_por_pasos(self.calculadora, fecha, entrada, salida, estandar,
+                                               paso=datetime.timedelta(minutes=1)), obtenido, mensaje)
+
+            por_horas, total_por_horas = clasificar_por_pasos(self.calculadora, fecha, entrada, salida, estandar)
+            self.assertAlmostEqual(obtenido[1], total_por_horas, places=9, msg=mensaje)
+            for tipo in ("horas_ordinarias", "horas_extras"):
+                self.assertAlmostEqual(sum(h for c, h in obtenido[0].items() if c.startswith(tipo)),
+                                       sum(h for c, h in por_horas.items() if c.startswith(tipo)),
+                                       places=9, msg=f"{mensaje}: {tipo}")
+            diferentes += any(abs(obtenido[0][c] - por_horas[c]) > 1e-9 for c in CATEGORIAS_HORAS)
+        # Las diferencias previstas ocurren (jornadas que cruzan 06:00, 21:00 o la medianoche)
+        self.assertGreater(diferentes, 0)
+
+    def test_jornada_que_cruza_las_21_con_entrada_a_la_media_hora(self):
+        fecha = datetime.date(2024, 3, 5) # Martes hábil
+        anterior, _ = clasificar_por_pasos(self.calculadora, fecha, datetime.time(20, 30), datetime.time(22, 30), 8)
+        actual, total = clasificar_por_tramos(self.calculadora, fecha, datetime.time(20, 30), datetime.time(22, 30), 8)
+        self.assertEqual((anterior["horas_ordinarias_diurnas"], anterior["horas_ordinarias_nocturnas"]), (1.0, 1.0))
+        self.assertEqual((actual["horas_ordinarias_diurnas"], actual["horas_ordinarias_nocturnas"]), (0.5, 1.5))
+        self.assertEqual(total, 2.0)
+
+    def test_jornada_que_termina_en_domingo_con_entrada_a_la_media_hora(self):
+        fecha = datetime.date(2024, 3, 9) # Sábado
+        anterior, _ = clasificar_por_pasos(self.calculadora, fecha, datetime.time(23, 30), datetime.time(1, 30), 8)
+        actual, _ = clasificar_por_tramos(self.calculadora, fecha, datetime.time(23, 30), datetime.time(1, 30), 8)
+        self.assertEqual((anterior["horas_ordinarias_nocturnas"], anterior["horas_ordinarias_nocturnas_domingo"]),
+                         (1.0, 1.0))
+        self.assertEqual((actual["horas_ordinarias_nocturnas"], actual["horas_ordinarias_nocturnas_domingo"]),
+                         (0.5, 1.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
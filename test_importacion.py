@@ -0,0 +1,119 @@
+"""
+Pruebas de la importación de jornadas desde CSV con almacenamiento: solo se guardan las jornadas aceptadas (en SQLite
+se insertan sin reescribir las filas existentes; en los archivos JSON e indexados van al diario de cambios) y al
+volver a cargar los datos se obtienen las mismas jornadas que quedaron en memoria.
+
+Uso:
+    python -m pytest -q test_importacion.py
+    python -m unittest test_importacion
+"""
+import contextlib
+import datetime
+import io
+import os
+import tempfile
+import unittest
+
+from almacenamiento import abrir_almacen
+from importacion import aplicar_importacion, importar_jornadas_csv, preparar_importacion
+from recargos_logic import CalculadoraRecargos, Empleado
+
+ARCHIVOS_DATOS = ("app_data.json", "app_data.recargos", "app_data.db")
+
+
+def jornada(dia, entrada, salida):
+    return {"fecha": datetime.date(2024, 3, dia), "hora_entrada": datetime.time(*entrada),
+            "hora_salida": datetime.time(*salida)}
+
+
+class ImportacionConAlmacenTest(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.ruta_csv = os.path.join(self.directorio.name, "reloj.csv")
+        with open(self.ruta_csv, "w", encoding="utf-8") as archivo:
+            archivo.write("empleado;fecha;hora_entrada;hora_salida\n"
+                          "Ana;2024-03-01;08:00;17:00\n" # Repetida: ya está registrada
+                          "Ana;2024-03-02;22:00;06:00\n"
+                          "Ana;2024-03-02;08:00:30;12:00\n"
+                          "Luis;04/03/2024;07:00 AM;03:30 PM\n"
+                          "Nadie;2024-03-04;08:00;17:00\n"
+                          "Luis;2024-03-31;25:00;17:00\n")
+
+    def crear_datos(self, archivo, max_cambios=None):
+        """Guarda dos empleados con algunas jornadas y retorna (almacén, empleados)."""
+        almacen = abrir_almacen(os.path.join(self.directorio.name, archivo))
+        if max_cambios is not None:
+            almacen.max_cambios = max_cambios
+        empleados = {"Ana": Empleado("Ana", 2000000, 8), "Luis": Empleado("Luis", 1500000, 8)}
+        empleados["Ana"].agregar_jornadas([jornada(1, (8,), (17,)), jornada(2, (8,), (12,))])
+        empleados["Luis"].agregar_jornadas([jornada(1, (6,), (14,))])
+        with contextlib.redirect_stdout(io.StringIO()):
+            almacen.guardar_todo(empleados, CalculadoraRecargos())
+        return almacen, empleados
+
+    def recargar(self, archivo):
+        almacen = abrir_almacen(os.path.join(self.directorio.name, archivo))
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                empleados, _ = almacen.cargar()
+            return {nombre: list(empleado.jornadas_registradas) for nombre, empleado in empleados.items()}
+        finally:
+            almacen.cerrar()
+
+    def importar(self, archivo, max_cambios=None):
+        almacen, empleados = self.crear_datos(archivo, max_cambios)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                resultado = importar_jornadas_csv(self.ruta_csv, empleados, almacen)
+        finally:
+            almacen.cerrar()
+        self.assertEqual((resultado.filas, resultado.aceptadas, resultado.rechazadas), (6, 3, 3))
+        return {nombre: list(empleado.jornadas_registradas) for nombre, empleado in empleados.items()}
+
+    def test_las_jornadas_importadas_se_recuperan_al_cargar(self):
+        for archivo in ARCHIVOS_DATOS:
+            with self.subTest(archivo=archivo):
+                en_memoria = self.importar(archivo)
+                self.assertEqual(len(en_memoria["Ana"]), 4)
+                self.assertEqual(len(en_memoria["Luis"]), 2)
+                self.assertEqual(self.recargar(archivo), en_memoria)
+
+    def test_importacion_mayor_que_el_diario_compacta(self):
+        for archivo in ARCHIVOS_DATOS[:2]:
+            with self.subTest(archivo=archivo):
+                en_memoria = self.importar(archivo, max_cambios=2)
+                ruta = os.path.join(self.directorio.name, archivo)
+                self.assertFalse(os.path.exists(ruta + ".journal"))
+                self.assertEqual(self.recargar(archivo), en_memoria)
+
+    def test_sqlite_no_reescribe_las_jornadas_existentes(self):
+        almacen, empleados = self.crear_datos("app_data.db")
+        try:
+            antes = almacen.conexion.execute("SELECT id, fecha, hora_entrada, hora_salida FROM jornadas ORDER BY id").fetchall()
+            _, preparadas = preparar_importacion(self.ruta_csv, empleados)
+            filas_cambiadas = almacen.conexion.total_changes
+            self.assertEqual(aplicar_importacion(preparadas, empleados, almacen), 3)
+            filas_cambiadas = almacen.conexion.total_changes - filas_cambiadas
+            despues = almacen.conexion.execute("SELECT id, fecha, hora_entrada, hora_salida FROM jornadas ORDER BY id").fetchall()
+        finally:
+            almacen.cerrar()
+        self.assertEqual(filas_cambiadas, 3) # Solo las tres filas insertadas
+        self.assertEqual(despues[:len(antes)], antes)
+        self.assertEqual(len(despues), len(antes) + 3)
+
+    def test_revisar_omite_cambios_posteriores(self):
+        # Entre la lectura del archivo y la aplicación se registró una de las jornadas y se eliminó un empleado
+        almacen, empleados = self.crear_datos("app_data.db")
+        try:
+            _, preparadas = preparar_importacion(self.ruta_csv, empleados)
+            empleados["Ana"].insertar_jornada(jornada(2, (22,), (6,)))
+            del empleados["Luis"]
+            self.assertEqual(aplicar_importacion(preparadas, empleados, almacen, revisar=True), 1)
+        finally:
+            almacen.cerrar()
+        self.assertEqual(len(empleados["Ana"].jornadas_registradas), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
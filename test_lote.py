@@ -0,0 +1,94 @@
+"""
+Compara el cálculo por lotes (CalculadoraRecargos.calcular_lote) con el cálculo por jornada (_calcular_jornada): las
+horas y los recargos de cada jornada deben ser exactamente iguales. Requiere numpy; sin numpy las pruebas se omiten.
+
+Uso:
+    python -m pytest -q test_lote.py
+    python -m unittest test_lote
+"""
+import datetime
+import random
+import unittest
+
+from recargos_logic import TAMANO_BLOQUE_LOTE, CalculadoraRecargos, festivos_colombia, jornada_a_epoch
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Más de un bloque, para cubrir el paso de un bloque al siguiente
+JORNADAS_AL_AZAR = TAMANO_BLOQUE_LOTE + 3000
+
+
+@unittest.skipIf(numpy is None, "calcular_lote requiere numpy")
+class CalculoPorLotesTest(unittest.TestCase):
+    def setUp(self):
+        self.calculadora = CalculadoraRecargos()
+        self.calculadora.agregar_dia_festivo(datetime.date(2024, 3, 12))
+        self.aleatorio = random.Random(5)
+        festivos = festivos_colombia(2024) | festivos_colombia(2025)
+        # Un tercio de las fechas cae en un festivo o el día anterior, para cubrir jornadas que terminan en uno
+        self.fechas_festivas = sorted(festivos | {fecha - datetime.timedelta(days=1) for fecha in festivos})
+
+    def fecha_al_azar(self):
+        if self.aleatorio.random() < 1 / 3:
+            return self.aleatorio.choice(self.fechas_festivas)
+        return datetime.date(2024, 1, 1) + datetime.timedelta(days=self.aleatorio.randrange(731))
+
+    def hora_al_azar(self):
+        return datetime.time(self.aleatorio.randrange(24), self.aleatorio.randrange(60), self.aleatorio.randrange(60))
+
+    def jornadas_al_azar(self, cantidad, fecha_al_azar=None):
+        fecha_al_azar = fecha_al_azar or self.fecha_al_azar
+        return [{"fecha": fecha_al_azar(), "hora_entrada": self.hora_al_azar(), "hora_salida": self.hora_al_azar()}
+                for _ in range(cantidad)]
+
+    def comparar(self, jornadas, standard_daily_hours, valor_hora):
+        """Compara calcular_lote con _calcular_jornada; horas estándar y valor de la hora son listas o escalares."""
+        epoch = numpy.array([jornada_a_epoch(j) for j in jornadas])
+        horas, recargos = self.calculadora.calcular_lote(epoch[:, 0], epoch[:, 1], standard_daily_hours, valor_hora)
+        self.assertEqual(horas.shape, (len(jornadas), 12))
+        for i, jornada in enumerate(jornadas):
+            estandar = standard_daily_hours[i] if isinstance(standard_daily_hours, list) else standard_daily_hours
+            valor = valor_hora[i] if isinstance(valor_hora, list) else valor_hora
+            horas_esperadas, _, recargos_esperados, _ = self.calculadora._calcular_jornada(jornada, valor, estandar)
+            self.assertEqual(tuple(horas[i].tolist()), horas_esperadas, f"jornada {i}: {jornada}")
+            self.assertEqual(tuple(recargos[i].tolist()), recargos_esperados, f"jornada {i}: {jornada}")
+
+    def test_igual_que_calcular_jornada(self):
+        jornadas = self.jornadas_al_azar(JORNADAS_AL_AZAR)
+        standard_daily_hours = [self.aleatorio.randint(4, 12) for _ in jornadas]
+        valor_hora = [self.aleatorio.randrange(1300000, 9000000) / 220 for _ in jornadas]
+        self.comparar(jornadas, standard_daily_hours, valor_hora)
+
+    def test_valores_escalares(self):
+        self.comparar(self.jornadas_al_azar(2000), 8, 2000000 / 220)
+
+    def test_horas_estandar_fraccionarias(self):
+        jornadas = self.jornadas_al_azar(2000)
+        self.comparar(jornadas, 7.5, 2000000 / 220)
+        self.comparar(jornadas, [self.aleatorio.choice((7.25, 8.0, 9.5)) for _ in jornadas], 2000000 / 220)
+
+    def test_horas_estandar_mayores_que_la_jornada(self):
+        self.comparar(self.jornadas_al_azar(500), 30, 2000000 / 220)
+
+    def test_fechas_dispersas(self):
+        # Pocas jornadas repartidas en varios siglos: el tipo de día se resuelve solo para las fechas que aparecen
+        def fecha_al_azar():
+            return datetime.date(1900, 1, 1) + datetime.timedelta(days=self.aleatorio.randrange(73000))
+        self.comparar(self.jornadas_al_azar(300, fecha_al_azar), 8, 2000000 / 220)
+
+    def test_sin_jornadas(self):
+        horas, recargos = self.calculadora.calcular_lote([], [], 8, 2000000 / 220)
+        self.assertEqual(horas.shape, (0, 12))
+        self.assertEqual(recargos.shape, (0, 12))
+
+    def test_duraciones_invalidas(self):
+        for inicio, fin in ((100, 100), (100, 50), (0, 86401)):
+            with self.subTest(inicio=inicio, fin=fin), self.assertRaises(ValueError):
+                self.calculadora.calcular_lote([inicio], [fin], 8, 2000000 / 220)
+
+
+if __name__ == "__main__":
+    unittest.main()